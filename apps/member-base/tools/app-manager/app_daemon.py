@@ -0,0 +1,359 @@
+"""
+App Daemon Module
+Keep a warm AppManager in a background process and serve CLI commands over a Unix socket
+
+Protocol: newline-delimited JSON-RPC 2.0, one request per line.
+    run      {"argv": [...], "cwd": "..."} -> {"exit_code": int, "stdout": str, "stderr": str}
+    ping     {}                            -> {"pid": int, "started": float, "requests": int}
+    shutdown {}                            -> {"stopping": true}
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import stat
+import socket
+import hashlib
+import tempfile
+import threading
+import socketserver
+from contextlib import redirect_stdout, redirect_stderr
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+# Set to any value to make the CLI ignore a running daemon
+DISABLE_ENV = 'APP_MANAGER_NO_DAEMON'
+
+# Seconds to wait for connect/ping; commands themselves have no timeout
+CONNECT_TIMEOUT = 0.5
+
+# Seconds to wait for a detached daemon to answer its first ping
+START_TIMEOUT = 10.0
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+# socketserver only defines UnixStreamServer where AF_UNIX exists; keep the module importable elsewhere
+_UnixStreamServer = getattr(socketserver, 'UnixStreamServer', socketserver.TCPServer)
+
+
+def is_supported() -> bool:
+    """Check if Unix domain sockets are available (not on Windows)."""
+    return hasattr(socket, 'AF_UNIX')
+
+
+def socket_dir() -> Path:
+    """
+    Per-user directory holding the daemon sockets.
+    
+    $XDG_RUNTIME_DIR is private to the user already; otherwise a
+    directory named after the uid is used in the shared temp directory.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return Path(runtime_dir) / 'closepay-app-manager'
+    return Path(tempfile.gettempdir()) / f"closepay-app-manager-{os.getuid()}"
+
+
+def socket_path(tool_dir: Path) -> Path:
+    """Socket path for a tool directory (one daemon per copy of the tool)."""
+    digest = hashlib.sha1(str(Path(tool_dir).resolve()).encode('utf-8')).hexdigest()[:12]
+    return socket_dir() / f"{digest}.sock"
+
+
+def _is_private(path: Path, kind) -> bool:
+    """Check that path is of the given kind (stat.S_ISDIR/S_ISSOCK), owned by us and closed to others."""
+    try:
+        info = os.lstat(str(path))
+    except OSError:
+        return False
+    return kind(info.st_mode) and info.st_uid == os.getuid() and not info.st_mode & 0o077
+
+
+def _make_socket_dir() -> Path:
+    """
+    Create the socket directory with mode 0700.
+    
+    Raises:
+        RuntimeError: If it exists but belongs to someone else or others can access it
+    """
+    directory = socket_dir()
+    try:
+        directory.mkdir(mode=0o700, exist_ok=True)
+    except OSError as e:
+        raise RuntimeError(f"Cannot create socket directory {directory}: {str(e)}")
+    if not _is_private(directory, stat.S_ISDIR):
+        raise RuntimeError(f"Socket directory {directory} must be a directory owned by you with mode 0700")
+    return directory
+
+
+def _exit_code(code) -> int:
+    """Convert a SystemExit code to an int exit code."""
+    if code is None:
+        return 0
+    return code if isinstance(code, int) else 1
+
+
+class DaemonServer(socketserver.ThreadingMixIn, _UnixStreamServer):
+    """
+    JSON-RPC server around a command runner.
+    
+    Connections are handled on threads, but commands run one at a time
+    under command_lock, so writes to tenants.json are serialized.
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self, path: Path, run_argv: Callable[[List[str]], int]):
+        self.run_argv = run_argv
+        self.command_lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+        # Only the owner may send commands: the socket is created 0600 rather than chmod-ed after bind
+        previous_umask = os.umask(0o177)
+        try:
+            super().__init__(str(path), _RequestHandler)
+        finally:
+            os.umask(previous_umask)
+    
+    def dispatch(self, line: bytes) -> Dict:
+        """Handle one JSON-RPC request line and build the response."""
+        try:
+            request = json.loads(line.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            return _error(None, PARSE_ERROR, f"Parse error: {str(e)}")
+        
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+        
+        request_id = request.get('id')
+        method = request['method']
+        params = request.get('params') or {}
+        
+        if method == 'ping':
+            return _result(request_id, {'pid': os.getpid(), 'started': self.started, 'requests': self.requests})
+        
+        if method == 'shutdown':
+            # shutdown() blocks until serve_forever returns, so call it off this thread
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return _result(request_id, {'stopping': True})
+        
+        if method == 'run':
+            argv = params.get('argv')
+            if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+                return _error(request_id, INVALID_PARAMS, "'argv' must be a list of strings")
+            return _result(request_id, self._run(argv, params.get('cwd')))
+        
+        return _error(request_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+    
+    def _run(self, argv: List[str], cwd: Optional[str]) -> Dict:
+        """Run one command with captured output in the client's working directory."""
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        
+        with self.command_lock:
+            self.requests += 1
+            previous_cwd = os.getcwd()
+            try:
+                if cwd:
+                    os.chdir(cwd)
+                with redirect_stdout(stdout), redirect_stderr(stderr):
+                    try:
+                        exit_code = self.run_argv(argv)
+                    except SystemExit as e:
+                        exit_code = _exit_code(e.code)
+                    except Exception as e:
+                        print(f"Error: {str(e)}", file=sys.stderr)
+                        exit_code = 1
+            except OSError as e:
+                stderr.write(f"Error: {str(e)}\n")
+                exit_code = 1
+            finally:
+                os.chdir(previous_cwd)
+        
+        return {'exit_code': exit_code, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Read request lines and write one response line per request."""
+    
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.dispatch(line)
+            self.wfile.write((json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+
+def _result(request_id, result: Dict) -> Dict:
+    return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+
+def _error(request_id, code: int, message: str) -> Dict:
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+def _connect(tool_dir: Path) -> Optional[socket.socket]:
+    """Connect to the daemon of tool_dir (None if it is not running)."""
+    if not is_supported():
+        return None
+    path = socket_path(tool_dir)
+    # Never talk to a socket (or directory) someone else could have put there
+    if not _is_private(path.parent, stat.S_ISDIR) or not _is_private(path, stat.S_ISSOCK):
+        return None
+    
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def call(tool_dir: Path, method: str, params: Optional[Dict] = None,
+         timeout: Optional[float] = CONNECT_TIMEOUT) -> Optional[Dict]:
+    """
+    Send one JSON-RPC request to the daemon.
+    
+    Args:
+        tool_dir: Tool directory the daemon serves
+        method: JSON-RPC method name
+        params: Method parameters
+        timeout: Seconds to wait for the response (None waits forever)
+    
+    Returns:
+        Result dict, or None if no daemon is reachable
+    
+    Raises:
+        RuntimeError: If the daemon was reached but the request failed
+    """
+    sock = _connect(tool_dir)
+    if sock is None:
+        return None
+    
+    request = {'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params or {}}
+    try:
+        sock.settimeout(timeout)
+        sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    except OSError as e:
+        raise RuntimeError(f"Daemon request failed: {str(e)}")
+    finally:
+        sock.close()
+    
+    if not line:
+        raise RuntimeError("Daemon closed the connection without a response")
+    response = json.loads(line.decode('utf-8'))
+    if 'error' in response:
+        raise RuntimeError(f"Daemon error: {response['error'].get('message')}")
+    return response.get('result')
+
+
+def ping(tool_dir: Path) -> Optional[Dict]:
+    """Get daemon info (None if it is not running)."""
+    try:
+        return call(tool_dir, 'ping')
+    except (RuntimeError, ValueError):
+        return None
+
+
+def run_via_daemon(tool_dir: Path, argv: List[str]) -> Optional[int]:
+    """
+    Run a CLI command in the daemon and replay its output.
+    
+    Returns:
+        Exit code of the command, or None if no daemon is running (run it locally)
+    """
+    if os.environ.get(DISABLE_ENV):
+        return None
+    
+    try:
+        result = call(tool_dir, 'run', {'argv': argv, 'cwd': os.getcwd()}, timeout=None)
+    except (RuntimeError, ValueError) as e:
+        # The command may have been applied already, so do not run it again locally
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+    if result is None:
+        return None
+    
+    sys.stdout.write(result.get('stdout', ''))
+    sys.stderr.write(result.get('stderr', ''))
+    return result.get('exit_code', 1)
+
+
+def serve(tool_dir: Path, run_argv: Callable[[List[str]], int]):
+    """
+    Serve commands for tool_dir until shutdown is requested or interrupted.
+    
+    Args:
+        tool_dir: Tool directory the daemon serves
+        run_argv: Callable that runs one CLI argv and returns its exit code
+    """
+    _make_socket_dir()
+    path = socket_path(tool_dir)
+    if os.path.lexists(str(path)):
+        if ping(tool_dir):
+            raise RuntimeError(f"A daemon is already running on {path}")
+        if not _is_private(path, stat.S_ISSOCK):
+            raise RuntimeError(f"{path} exists and is not a socket owned by you; remove it first")
+        # Left behind by a daemon that did not exit cleanly
+        path.unlink()
+    
+    server = DaemonServer(path, run_argv)
+    print(f"Daemon listening on {path} (pid {os.getpid()})")
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def start_detached(tool_dir: Path, script: Path) -> Optional[Dict]:
+    """
+    Start the daemon in a background process and wait until it answers.
+    
+    Returns:
+        Daemon info, or None if it did not come up in time
+    """
+    import subprocess
+    
+    subprocess.Popen(
+        [sys.executable, str(script), 'daemon', 'start'],
+        cwd=str(tool_dir),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    
+    deadline = time.time() + START_TIMEOUT
+    while time.time() < deadline:
+        info = ping(tool_dir)
+        if info:
+            return info
+        time.sleep(0.1)
+    return None
+
+
+def stop(tool_dir: Path) -> bool:
+    """Ask the daemon to shut down (False if it is not running)."""
+    try:
+        return call(tool_dir, 'shutdown') is not None
+    except (RuntimeError, ValueError):
+        return False
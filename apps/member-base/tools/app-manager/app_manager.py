@@ -8,63 +8,191 @@ import sys
 import json
 import shutil
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import time
 import argparse
 
-# Import existing modules
-from config_io import load_tenants, load_plugins, save_tenants, validate_tenant, validate_all_tenants, normalize_tenant_id
-from repo_generator import generate_repo, list_generated_apps, get_repo_root
+# Heavier modules (config_io, repo_generator, concurrent.futures) are imported
+# where they are used, so read-only commands only pay for what they need
+from repo_context import get_repo_context
+
+
+# Default number of apps synced concurrently (sync is I/O-bound)
+SYNC_MAX_WORKERS = 8
+
+# Watch mode: seconds between stat polls and seconds files must be unchanged before reloading
+WATCH_INTERVAL = 1.0
+WATCH_DEBOUNCE = 0.5
+
+# Exit codes for commands that process many apps
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_PARTIAL_FAILURE = 2
+
+# Operations accepted by apply (one JSON object per line)
+BATCH_OPS = ('create', 'update', 'delete')
+
+# Commands that never go through the daemon (long-running or managing the daemon itself)
+LOCAL_ONLY_COMMANDS = {'daemon', 'watch'}
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """Cheap change signature of a file (mtime and size, None if missing)."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
 
 class AppManager:
     """Main manager class for app operations."""
     
-    def __init__(self):
-        self.repo_root = get_repo_root()
+    def __init__(self, use_index: bool = False):
+        """
+        Args:
+            use_index: Keep a TenantIndex for filtered queries (worth it for long-lived managers like the daemon)
+        """
+        self.context = get_repo_context()
+        self.repo_root = self.context.repo_root
         if not self.repo_root:
             raise RuntimeError("Could not find repository root directory")
         
-        self.tenants_file = Path(__file__).parent / 'tenants.json'
-        self.plugins_file = Path(__file__).parent / 'plugins.json'
-        self.apps_dir = self.repo_root / 'apps'
+        self.tenants_file = self.context.tenants_file
+        self.plugins_file = self.context.plugins_file
+        self.apps_dir = self.context.apps_dir
+        
+        # tenants.json/plugins.json are loaded on first use
+        self._tenants: Optional[Dict] = None
+        self._plugins: Optional[Dict] = None
+        # Content version of tenants.json when it was loaded (None if unknown)
+        self._tenants_version: Optional[str] = None
+        self._loaded_signatures: Dict[Path, Optional[Tuple[int, int]]] = {}
+        
+        self.use_index = use_index
+        self._index = None
         
-        # Load data
-        self.tenants, error = load_tenants()
+        # Undo/redo of tenant changes made through this manager (created on first change)
+        self._history = None
+    
+    def _load_tenants(self):
+        """Read tenants.json (raises RuntimeError if it cannot be loaded)."""
+        from config_io import load_tenants_versioned
+        
+        signature = _file_signature(self.tenants_file)
+        tenants, version, error = load_tenants_versioned(str(self.tenants_file))
         if error:
             raise RuntimeError(f"Error loading tenants: {error}")
+        self._tenants = tenants
+        self._tenants_version = version
+        self._loaded_signatures[self.tenants_file] = signature
+    
+    def _load_plugins(self):
+        """Read plugins.json (raises RuntimeError if it cannot be loaded)."""
+        from config_io import load_plugins
         
-        self.plugins, error = load_plugins()
+        signature = _file_signature(self.plugins_file)
+        plugins, error = load_plugins(str(self.plugins_file))
         if error:
             raise RuntimeError(f"Error loading plugins: {error}")
+        self._plugins = plugins
+        self._loaded_signatures[self.plugins_file] = signature
+    
+    @property
+    def tenants(self) -> Dict:
+        """Tenant registry (tenants.json is loaded on first access)."""
+        if self._tenants is None:
+            self._load_tenants()
+        return self._tenants
+    
+    @tenants.setter
+    def tenants(self, tenants: Dict):
+        self._tenants = tenants
+        self._tenants_version = None
+    
+    @property
+    def plugins(self) -> Dict:
+        """Plugin registry (plugins.json is loaded on first access)."""
+        if self._plugins is None:
+            self._load_plugins()
+        return self._plugins
+    
+    @plugins.setter
+    def plugins(self, plugins: Dict):
+        self._plugins = plugins
+    
+    def reload(self):
+        """Load tenants.json and plugins.json from disk now."""
+        self._load_tenants()
+        self._load_plugins()
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Drop loaded registries whose file changed on disk since they were loaded (used by the daemon).
+        
+        Returns:
+            True if anything was dropped (it is reloaded on next access)
+        """
+        def changed_on_disk(path: Path) -> bool:
+            return _file_signature(path) != self._loaded_signatures.get(path)
+        
+        changed = False
+        if self._tenants is not None and changed_on_disk(self.tenants_file):
+            self._tenants = None
+            changed = True
+        if self._plugins is not None and changed_on_disk(self.plugins_file):
+            self._plugins = None
+            changed = True
+        return changed
+    
+    @property
+    def history(self):
+        """Undo/redo history of tenant changes made through this manager."""
+        if self._history is None:
+            from history import History
+            self._history = History()
+        return self._history
+    
+    def invalidate(self):
+        """Drop loaded registries so they are read from disk on next access."""
+        self._tenants = None
+        self._plugins = None
     
     def list_tenants(self) -> List[str]:
         """List all tenant IDs."""
         return sorted(self.tenants.keys())
     
+    def iter_tenants(self, tenant_filter=None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Yield (tenant_id, tenant) pairs matching a TenantFilter, ordered by tenant ID.
+        
+        Uses the tenant index when use_index is set (built on first query and
+        rebuilt after the registry changes), otherwise filters while iterating.
+        """
+        from tenant_query import TenantFilter, TenantIndex, iter_matching
+        
+        tenant_filter = tenant_filter or TenantFilter()
+        tenants = self.tenants
+        index = None
+        if self.use_index and not tenant_filter.is_empty():
+            if self._index is None or self._index.tenants is not tenants:
+                self._index = TenantIndex(tenants)
+            index = self._index
+        return iter_matching(tenants, tenant_filter, index)
+    
     def list_apps(self) -> List[str]:
         """List all generated app directories."""
-        return list_generated_apps()
+        return self.context.list_generated_apps()
     
     def get_tenant(self, tenant_id: str) -> Optional[Dict]:
         """Get tenant configuration."""
         return self.tenants.get(tenant_id)
     
-    def create_tenant(self, tenant_id: str, name: str, role: str = 'member', 
-                     enabled_features: List[str] = None, theme: Dict = None,
-                     home_variant: str = 'member') -> Tuple[bool, str]:
-        """Create a new tenant."""
-        # Normalize tenant ID: lowercase, kebab-case format
-        tenant_id = normalize_tenant_id(tenant_id)
-        
-        if not tenant_id:
-            return False, "Tenant ID cannot be empty"
-        
-        if tenant_id in self.tenants:
-            return False, f"Tenant '{tenant_id}' already exists"
-        
-        if not tenant_id.replace('-', '').isalnum():
-            return False, "Invalid tenant ID. Must be alphanumeric with dashes only"
-        
+    @staticmethod
+    def _new_tenant(tenant_id: str, name: str, role: str = 'member',
+                    enabled_features: List[str] = None, theme: Dict = None,
+                    home_variant: str = 'member') -> Dict:
+        """Build a new tenant dict with defaults filled in."""
         # Default theme
         if not theme:
             theme = {
@@ -73,7 +201,7 @@ class AppManager:
                 "primaryLight": "#E6F2FF"
             }
         
-        new_tenant = {
+        return {
             "id": tenant_id,
             "name": name,
             "role": role,
@@ -82,6 +210,104 @@ class AppManager:
             "enabledFeatures": enabled_features or [],
             "homeTabs": [] if home_variant == 'member' else None
         }
+    
+    def _save_tenants(self, base: Dict[str, Optional[Dict]],
+                      tenants: Optional[Dict] = None, validate: bool = True,
+                      label: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Save tenants.json under the registry lock without discarding other writers' changes.
+        
+        See config_io.save_tenant_changes; on success the saved (possibly merged)
+        registry becomes self.tenants.
+        
+        Args:
+            base: Tenants this save changes, as they were when loaded (None for new tenants)
+            tenants: Registry to save (defaults to self.tenants)
+            validate: Validate all tenants before saving
+            label: Record the save as an undoable step with this description
+        
+        Returns:
+            Tuple of (success, error_message)
+        """
+        from config_io import save_tenant_changes
+        
+        saved, version, error = save_tenant_changes(
+            base, self.tenants if tenants is None else tenants, self.plugins, self._tenants_version,
+            str(self.tenants_file), validate=validate
+        )
+        if error:
+            return False, error
+        
+        self._tenants = saved
+        self._tenants_version = version
+        self._loaded_signatures[self.tenants_file] = _file_signature(self.tenants_file)
+        self._index = None
+        if label:
+            self.history.record(label, base, {tenant_id: saved.get(tenant_id) for tenant_id in base}, saved)
+        return True, None
+    
+    def undo(self) -> Tuple[bool, str]:
+        """
+        Undo the last tenant change made through this manager (create, update, delete or apply).
+        
+        Only the tenants that step changed are written back, and only if
+        nobody changed them since.
+        """
+        return self.history.undo(self._restore_tenants)
+    
+    def redo(self) -> Tuple[bool, str]:
+        """Redo the last undone tenant change."""
+        return self.history.redo(self._restore_tenants)
+    
+    def _restore_tenants(self, changes: Dict[str, Optional[Dict]],
+                         expected: Dict[str, Optional[Dict]]) -> Tuple[bool, str]:
+        """Save tenants from a history snapshot (None deletes), if they still are as expected."""
+        from config_io import validate_tenant
+        
+        changed_since = sorted(tenant_id for tenant_id, tenant in expected.items()
+                               if self.tenants.get(tenant_id) != tenant)
+        if changed_since:
+            return False, f"Tenant(s) {', '.join(changed_since)} were changed by another writer since"
+        
+        for tenant_id, tenant in changes.items():
+            if tenant is not None:
+                is_valid, error = validate_tenant(tenant, tenant_id, self.plugins)
+                if not is_valid:
+                    return False, f"Validation error: {error}"
+        
+        working = dict(self.tenants)
+        for tenant_id, tenant in changes.items():
+            if tenant is None:
+                working.pop(tenant_id, None)
+            else:
+                working[tenant_id] = tenant
+        base = {tenant_id: self.tenants.get(tenant_id) for tenant_id in changes}
+        self._index = None
+        success, error = self._save_tenants(base, working, validate=False)
+        if not success:
+            return False, f"Error saving: {error}"
+        return True, ''
+    
+    def create_tenant(self, tenant_id: str, name: str, role: str = 'member', 
+                     enabled_features: List[str] = None, theme: Dict = None,
+                     home_variant: str = 'member') -> Tuple[bool, str]:
+        """Create a new tenant."""
+        from config_io import normalize_tenant_id, validate_tenant
+        
+        # Normalize tenant ID: lowercase, kebab-case format
+        tenant_id = normalize_tenant_id(tenant_id)
+        
+        if not tenant_id:
+            return False, "Tenant ID cannot be empty"
+        
+        if tenant_id in self.tenants:
+            return False, f"Tenant '{tenant_id}' already exists"
+        
+        if not tenant_id.replace('-', '').isalnum():
+            return False, "Invalid tenant ID. Must be alphanumeric with dashes only"
+        
+        new_tenant = self._new_tenant(tenant_id, name, role=role, enabled_features=enabled_features,
+                                      theme=theme, home_variant=home_variant)
         
         # Validate
         is_valid, error = validate_tenant(new_tenant, tenant_id, self.plugins)
@@ -89,7 +315,8 @@ class AppManager:
             return False, f"Validation error: {error}"
         
         self.tenants[tenant_id] = new_tenant
-        success, error = save_tenants(self.tenants, self.plugins)
+        self._index = None
+        success, error = self._save_tenants({tenant_id: None}, label=f"create {tenant_id}")
         if not success:
             return False, f"Error saving: {error}"
         
@@ -97,6 +324,9 @@ class AppManager:
     
     def update_tenant(self, tenant_id: str, **updates) -> Tuple[bool, str]:
         """Update tenant configuration."""
+        import copy
+        from config_io import validate_tenant
+        
         if tenant_id not in self.tenants:
             return False, f"Tenant '{tenant_id}' not found"
         
@@ -104,7 +334,9 @@ class AppManager:
             return False, "Cannot change DEFAULT tenant ID"
         
         # Update tenant
+        self._index = None
         tenant = self.tenants[tenant_id]
+        base = {tenant_id: copy.deepcopy(tenant)}
         for key, value in updates.items():
             if key == 'enabledFeatures':
                 # Validate features
@@ -119,7 +351,7 @@ class AppManager:
             return False, f"Validation error: {error}"
         
         self.tenants[tenant_id] = tenant
-        success, error = save_tenants(self.tenants, self.plugins)
+        success, error = self._save_tenants(base, label=f"update {tenant_id} ({', '.join(sorted(updates))})")
         if not success:
             return False, f"Error saving: {error}"
         
@@ -135,7 +367,7 @@ class AppManager:
         
         # Delete app directory if requested
         if delete_app:
-            app_dir = self.apps_dir / tenant_id
+            app_dir = self.context.app_dir(tenant_id)
             if app_dir.exists():
                 try:
                     shutil.rmtree(app_dir)
@@ -143,18 +375,154 @@ class AppManager:
                     return False, f"Error deleting app directory: {str(e)}"
         
         # Delete tenant
-        del self.tenants[tenant_id]
-        success, error = save_tenants(self.tenants, self.plugins)
+        base = {tenant_id: self.tenants.pop(tenant_id)}
+        self._index = None
+        success, error = self._save_tenants(base, label=f"delete {tenant_id}")
         if not success:
             return False, f"Error saving: {error}"
         
         return True, f"Tenant '{tenant_id}' deleted successfully"
     
+    def _apply_operation(self, working: Dict, copied: set, line: str) -> Tuple[str, str, bool, str]:
+        """
+        Apply one JSON operation line to the working registry.
+        
+        Tenants are copied into working the first time they are modified
+        (tracked in copied), so the loaded registry stays untouched.
+        
+        Returns:
+            Tuple of (op, tenant_id, success, message)
+        """
+        import copy
+        from config_io import normalize_tenant_id
+        
+        try:
+            operation = json.loads(line)
+        except json.JSONDecodeError as e:
+            return '?', '', False, f"Invalid JSON: {str(e)}"
+        if not isinstance(operation, dict):
+            return '?', '', False, "Operation must be a JSON object"
+        
+        op = str(operation.pop('op', ''))
+        tenant_id = str(operation.pop('id', '') or '')
+        if op == 'create':
+            # Like create-tenant: new IDs are normalized, existing ones are looked up exactly as given
+            tenant_id = normalize_tenant_id(tenant_id)
+        if op not in BATCH_OPS:
+            return op or '?', tenant_id, False, f"Unknown op '{op}' (expected {', '.join(BATCH_OPS)})"
+        if not tenant_id:
+            return op, '', False, "Tenant ID ('id') is required"
+        
+        if op == 'create':
+            if tenant_id in working:
+                return op, tenant_id, False, f"Tenant '{tenant_id}' already exists"
+            if not tenant_id.replace('-', '').isalnum():
+                return op, tenant_id, False, "Invalid tenant ID. Must be alphanumeric with dashes only"
+            new_tenant = self._new_tenant(
+                tenant_id,
+                operation.pop('name', None),
+                role=operation.pop('role', 'member'),
+                enabled_features=operation.pop('enabledFeatures', None),
+                theme=operation.pop('theme', None),
+                home_variant=operation.pop('homeVariant', 'member')
+            )
+            new_tenant.update(operation)
+            working[tenant_id] = new_tenant
+            copied.add(tenant_id)
+            return op, tenant_id, True, "Created"
+        
+        if tenant_id not in working:
+            return op, tenant_id, False, f"Tenant '{tenant_id}' not found"
+        
+        if op == 'delete':
+            if tenant_id.upper() == 'DEFAULT':
+                return op, tenant_id, False, "Cannot delete DEFAULT tenant"
+            del working[tenant_id]
+            copied.discard(tenant_id)
+            return op, tenant_id, True, "Deleted"
+        
+        if not operation:
+            return op, tenant_id, False, "No updates specified"
+        if tenant_id not in copied:
+            working[tenant_id] = copy.deepcopy(working[tenant_id])
+            copied.add(tenant_id)
+        working[tenant_id].update(operation)
+        return op, tenant_id, True, f"Updated {', '.join(sorted(operation))}"
+    
+    def apply_operations(self, lines: Iterable[str],
+                         dry_run: bool = False) -> Tuple[bool, List[Tuple[int, str, str, bool, str]], str]:
+        """
+        Apply a stream of tenant operations in memory and save tenants.json once.
+        
+        Each line is a JSON object such as
+        {"op": "create", "id": "acme", "name": "Acme", "role": "merchant"},
+        {"op": "update", "id": "acme", "enabledFeatures": ["payment"]} or
+        {"op": "delete", "id": "acme"}. Update fields replace top-level tenant
+        fields, like update-tenant. Blank lines and lines starting with '#' are skipped.
+        
+        Every affected tenant is validated once after all operations are applied,
+        and nothing is written unless every operation succeeded.
+        
+        Args:
+            lines: Operation lines, consumed one at a time (a file object or sys.stdin)
+            dry_run: Check all operations without saving
+        
+        Returns:
+            Tuple of (success, list of (line, op, tenant_id, success, message) rows, summary message)
+        """
+        from config_io import validate_tenant
+        
+        working = dict(self.tenants)
+        copied = set()
+        # tenant_id -> index in results of the last operation that touched it
+        last_touch: Dict[str, int] = {}
+        results = []
+        
+        for line_no, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            op, tenant_id, success, msg = self._apply_operation(working, copied, line)
+            if success:
+                last_touch[tenant_id] = len(results)
+            results.append((line_no, op, tenant_id, success, msg))
+        
+        if not results:
+            return False, results, "No operations to apply"
+        
+        # Validate each affected tenant once, blaming the last operation that touched it
+        for tenant_id, index in last_touch.items():
+            if tenant_id not in working:
+                continue
+            is_valid, error = validate_tenant(working[tenant_id], tenant_id, self.plugins)
+            if not is_valid:
+                line_no, op, _, _, _ = results[index]
+                results[index] = (line_no, op, tenant_id, False, f"Validation error: {error}")
+        
+        failed = sum(1 for row in results if not row[3])
+        if failed:
+            return False, results, f"Nothing saved: {failed} of {len(results)} operation(s) failed"
+        
+        if dry_run:
+            return True, results, f"Dry run: {len(results)} operation(s) valid, nothing saved"
+        
+        # Tenants in working were copied before being changed, so self.tenants still holds the loaded state
+        base = {tenant_id: self.tenants.get(tenant_id) for tenant_id in last_touch}
+        success, error = self._save_tenants(base, working, validate=False,
+                                            label=f"apply {len(results)} operation(s)")
+        if not success:
+            return False, results, f"Error saving: {error}"
+        
+        return True, results, f"Applied {len(results)} operation(s) to {len(last_touch)} tenant(s) with one save"
+    
     def generate_app(self, tenant_id: str, overwrite: bool = False, 
                     app_folder_name: Optional[str] = None,
                     output_path: Optional[str] = None,
-                    template_variant: Optional[str] = None) -> Tuple[bool, str]:
+                    template_variant: Optional[str] = None,
+                    keep_all_assets: bool = False) -> Tuple[bool, str]:
         """Generate app repository for a tenant."""
+        from repo_generator import generate_repo
+        
         if tenant_id not in self.tenants:
             return False, f"Tenant '{tenant_id}' not found"
         
@@ -162,19 +530,25 @@ class AppManager:
         return generate_repo(tenant_id, tenant, overwrite=overwrite, 
                            app_folder_name=app_folder_name, 
                            output_path=output_path,
-                           template_variant=template_variant)
+                           template_variant=template_variant,
+                           keep_all_assets=keep_all_assets)
+    
+    def refresh_repo(self, repo_path: str, dry_run: bool = False) -> Tuple[bool, List[Tuple], str]:
+        """Copy changed packages/core and plugin files into a standalone repo (see repo_generator.refresh_repo)."""
+        from repo_generator import refresh_repo
+        return refresh_repo(repo_path, dry_run=dry_run)
     
     def sync_config(self, tenant_id: str) -> Tuple[bool, str]:
         """Sync tenant config to app config file."""
         if tenant_id not in self.tenants:
             return False, f"Tenant '{tenant_id}' not found"
         
-        app_dir = self.apps_dir / tenant_id
+        app_dir = self.context.app_dir(tenant_id)
         if not app_dir.exists():
             return False, f"App directory for '{tenant_id}' does not exist. Generate it first."
         
         # Regenerate config
-        from repo_generator import generate_config_from_tenant
+        from repo_generator import generate_config_from_tenant, write_plugin_registry
         tenant = self.tenants[tenant_id]
         config_content = generate_config_from_tenant(tenant, tenant_id)
         
@@ -184,36 +558,197 @@ class AppManager:
         try:
             with open(config_file, 'w', encoding='utf-8') as f:
                 f.write(config_content)
-            return True, f"Config synced for '{tenant_id}'"
+            
+            # Regenerate static plugin registry for the enabled plugins
+            plugin_count, warnings = write_plugin_registry(app_dir, tenant, tenant_id, self.context.plugins_dir)
+            message = f"Config synced for '{tenant_id}' ({plugin_count} plugins)"
+            if warnings:
+                message += f" - {'; '.join(warnings)}"
+            return True, message
         except Exception as e:
             return False, f"Error syncing config: {str(e)}"
     
-    def sync_all_configs(self) -> Tuple[bool, List[str]]:
-        """Sync configs for all generated apps."""
-        apps = list_generated_apps()
-        results = []
-        all_success = True
+    def _sync_config_isolated(self, app_id: str) -> Tuple[str, bool, str]:
+        """Sync one app, turning any exception into a failed result row."""
+        if app_id not in self.tenants:
+            return app_id, True, "Skipped (no tenant)"
+        try:
+            success, msg = self.sync_config(app_id)
+            return app_id, success, msg
+        except Exception as e:
+            return app_id, False, f"Error syncing config: {str(e)}"
+    
+    def sync_all_configs(self, max_workers: Optional[int] = None) -> Tuple[bool, List[Tuple[str, bool, str]]]:
+        """
+        Sync configs for all generated apps concurrently.
+        
+        Each app is synced in isolation, so one failing app does not stop the others.
+        
+        Args:
+            max_workers: Maximum number of apps synced at the same time (defaults to SYNC_MAX_WORKERS)
+            
+        Returns:
+            Tuple of (all_success, list of (app_id, success, message) rows, one per app)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        apps = self.context.list_generated_apps()
+        if not apps:
+            return True, []
         
-        for app_id in apps:
-            if app_id in self.tenants:
-                success, msg = self.sync_config(app_id)
-                results.append(f"{app_id}: {msg}")
-                if not success:
-                    all_success = False
+        workers = max(1, min(max_workers or SYNC_MAX_WORKERS, len(apps)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._sync_config_isolated, apps))
         
+        all_success = all(success for _, success, _ in results)
         return all_success, results
     
+    def _watch_signature(self) -> Tuple:
+        """Cheap change signature of tenants.json and plugins.json (mtime and size)."""
+        return _file_signature(self.tenants_file), _file_signature(self.plugins_file)
+    
+    def sync_changed(self, tenants: Dict, plugins: Dict) -> List[str]:
+        """
+        Replace in-memory registries and sync only tenants whose content changed.
+        
+        A tenant also counts as changed when one of its enabled plugins changed in plugins.json.
+        
+        Returns:
+            List of report lines
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from config_io import validate_tenant, diff_registries
+        
+        added, removed, changed = diff_registries(self.tenants, tenants)
+        _, removed_plugins, changed_plugins = diff_registries(self.plugins, plugins)
+        touched_plugins = set(removed_plugins) | set(changed_plugins)
+        
+        to_sync = set(changed)
+        if touched_plugins:
+            to_sync.update(
+                tenant_id for tenant_id, tenant in tenants.items()
+                if tenant_id not in added and touched_plugins & set(tenant.get('enabledFeatures', []))
+            )
+        
+        self.tenants = tenants
+        self.plugins = plugins
+        
+        report = []
+        if added:
+            report.append(f"Added tenants (no app to sync): {', '.join(added)}")
+        if removed:
+            report.append(f"Removed tenants: {', '.join(removed)}")
+        
+        apps = set(self.context.list_generated_apps())
+        valid = []
+        for tenant_id in sorted(to_sync):
+            if tenant_id not in apps:
+                report.append(f"{tenant_id}: Changed, no generated app")
+                continue
+            is_valid, error = validate_tenant(tenants[tenant_id], tenant_id, plugins)
+            if not is_valid:
+                report.append(f"{tenant_id}: Not synced, validation error: {error}")
+                continue
+            valid.append(tenant_id)
+        
+        if valid:
+            workers = max(1, min(SYNC_MAX_WORKERS, len(valid)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for app_id, _, msg in executor.map(self._sync_config_isolated, valid):
+                    report.append(f"{app_id}: {msg}")
+        
+        if not report:
+            report.append("No tenant content changed")
+        return report
+    
+    def watch(self, interval: float = WATCH_INTERVAL, debounce: float = WATCH_DEBOUNCE):
+        """
+        Poll tenants.json/plugins.json and sync only tenants that changed.
+        
+        Runs until interrupted (Ctrl+C).
+        """
+        from config_io import load_tenants, load_plugins
+        
+        print(f"Watching {self.tenants_file.name} and {self.plugins_file.name} (Ctrl+C to stop)...")
+        last_signature = self._watch_signature()
+        # Registries load lazily: snapshot them now so the first change has something to diff against
+        self.reload()
+        
+        while True:
+            time.sleep(interval)
+            signature = self._watch_signature()
+            if signature == last_signature:
+                continue
+            
+            # Debounce: wait until the files stop changing (editors write in several steps)
+            while True:
+                time.sleep(debounce)
+                settled = self._watch_signature()
+                if settled == signature:
+                    break
+                signature = settled
+            last_signature = signature
+            
+            plugins, error = load_plugins(str(self.plugins_file))
+            if error:
+                print(f"[{time.strftime('%H:%M:%S')}] ⚠️  {error} (keeping previous registry)")
+                continue
+            tenants, error = load_tenants(str(self.tenants_file))
+            if error:
+                print(f"[{time.strftime('%H:%M:%S')}] ⚠️  {error} (keeping previous registry)")
+                continue
+            
+            print(f"[{time.strftime('%H:%M:%S')}] Change detected:")
+            for line in self.sync_changed(tenants, plugins):
+                print(f"  {line}")
+    
     def validate_all(self) -> Tuple[bool, str]:
         """Validate all tenants."""
+        from config_io import validate_all_tenants
+        
         is_valid, error = validate_all_tenants(self.tenants, self.plugins)
         if is_valid:
             return True, "All tenants are valid"
         else:
             return False, f"Validation errors: {error}"
     
-    def get_status(self) -> Dict:
-        """Get status of all tenants and apps."""
-        apps = list_generated_apps()
+    def get_drift(self, max_workers: Optional[int] = None) -> Dict:
+        """
+        Compare each generated app's config/app.config.ts with what its tenant would render.
+        
+        Hashes are computed in parallel and cached in .cache/render_cache.json,
+        so repeated calls only re-render tenants or re-read files that changed.
+        
+        Returns:
+            Dict with 'stale', 'missing_config' and 'up_to_date' lists of app IDs
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from render_cache import RenderCache
+        
+        cache = RenderCache(self.context.tool_dir)
+        apps = [app_id for app_id in self.context.list_generated_apps() if app_id in self.tenants]
+        
+        def check(app_id: str) -> Tuple[str, str]:
+            config_file = self.context.app_dir(app_id) / 'config' / 'app.config.ts'
+            actual = cache.file_hash(config_file)
+            if actual is None:
+                return app_id, 'missing_config'
+            expected = cache.expected_hash(app_id, self.tenants[app_id])
+            return app_id, 'up_to_date' if actual == expected else 'stale'
+        
+        drift = {'stale': [], 'missing_config': [], 'up_to_date': []}
+        if apps:
+            workers = max(1, min(max_workers or SYNC_MAX_WORKERS, len(apps)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for app_id, state in executor.map(check, apps):
+                    drift[state].append(app_id)
+        
+        cache.save()
+        return drift
+    
+    def get_status(self, drift: bool = False) -> Dict:
+        """Get status of all tenants and apps (with config drift if requested)."""
+        apps = self.context.list_generated_apps()
         
         # Check homeVariant usage
         home_variants_used = {}
@@ -240,18 +775,36 @@ class AppManager:
                 "note": "⚠️  homeVariant belum diimplementasikan di HomeScreen. Lihat HOME_VARIANT.md untuk detail."
             }
         }
+        if drift:
+            status["drift"] = self.get_drift()
         return status
 
 
-def main():
-    """CLI entry point."""
+def build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser."""
     parser = argparse.ArgumentParser(description='Closepay App Manager')
+    parser.add_argument('--profile', action='store_true',
+                       help='Time each phase of the command and write a JSON report')
+    parser.add_argument('--profile-output', metavar='PATH',
+                       help='Report path (default: .cache/profiles/<command>-<timestamp>.json)')
+    parser.add_argument('--cprofile', action='store_true',
+                       help='Also write a cProfile .prof file next to the report (implies --profile)')
     subparsers = parser.add_subparsers(dest='command', help='Commands')
     
     # List command
     list_parser = subparsers.add_parser('list', help='List tenants or apps')
     list_parser.add_argument('type', choices=['tenants', 'apps', 'all'], 
                             help='What to list')
+    list_parser.add_argument('--role', choices=['merchant', 'member', 'admin', 'pos'],
+                            help='Only tenants with this role')
+    list_parser.add_argument('--feature', action='append', dest='features', metavar='PLUGIN_ID',
+                            help='Only tenants with this plugin enabled (repeatable, all must match)')
+    list_parser.add_argument('--home-variant', choices=['dashboard', 'simple', 'member', 'custom'],
+                            help='Only tenants with this home variant')
+    list_parser.add_argument('--name', metavar='GLOB',
+                            help="Only tenants whose name or ID matches a glob, e.g. 'koperasi*' (case-insensitive)")
+    list_parser.add_argument('--format', choices=['text', 'json', 'ndjson'], default='text',
+                            help='Output format for tenants (default: text)')
     
     # Create tenant
     create_parser = subparsers.add_parser('create-tenant', help='Create a new tenant')
@@ -282,6 +835,17 @@ def main():
     delete_parser.add_argument('--delete-app', action='store_true',
                               help='Also delete app directory')
     
+    # Undo/redo (history lives in the process, so across CLI calls this needs the daemon)
+    subparsers.add_parser('undo', help='Undo the last tenant change (create/update/delete/apply) made through the daemon')
+    subparsers.add_parser('redo', help='Redo the last undone tenant change')
+    
+    # Apply batch operations
+    apply_parser = subparsers.add_parser('apply', help='Apply create/update/delete operations from a JSON lines file with one save')
+    apply_parser.add_argument('file', nargs='?', default='-',
+                             help="File with one JSON operation per line ('-' or omitted reads stdin)")
+    apply_parser.add_argument('--dry-run', action='store_true',
+                             help='Check all operations without saving')
+    
     # Generate app
     generate_parser = subparsers.add_parser('generate', help='Generate app repository')
     generate_parser.add_argument('tenant_id', help='Tenant ID')
@@ -291,131 +855,357 @@ def main():
                                 help='Output directory path (defaults to apps/{folder_name})')
     generate_parser.add_argument('--overwrite', action='store_true',
                                 help='Overwrite existing app')
+    generate_parser.add_argument('--keep-all-assets', action='store_true',
+                                help='Copy the whole assets/ tree (standalone repos copy only referenced assets by default)')
+    
+    # Refresh standalone repo
+    refresh_parser = subparsers.add_parser('refresh', help='Update packages/core and enabled plugins in a standalone repo')
+    refresh_parser.add_argument('repo', help='Root of the standalone repo (the generate --output directory)')
+    refresh_parser.add_argument('--dry-run', action='store_true',
+                                help='List the files that would be copied or removed without changing anything')
     
     # Sync config
     sync_parser = subparsers.add_parser('sync', help='Sync config to app')
     sync_parser.add_argument('tenant_id', nargs='?', help='Tenant ID (optional, syncs all if omitted)')
+    sync_parser.add_argument('--jobs', '-j', type=int, default=SYNC_MAX_WORKERS,
+                            help=f'Apps synced concurrently when syncing all (default: {SYNC_MAX_WORKERS})')
     
     # Validate
     validate_parser = subparsers.add_parser('validate', help='Validate all tenants')
     
+    # Watch
+    watch_parser = subparsers.add_parser('watch', help='Auto-sync tenants changed in tenants.json/plugins.json')
+    watch_parser.add_argument('--interval', type=float, default=WATCH_INTERVAL,
+                             help=f'Seconds between file checks (default: {WATCH_INTERVAL})')
+    watch_parser.add_argument('--debounce', type=float, default=WATCH_DEBOUNCE,
+                             help=f'Seconds files must be unchanged before syncing (default: {WATCH_DEBOUNCE})')
+    
     # Status
     status_parser = subparsers.add_parser('status', help='Show status')
+    status_parser.add_argument('--drift', action='store_true',
+                              help='Also list apps whose app.config.ts is stale compared to tenants.json')
     
-    args = parser.parse_args()
+    # Daemon
+    daemon_parser = subparsers.add_parser('daemon', help='Keep a warm app manager running for fast CLI calls')
+    daemon_parser.add_argument('action', choices=['start', 'stop', 'status'],
+                              help='Daemon action')
+    daemon_parser.add_argument('--detach', action='store_true',
+                              help='Run the daemon in the background (start only)')
     
-    if not args.command:
-        parser.print_help()
-        return
+    return parser
+
+
+def run_command(manager: AppManager, args: argparse.Namespace) -> int:
+    """
+    Run a parsed CLI command.
     
-    try:
-        manager = AppManager()
+    Returns:
+        Exit code
+    """
+    if args.command == 'list':
+        from tenant_query import TenantFilter
+        
+        tenant_filter = TenantFilter(role=args.role, features=args.features,
+                                     home_variant=args.home_variant, name=args.name)
+        if args.type != 'tenants' and (args.format != 'text' or not tenant_filter.is_empty()):
+            print("Filters and --format only apply to 'list tenants'")
+            return 1
         
-        if args.command == 'list':
-            if args.type == 'tenants':
-                tenants = manager.list_tenants()
-                print(f"Tenants ({len(tenants)}):")
-                for tenant_id in tenants:
-                    tenant = manager.get_tenant(tenant_id)
+        if args.type == 'tenants':
+            # Matches are written as they are found, never collected first
+            matches = manager.iter_tenants(tenant_filter)
+            if args.format == 'ndjson':
+                for _, tenant in matches:
+                    sys.stdout.write(json.dumps(tenant, ensure_ascii=False) + '\n')
+            elif args.format == 'json':
+                sys.stdout.write('[')
+                first = True
+                for _, tenant in matches:
+                    sys.stdout.write(('\n  ' if first else ',\n  ') + json.dumps(tenant, ensure_ascii=False))
+                    first = False
+                sys.stdout.write(']\n' if first else '\n]\n')
+            else:
+                if tenant_filter.is_empty():
+                    print(f"Tenants ({len(manager.tenants)}):")
+                count = 0
+                for tenant_id, tenant in matches:
                     features = ', '.join(tenant.get('enabledFeatures', [])) or 'none'
                     print(f"  - {tenant_id}: {tenant.get('name')} ({tenant.get('role')}) - Features: {features}")
-            elif args.type == 'apps':
-                apps = manager.list_apps()
-                print(f"Generated Apps ({len(apps)}):")
-                for app_id in apps:
-                    print(f"  - {app_id}")
-            elif args.type == 'all':
-                tenants = manager.list_tenants()
-                apps = manager.list_apps()
-                print(f"Tenants ({len(tenants)}):")
-                for tenant_id in tenants:
-                    print(f"  - {tenant_id}")
-                print(f"\nGenerated Apps ({len(apps)}):")
-                for app_id in apps:
-                    print(f"  - {app_id}")
-        
-        elif args.command == 'create-tenant':
-            success, msg = manager.create_tenant(
-                args.tenant_id,
-                args.name,
-                role=args.role,
-                enabled_features=args.features,
-                home_variant=args.home_variant
-            )
-            print(msg)
-            sys.exit(0 if success else 1)
-        
-        elif args.command == 'update-tenant':
-            updates = {}
-            if args.name:
-                updates['name'] = args.name
-            if args.role:
-                updates['role'] = args.role
-            if args.features:
-                updates['enabledFeatures'] = args.features
-            if args.primary_color:
-                if 'theme' not in updates:
-                    tenant = manager.get_tenant(args.tenant_id)
-                    updates['theme'] = tenant.get('theme', {}).copy()
-                updates['theme']['primary'] = args.primary_color
-            
-            if not updates:
-                print("No updates specified")
-                sys.exit(1)
-            
-            success, msg = manager.update_tenant(args.tenant_id, **updates)
-            print(msg)
-            sys.exit(0 if success else 1)
+                    count += 1
+                if not tenant_filter.is_empty():
+                    print(f"\n{count} of {len(manager.tenants)} tenant(s) matched")
+        elif args.type == 'apps':
+            apps = manager.list_apps()
+            print(f"Generated Apps ({len(apps)}):")
+            for app_id in apps:
+                print(f"  - {app_id}")
+        elif args.type == 'all':
+            tenants = manager.list_tenants()
+            apps = manager.list_apps()
+            print(f"Tenants ({len(tenants)}):")
+            for tenant_id in tenants:
+                print(f"  - {tenant_id}")
+            print(f"\nGenerated Apps ({len(apps)}):")
+            for app_id in apps:
+                print(f"  - {app_id}")
+    
+    elif args.command == 'create-tenant':
+        success, msg = manager.create_tenant(
+            args.tenant_id,
+            args.name,
+            role=args.role,
+            enabled_features=args.features,
+            home_variant=args.home_variant
+        )
+        print(msg)
+        return 0 if success else 1
+    
+    elif args.command == 'update-tenant':
+        updates = {}
+        if args.name:
+            updates['name'] = args.name
+        if args.role:
+            updates['role'] = args.role
+        if args.features:
+            updates['enabledFeatures'] = args.features
+        if args.primary_color:
+            if 'theme' not in updates:
+                tenant = manager.get_tenant(args.tenant_id)
+                updates['theme'] = tenant.get('theme', {}).copy()
+            updates['theme']['primary'] = args.primary_color
         
-        elif args.command == 'delete-tenant':
-            success, msg = manager.delete_tenant(args.tenant_id, delete_app=args.delete_app)
-            print(msg)
-            sys.exit(0 if success else 1)
-        
-        elif args.command == 'generate':
-            success, msg = manager.generate_app(
-                args.tenant_id, 
-                overwrite=args.overwrite,
-                app_folder_name=args.app_folder_name,
-                output_path=args.output_path
-            )
-            print(msg)
-            sys.exit(0 if success else 1)
+        if not updates:
+            print("No updates specified")
+            return 1
         
-        elif args.command == 'sync':
-            if args.tenant_id:
-                success, msg = manager.sync_config(args.tenant_id)
-                print(msg)
-                sys.exit(0 if success else 1)
-            else:
-                success, results = manager.sync_all_configs()
-                print("Syncing all configs:")
-                for result in results:
-                    print(f"  {result}")
-                sys.exit(0 if success else 1)
-        
-        elif args.command == 'validate':
-            success, msg = manager.validate_all()
+        success, msg = manager.update_tenant(args.tenant_id, **updates)
+        print(msg)
+        return 0 if success else 1
+    
+    elif args.command == 'delete-tenant':
+        success, msg = manager.delete_tenant(args.tenant_id, delete_app=args.delete_app)
+        print(msg)
+        return 0 if success else 1
+    
+    elif args.command in ('undo', 'redo'):
+        success, msg = manager.undo() if args.command == 'undo' else manager.redo()
+        print(msg)
+        return 0 if success else 1
+    
+    elif args.command == 'apply':
+        if args.file == '-':
+            success, results, msg = manager.apply_operations(sys.stdin, dry_run=args.dry_run)
+        else:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                success, results, msg = manager.apply_operations(f, dry_run=args.dry_run)
+        for line_no, op, tenant_id, op_success, op_msg in results:
+            marker = '✓' if op_success else '✗'
+            target = f"{op} {tenant_id}".strip()
+            print(f"  {marker} line {line_no}: {target}: {op_msg}")
+        print(msg)
+        return 0 if success else 1
+    
+    elif args.command == 'generate':
+        success, msg = manager.generate_app(
+            args.tenant_id, 
+            overwrite=args.overwrite,
+            app_folder_name=args.app_folder_name,
+            output_path=args.output_path,
+            keep_all_assets=args.keep_all_assets
+        )
+        print(msg)
+        return 0 if success else 1
+    
+    elif args.command == 'refresh':
+        success, results, msg = manager.refresh_repo(args.repo, dry_run=args.dry_run)
+        for tree, added, changed, removed in results:
+            print(f"  {tree}: {len(added)} added, {len(changed)} changed, {len(removed)} removed")
+            for marker, paths in (('+', added), ('~', changed), ('-', removed)):
+                for path in paths:
+                    print(f"    {marker} {path}")
+        print(msg)
+        return 0 if success else 1
+    
+    elif args.command == 'sync':
+        if args.tenant_id:
+            success, msg = manager.sync_config(args.tenant_id)
             print(msg)
-            sys.exit(0 if success else 1)
-        
-        elif args.command == 'status':
-            status = manager.get_status()
-            print("Status:")
-            print(f"  Tenants: {status['tenants']['total']} ({', '.join(status['tenants']['ids'])})")
-            print(f"  Apps: {status['apps']['total']} ({', '.join(status['apps']['ids'])})")
-            if status['orphaned_apps']:
-                print(f"  ⚠️  Orphaned apps (no tenant): {', '.join(status['orphaned_apps'])}")
-            if status['missing_apps']:
-                print(f"  ⚠️  Missing apps (tenant exists but no repo): {', '.join(status['missing_apps'])}")
-            
-            # Show homeVariant usage
-            print(f"\n  Home Variants:")
-            variants = status.get('home_variants', {}).get('used', {})
-            for variant, tenant_ids in variants.items():
-                print(f"    - {variant}: {len(tenant_ids)} tenant(s) - {', '.join(tenant_ids)}")
-            if status.get('home_variants', {}).get('note'):
-                print(f"  {status['home_variants']['note']}")
+            return 0 if success else 1
+        else:
+            success, results = manager.sync_all_configs(max_workers=args.jobs)
+            print("Syncing all configs:")
+            for app_id, app_success, msg in results:
+                marker = '✓' if app_success else '✗'
+                print(f"  {marker} {app_id}: {msg}")
+            failed = [app_id for app_id, app_success, _ in results if not app_success]
+            if failed:
+                print(f"\n  ⚠️  {len(failed)} of {len(results)} app(s) failed: {', '.join(failed)}")
+            if not failed:
+                return EXIT_OK
+            return EXIT_FAILED if len(failed) == len(results) else EXIT_PARTIAL_FAILURE
+    
+    elif args.command == 'validate':
+        success, msg = manager.validate_all()
+        print(msg)
+        return 0 if success else 1
+    
+    elif args.command == 'watch':
+        try:
+            manager.watch(interval=args.interval, debounce=args.debounce)
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+    
+    elif args.command == 'status':
+        status = manager.get_status(drift=args.drift)
+        print("Status:")
+        print(f"  Tenants: {status['tenants']['total']} ({', '.join(status['tenants']['ids'])})")
+        print(f"  Apps: {status['apps']['total']} ({', '.join(status['apps']['ids'])})")
+        if status['orphaned_apps']:
+            print(f"  ⚠️  Orphaned apps (no tenant): {', '.join(status['orphaned_apps'])}")
+        if status['missing_apps']:
+            print(f"  ⚠️  Missing apps (tenant exists but no repo): {', '.join(status['missing_apps'])}")
+        
+        # Show homeVariant usage
+        print(f"\n  Home Variants:")
+        variants = status.get('home_variants', {}).get('used', {})
+        for variant, tenant_ids in variants.items():
+            print(f"    - {variant}: {len(tenant_ids)} tenant(s) - {', '.join(tenant_ids)}")
+        if status.get('home_variants', {}).get('note'):
+            print(f"  {status['home_variants']['note']}")
+        
+        if 'drift' in status:
+            drift = status['drift']
+            print(f"\n  Config Drift:")
+            print(f"    - up to date: {len(drift['up_to_date'])} app(s)")
+            if drift['stale']:
+                print(f"    ⚠️  Stale (run sync): {', '.join(drift['stale'])}")
+            if drift['missing_config']:
+                print(f"    ⚠️  Missing config/app.config.ts: {', '.join(drift['missing_config'])}")
+    
+    return 0
+
+
+def _runs_locally(args: argparse.Namespace) -> bool:
+    """Check if a command must run in this process (the daemon has no access to our stdin or profiler)."""
+    if args.command in LOCAL_ONLY_COMMANDS or args.profile:
+        return True
+    return args.command == 'apply' and args.file == '-'
+
+
+def run_profiled(manager: AppManager, args: argparse.Namespace) -> int:
+    """Run a command with phase timing on and write its profile report."""
+    from profiler import get_profiler, default_report_file, format_report
+    
+    profiler = get_profiler()
+    profiler.start(args.command, cprofile=args.cprofile)
+    try:
+        return run_command(manager, args)
+    finally:
+        if args.profile_output:
+            report_file = Path(args.profile_output)
+        else:
+            report_file = default_report_file(Path(__file__).resolve().parent, args.command)
+        report = profiler.stop(report_file)
+        # stderr keeps stdout clean for --format json/ndjson
+        print(format_report(report), file=sys.stderr)
+
+
+def _daemon_runner(manager: AppManager, parser: argparse.ArgumentParser):
+    """Build the callable the daemon uses to run one CLI argv against the warm manager."""
+    def run_argv(argv: List[str]) -> int:
+        args = parser.parse_args(argv)
+        if not args.command:
+            parser.print_help()
+            return EXIT_OK
+        if _runs_locally(args):
+            print(f"Error: '{args.command}' cannot run in the daemon", file=sys.stderr)
+            return EXIT_FAILED
+        
+        manager.reload_if_changed()
+        exit_code = EXIT_FAILED
+        try:
+            exit_code = run_command(manager, args)
+        finally:
+            if exit_code != EXIT_OK:
+                # Failed commands can leave partial edits in memory, start from disk next time
+                manager.invalidate()
+        return exit_code
+    
+    return run_argv
+
+
+def run_daemon_command(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """Run 'daemon start|stop|status'."""
+    import app_daemon
+    
+    tool_dir = Path(__file__).resolve().parent
+    if not app_daemon.is_supported():
+        print("Daemon needs Unix domain sockets, which are not available on this platform")
+        return EXIT_FAILED
+    
+    info = app_daemon.ping(tool_dir)
+    
+    if args.action == 'status':
+        if not info:
+            print("Daemon is not running")
+            return EXIT_FAILED
+        uptime = int(time.time() - info['started'])
+        print(f"Daemon is running (pid {info['pid']}, up {uptime}s, {info['requests']} command(s) served)")
+        print(f"  Socket: {app_daemon.socket_path(tool_dir)}")
+        return EXIT_OK
+    
+    if args.action == 'stop':
+        if not info or not app_daemon.stop(tool_dir):
+            print("Daemon is not running")
+            return EXIT_FAILED
+        print(f"Daemon stopped (pid {info['pid']})")
+        return EXIT_OK
+    
+    if info:
+        print(f"Daemon is already running (pid {info['pid']})")
+        return EXIT_OK
+    
+    if args.detach:
+        info = app_daemon.start_detached(tool_dir, Path(__file__).resolve())
+        if not info:
+            print("Daemon did not start (run 'daemon start' without --detach to see errors)")
+            return EXIT_FAILED
+        print(f"Daemon started (pid {info['pid']})")
+        return EXIT_OK
+    
+    # Load both files up front so the first command is fast and bad files fail here
+    manager = AppManager(use_index=True)
+    manager.reload()
+    app_daemon.serve(tool_dir, _daemon_runner(manager, parser))
+    return EXIT_OK
+
+
+def main():
+    """CLI entry point."""
+    parser = build_parser()
+    argv = sys.argv[1:]
+    args = parser.parse_args(argv)
+    args.profile = args.profile or args.cprofile
+    
+    if not args.command:
+        parser.print_help()
+        return
+    
+    try:
+        if args.command == 'daemon':
+            sys.exit(run_daemon_command(args, parser))
+        
+        # Hand the command to a running daemon (falls back to running it here)
+        if not _runs_locally(args):
+            import app_daemon
+            exit_code = app_daemon.run_via_daemon(Path(__file__).resolve().parent, argv)
+            if exit_code is not None:
+                sys.exit(exit_code)
+        
+        manager = AppManager()
+        if args.profile:
+            sys.exit(run_profiled(manager, args))
+        sys.exit(run_command(manager, args))
     
     except Exception as e:
         print(f"Error: {str(e)}", file=sys.stderr)
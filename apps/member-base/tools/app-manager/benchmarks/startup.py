@@ -0,0 +1,96 @@
+"""
+Startup Benchmark
+Time CLI startup per subcommand, each run in a fresh interpreter
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 20 --json
+    python benchmarks/startup.py --daemon    # time commands served by a running daemon
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+
+
+TOOL_DIR = Path(__file__).resolve().parent.parent
+
+# Read-only subcommands (safe to run repeatedly against the real tenants.json)
+COMMANDS = [
+    ['--help'],
+    ['list', 'apps'],
+    ['list', 'tenants'],
+    ['list', 'all'],
+    ['validate'],
+    ['status'],
+    ['status', '--drift'],
+]
+
+
+def time_command(argv: List[str], runs: int, env: Dict[str, str]) -> Dict:
+    """
+    Run a command several times and collect wall-clock times.
+    
+    Returns:
+        Dict with min/median/max in milliseconds and the last exit code
+    """
+    timings = []
+    exit_code = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable] + argv,
+            cwd=str(TOOL_DIR),
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        exit_code = completed.returncode
+    
+    return {
+        'min_ms': round(min(timings), 1),
+        'median_ms': round(statistics.median(timings), 1),
+        'max_ms': round(max(timings), 1),
+        'exit_code': exit_code,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='App manager CLI startup benchmark')
+    parser.add_argument('--runs', type=int, default=10, help='Runs per command (default: 10)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Let commands go through a running daemon (bypassed by default)')
+    args = parser.parse_args()
+    
+    env = dict(os.environ)
+    if args.daemon:
+        env.pop('APP_MANAGER_NO_DAEMON', None)
+    else:
+        env['APP_MANAGER_NO_DAEMON'] = '1'
+    
+    # Interpreter startup alone, to separate Python's cost from the tool's
+    results = {'(python -c pass)': time_command(['-c', 'pass'], args.runs, env)}
+    for command in COMMANDS:
+        results[' '.join(command)] = time_command(['app_manager.py'] + command, args.runs, env)
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"Startup time per subcommand ({args.runs} runs each, {'daemon' if args.daemon else 'no daemon'}):")
+    print(f"  {'command':<20} {'min':>8} {'median':>8} {'max':>8}")
+    for name, result in results.items():
+        marker = '' if result['exit_code'] == 0 else f"  (exit {result['exit_code']})"
+        print(f"  {name:<20} {result['min_ms']:>6.1f}ms {result['median_ms']:>6.1f}ms {result['max_ms']:>6.1f}ms{marker}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""
+Benchmark Suite
+Time the app manager's hot paths on synthetic registries and template trees
+
+Usage:
+    python benchmarks/suite.py                              # 10 to 100k tenants, 200-file tree
+    python benchmarks/suite.py --sizes 10,1000 --files 2000 --file-size 8192
+    python benchmarks/suite.py --save-baseline              # store results in baselines/default.json
+    python benchmarks/suite.py --compare --threshold 0.25   # exit 1 if anything got >25% slower
+"""
+
+import io
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+TOOL_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(TOOL_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+from synthetic import make_plugins, write_registry, make_template_tree, make_generated_apps
+
+
+BASELINE_DIR = BENCH_DIR / 'baselines'
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+# Allowed slowdown against the baseline before compare mode fails (0.25 = 25%)
+DEFAULT_THRESHOLD = 0.25
+
+# Differences below this many seconds are noise, whatever the ratio
+NOISE_FLOOR = 0.002
+
+# Plugins in the synthetic registries and template trees
+PLUGIN_COUNT = 20
+
+
+def _expect_success(result):
+    """Raise if a (success, message) result failed, so a broken run is not timed as fast."""
+    if not result[0]:
+        raise RuntimeError(str(result[1]))
+
+
+def measure(fn: Callable, repeat: int, setup: Optional[Callable] = None) -> Dict:
+    """
+    Time fn repeat times with its stdout discarded.
+    
+    Args:
+        fn: Callable to time (raises on failure)
+        repeat: Number of timed runs
+        setup: Untimed callable run before each run
+    
+    Returns:
+        Dict with min/median/max in seconds and the number of runs
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+    return {
+        'min_s': round(min(timings), 6),
+        'median_s': round(statistics.median(timings), 6),
+        'max_s': round(max(timings), 6),
+        'runs': repeat,
+    }
+
+
+def bench_registry(work_dir: Path, size: int, repeat: int) -> Dict[str, Dict]:
+    """Time load/validate/save and config rendering on a registry of size tenants."""
+    from config_io import load_tenants, load_plugins, validate_all_tenants, save_tenants
+    from repo_generator import generate_config_from_tenant
+    
+    tool_dir = work_dir / f"registry-{size}"
+    write_registry(tool_dir, size, PLUGIN_COUNT)
+    tenants_path = str(tool_dir / 'tenants.json')
+    plugins, _ = load_plugins(str(tool_dir / 'plugins.json'))
+    tenants, _ = load_tenants(tenants_path)
+    
+    def load():
+        _, error = load_tenants(tenants_path)
+        if error:
+            raise RuntimeError(error)
+    
+    def render_all():
+        for tenant_id, tenant in tenants.items():
+            generate_config_from_tenant(tenant, tenant_id)
+    
+    results = {}
+    results[f"load_tenants[n={size}]"] = measure(load, repeat)
+    results[f"validate_all_tenants[n={size}]"] = measure(
+        lambda: _expect_success(validate_all_tenants(tenants, plugins)), repeat
+    )
+    results[f"save_tenants[n={size}]"] = measure(
+        lambda: _expect_success(save_tenants(tenants, plugins, str(tool_dir / 'tenants.saved.json'))), repeat
+    )
+    results[f"generate_config_from_tenant[n={size}]"] = measure(render_all, repeat)
+    
+    shutil.rmtree(tool_dir, ignore_errors=True)
+    return results
+
+
+def bench_tree(work_dir: Path, file_count: int, file_size: int, app_count: int, repeat: int) -> Dict[str, Dict]:
+    """Time generate_repo (default and standalone) and sync_all_configs on a synthetic monorepo."""
+    from repo_context import RepoContext, set_repo_context
+    from repo_generator import generate_repo
+    from app_manager import AppManager
+    
+    repo_root = work_dir / 'repo'
+    tool_dir = make_template_tree(repo_root, file_count, file_size, sorted(make_plugins(PLUGIN_COUNT)))
+    tenants = write_registry(tool_dir, app_count + 1, PLUGIN_COUNT)
+    set_repo_context(RepoContext(tool_dir))
+    
+    # Tenant with the most plugins, so plugin copying is part of the standalone run
+    tenant_id = max(tenants, key=lambda tid: len(tenants[tid]['enabledFeatures']))
+    tenant = tenants[tenant_id]
+    default_target = repo_root / 'apps' / 'bench-app'
+    standalone_dir = work_dir / 'standalone'
+    
+    results = {}
+    results[f"generate_repo[files={file_count}]"] = measure(
+        lambda: _expect_success(generate_repo(tenant_id, tenant, app_folder_name='bench-app')),
+        repeat,
+        setup=lambda: shutil.rmtree(default_target, ignore_errors=True)
+    )
+    shutil.rmtree(default_target, ignore_errors=True)
+    
+    results[f"generate_repo_standalone[files={file_count}]"] = measure(
+        lambda: _expect_success(generate_repo(tenant_id, tenant, app_folder_name='bench-app',
+                                              output_path=str(standalone_dir))),
+        repeat,
+        setup=lambda: shutil.rmtree(standalone_dir, ignore_errors=True)
+    )
+    shutil.rmtree(standalone_dir, ignore_errors=True)
+    
+    make_generated_apps(repo_root, [tid for tid in sorted(tenants) if tid != 'default'])
+    manager = AppManager()
+    manager.reload()
+    results[f"sync_all_configs[apps={app_count}]"] = measure(
+        lambda: _expect_success(manager.sync_all_configs()), repeat
+    )
+    
+    shutil.rmtree(repo_root, ignore_errors=True)
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """
+    Compare min times against a baseline.
+    
+    Returns:
+        Names of benchmarks slower than baseline * (1 + threshold), ignoring noise-level differences
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        current, previous = result['min_s'], base['min_s']
+        if current > previous * (1 + threshold) and current - previous > NOISE_FLOOR:
+            regressions.append(name)
+    return regressions
+
+
+def baseline_path(name: str) -> Path:
+    """Path of a stored baseline (a name or a path to a .json file)."""
+    if name.endswith('.json'):
+        return Path(name)
+    return BASELINE_DIR / f"{name}.json"
+
+
+def load_baseline(name: str) -> Optional[Dict]:
+    """Load a stored baseline (None if it does not exist)."""
+    path = baseline_path(name)
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='App manager benchmark suite')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help='Comma-separated tenant counts for registry benchmarks (default: 10 to 100000)')
+    parser.add_argument('--files', type=int, default=200, help='Source files in the template tree (default: 200)')
+    parser.add_argument('--file-size', type=int, default=2048, help='Bytes per source file (default: 2048)')
+    parser.add_argument('--apps', type=int, default=50, help='Generated apps for sync_all_configs (default: 50)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark (default: 3)')
+    parser.add_argument('--only', choices=['registry', 'tree'], help='Run only one group of benchmarks')
+    parser.add_argument('--save-baseline', nargs='?', const='default', metavar='NAME',
+                        help='Store results as a baseline (default name: default)')
+    parser.add_argument('--compare', nargs='?', const='default', metavar='NAME',
+                        help='Compare against a stored baseline and exit 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Allowed slowdown in compare mode (default: {DEFAULT_THRESHOLD} = 25%%)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--work-dir', help='Directory for synthetic data (default: a temporary directory)')
+    args = parser.parse_args()
+    
+    baseline = None
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        if baseline is None:
+            print(f"Error: baseline not found: {baseline_path(args.compare)}", file=sys.stderr)
+            sys.exit(1)
+    
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    work_dir = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix='app-manager-bench-'))
+    work_dir.mkdir(parents=True, exist_ok=True)
+    
+    results: Dict[str, Dict] = {}
+    try:
+        if args.only != 'tree':
+            for size in sizes:
+                print(f"Running registry benchmarks with {size} tenants...", file=sys.stderr)
+                results.update(bench_registry(work_dir, size, args.repeat))
+        if args.only != 'registry':
+            print(f"Running tree benchmarks with {args.files} files...", file=sys.stderr)
+            results.update(bench_tree(work_dir, args.files, args.file_size, args.apps, args.repeat))
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {'files': args.files, 'file_size': args.file_size, 'apps': args.apps, 'repeat': args.repeat},
+        'results': results,
+    }
+    
+    regressions = compare(results, baseline['results'], args.threshold) if baseline else []
+    
+    if args.json:
+        if baseline:
+            report['regressions'] = regressions
+        print(json.dumps(report, indent=2))
+    else:
+        header = f"  {'benchmark':<44} {'min':>10} {'median':>10}"
+        print(header + (f" {'baseline':>10} {'change':>8}" if baseline else ''))
+        for name, result in results.items():
+            line = f"  {name:<44} {result['min_s'] * 1000:>8.1f}ms {result['median_s'] * 1000:>8.1f}ms"
+            base = baseline['results'].get(name) if baseline else None
+            if base:
+                change = (result['min_s'] / base['min_s'] - 1) * 100 if base['min_s'] else 0.0
+                marker = '  ⚠ REGRESSION' if name in regressions else ''
+                line += f" {base['min_s'] * 1000:>8.1f}ms {change:>+7.1f}%{marker}"
+            elif baseline:
+                line += f" {'(new)':>10}"
+            print(line)
+    
+    if args.save_baseline:
+        path = baseline_path(args.save_baseline)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {path}", file=sys.stderr)
+    
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than baseline by more than "
+              f"{args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""
+Synthetic Data
+Build synthetic tenants.json/plugins.json registries and monorepo template trees for benchmarks
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+
+# Plugins the config generator has menu entries for, plus generated ones up to the requested count
+KNOWN_PLUGINS = ['balance', 'payment', 'catalog', 'order', 'reporting', 'invoice', 'marketplace-fnb']
+
+ROLES = ['merchant', 'member', 'admin']
+HOME_VARIANTS = ['dashboard', 'simple', 'member', 'custom']
+
+# npm packages imported by synthetic sources (react/react-native are always kept)
+PACKAGES = ['react', 'react-native', 'zustand', 'axios', 'dayjs', 'lodash', 'react-native-svg']
+
+# Files each standalone root copy expects
+ROOT_FILES = {
+    'tsconfig.json': '{\n  "compilerOptions": {"strict": true}\n}\n',
+    'babel.config.js': "module.exports = { presets: ['module:@react-native/babel-preset'] };\n",
+    'metro.config.js': "const { getDefaultConfig } = require('@react-native/metro-config');\n"
+                       "module.exports = getDefaultConfig(__dirname);\n",
+    'index.js': "import { AppRegistry } from 'react-native';\nimport App from './App';\n"
+                "AppRegistry.registerComponent('app', () => App);\n",
+    'App.tsx': "import MerchantBaseApp from './apps/merchant-base';\nexport default MerchantBaseApp;\n",
+    'app.json': '{\n  "name": "MerchantBaseApp",\n  "displayName": "Merchant Base"\n}\n',
+}
+
+
+def make_plugins(count: int) -> Dict:
+    """Build a plugins.json registry with count plugins."""
+    plugin_ids = KNOWN_PLUGINS[:count] + [f"plugin-{i:03d}" for i in range(max(0, count - len(KNOWN_PLUGINS)))]
+    return {
+        plugin_id: {
+            'id': plugin_id,
+            'label': plugin_id.replace('-', ' ').title(),
+            'description': f"Synthetic plugin {plugin_id}",
+        }
+        for plugin_id in plugin_ids
+    }
+
+
+def _color(rng: random.Random) -> str:
+    return '#' + ''.join(rng.choice('0123456789ABCDEF') for _ in range(6))
+
+
+def make_tenants(count: int, plugins: Dict, seed: int = 0) -> Dict:
+    """
+    Build a valid tenants.json registry with count tenants (including DEFAULT).
+    
+    Tenants get a random role, home variant, theme and 0-5 enabled plugins,
+    and half of them get custom home tabs. The same seed gives the same registry.
+    """
+    rng = random.Random(seed)
+    plugin_ids = sorted(plugins)
+    tenants = {}
+    for i in range(count):
+        tenant_id = 'default' if i == 0 else f"tenant-{i:06d}"
+        tenant = {
+            'id': tenant_id,
+            'name': 'Default' if i == 0 else f"Tenant {i}",
+            'role': rng.choice(ROLES),
+            'theme': {
+                'primary': _color(rng),
+                'primaryDark': _color(rng),
+                'primaryLight': _color(rng),
+            },
+            'homeVariant': rng.choice(HOME_VARIANTS),
+            'enabledFeatures': rng.sample(plugin_ids, min(len(plugin_ids), rng.randint(0, 5))),
+        }
+        if i % 2:
+            tenant['homeTabs'] = [
+                {'id': f"tab-{n}", 'label': f"Tab {n}", 'visible': True, 'order': n}
+                for n in range(1, rng.randint(2, 5))
+            ]
+        tenants[tenant_id] = tenant
+    return tenants
+
+
+def write_registry(tool_dir: Path, tenant_count: int, plugin_count: int = 20, seed: int = 0) -> Dict:
+    """
+    Write synthetic tenants.json and plugins.json into tool_dir.
+    
+    Returns:
+        The tenants dict that was written
+    """
+    tool_dir.mkdir(parents=True, exist_ok=True)
+    plugins = make_plugins(plugin_count)
+    tenants = make_tenants(tenant_count, plugins, seed)
+    with open(tool_dir / 'plugins.json', 'w', encoding='utf-8') as f:
+        json.dump(plugins, f, indent=2, ensure_ascii=False)
+    with open(tool_dir / 'tenants.json', 'w', encoding='utf-8') as f:
+        json.dump(tenants, f, indent=2, ensure_ascii=False)
+    return tenants
+
+
+def _source_file(index: int, file_size: int, asset: str) -> str:
+    """TypeScript-like source with a few imports, padded to about file_size bytes."""
+    lines = [
+        f"import React from '{PACKAGES[0]}';",
+        f"import {{ View }} from '{PACKAGES[1]}';",
+        f"import helper from '{PACKAGES[2 + index % (len(PACKAGES) - 2)]}';",
+        f"const image = require('{asset}');",
+        f"export const Component{index} = () => null;",
+    ]
+    content = '\n'.join(lines) + '\n'
+    padding = max(0, file_size - len(content))
+    filler = '// synthetic padding line for benchmark sources\n'
+    return content + filler * (padding // len(filler)) + '\n'
+
+
+def _write_files(directory: Path, count: int, file_size: int, asset_depth: int, asset_count: int):
+    """Write count source files into directory, spread over subfolders of 50."""
+    for i in range(count):
+        subdir = directory / 'src' / f"group{i // 50:03d}"
+        subdir.mkdir(parents=True, exist_ok=True)
+        asset = '../' * (asset_depth + 2) + f"assets/images/image{i % max(1, asset_count):04d}.png"
+        (subdir / f"Component{i}.tsx").write_text(_source_file(i, file_size, asset), encoding='utf-8')
+
+
+def make_template_tree(repo_root: Path, file_count: int = 200, file_size: int = 2048,
+                       plugin_ids: List[str] = None, asset_count: int = 50) -> Path:
+    """
+    Build a synthetic monorepo with the layout generate_repo expects.
+    
+    file_count source files are split between the app template (1/4), packages/core
+    (1/2) and the plugins (1/4). Sources import npm packages and reference assets,
+    so standalone generation has real pruning work to do.
+    
+    Args:
+        repo_root: Directory to create (repo_root/apps, repo_root/packages, ...)
+        file_count: Total number of source files
+        file_size: Approximate size of each source file in bytes
+        plugin_ids: Plugins to create under packages/plugins
+        asset_count: Number of image assets (about half are referenced)
+    
+    Returns:
+        Tool directory inside the synthetic repo (repo_root/tools/closepay-core-manager)
+    """
+    plugin_ids = plugin_ids or []
+    template = repo_root / 'apps' / 'merchant-base'
+    core = repo_root / 'packages' / 'core'
+    plugins_dir = repo_root / 'packages' / 'plugins'
+    template.mkdir(parents=True, exist_ok=True)
+    core.mkdir(parents=True, exist_ok=True)
+    plugins_dir.mkdir(parents=True, exist_ok=True)
+    
+    # App template
+    (template / 'index.tsx').write_text(
+        "import { createApp } from '@core';\nexport const MerchantBaseApp = createApp('merchant-base');\n",
+        encoding='utf-8'
+    )
+    (template / 'README.md').write_text("# Merchant Base\n\nmerchant-base template\n", encoding='utf-8')
+    _write_files(template, file_count // 4, file_size, 2, asset_count // 2)
+    
+    # Core and plugins
+    _write_files(core, file_count // 2, file_size, 2, asset_count // 2)
+    plugin_files = file_count - file_count // 4 - file_count // 2
+    for n, plugin_id in enumerate(plugin_ids):
+        per_plugin = plugin_files // len(plugin_ids) + (1 if n < plugin_files % len(plugin_ids) else 0)
+        _write_files(plugins_dir / plugin_id, per_plugin, file_size, 3, asset_count // 2)
+    
+    # Native projects
+    android = repo_root / 'android' / 'app'
+    android.mkdir(parents=True, exist_ok=True)
+    (android / 'build.gradle').write_text("android { namespace 'com.closepay.app' }\n", encoding='utf-8')
+    ios = repo_root / 'ios'
+    (ios / 'MerchantBaseApp').mkdir(parents=True, exist_ok=True)
+    (ios / 'MerchantBaseApp' / 'Info.plist').write_text(
+        "<plist><dict>\n<key>CFBundleDisplayName</key>\n<string>Merchant Base</string>\n</dict></plist>\n",
+        encoding='utf-8'
+    )
+    (ios / 'MerchantBaseApp' / 'AppDelegate.swift').write_text(
+        'self.moduleName = "MerchantBaseApp"\n', encoding='utf-8'
+    )
+    (ios / 'Podfile').write_text("target 'MerchantBaseApp' do\nend\n", encoding='utf-8')
+    (ios / 'MerchantBaseApp.xcodeproj').mkdir(exist_ok=True)
+    (ios / 'MerchantBaseApp.xcodeproj' / 'project.pbxproj').write_text(
+        'PRODUCT_BUNDLE_IDENTIFIER = "com.closepay.app";\nPRODUCT_NAME = MerchantBaseApp;\n',
+        encoding='utf-8'
+    )
+    
+    # Assets (1 KB each)
+    images = repo_root / 'assets' / 'images'
+    images.mkdir(parents=True, exist_ok=True)
+    for i in range(asset_count):
+        (images / f"image{i:04d}.png").write_bytes(b'\0' * 1024)
+    
+    # Root files
+    package_data = {
+        'name': 'closepay',
+        'dependencies': {name: '^1.0.0' for name in PACKAGES + ['unused-package-a', 'unused-package-b']},
+    }
+    with open(repo_root / 'package.json', 'w', encoding='utf-8') as f:
+        json.dump(package_data, f, indent=2)
+    for name, content in ROOT_FILES.items():
+        (repo_root / name).write_text(content, encoding='utf-8')
+    
+    tool_dir = repo_root / 'tools' / 'closepay-core-manager'
+    tool_dir.mkdir(parents=True, exist_ok=True)
+    return tool_dir
+
+
+def make_generated_apps(repo_root: Path, tenant_ids: List[str]):
+    """Create minimal generated app folders (config dir and index.tsx) for sync benchmarks."""
+    for tenant_id in tenant_ids:
+        app_dir = repo_root / 'apps' / tenant_id
+        (app_dir / 'config').mkdir(parents=True, exist_ok=True)
+        (app_dir / 'index.tsx').write_text(
+            "import { createApp } from '@core';\nexport default createApp();\n", encoding='utf-8'
+        )
@@ -5,13 +5,20 @@ Handles loading and saving of tenants.json and plugins.json files
 
 import json
 import os
+import hashlib
 from typing import Dict, List, Tuple, Optional
 
+from profiler import phase
+from file_lock import FileLock
+
 
 # File paths - configurable at the top
 TENANTS_FILE = "tenants.json"
 PLUGINS_FILE = "plugins.json"
 
+# Saves retried when another writer replaces tenants.json between our merge and our write
+SAVE_ATTEMPTS = 3
+
 
 def normalize_tenant_id(tenant_id: str) -> str:
     """Normalize tenant ID to lowercase kebab-case format."""
@@ -29,6 +36,26 @@ def normalize_tenant_id(tenant_id: str) -> str:
     return normalized
 
 
+def _content_version(content: bytes) -> str:
+    """Version (etag) of a registry file's content."""
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+def tenants_version(file_path: Optional[str] = None) -> Optional[str]:
+    """
+    Get the current version (content hash) of tenants.json.
+    
+    Returns:
+        Version string, or None if the file cannot be read
+    """
+    path = file_path or TENANTS_FILE
+    try:
+        with open(path, 'rb') as f:
+            return _content_version(f.read())
+    except OSError:
+        return None
+
+
 def load_tenants(file_path: Optional[str] = None) -> Tuple[Dict, Optional[str]]:
     """
     Load tenants from JSON file.
@@ -38,18 +65,34 @@ def load_tenants(file_path: Optional[str] = None) -> Tuple[Dict, Optional[str]]:
         Tuple of (tenants_dict, error_message)
         If successful, error_message is None
     """
+    tenants, _, error = load_tenants_versioned(file_path)
+    return tenants, error
+
+
+def load_tenants_versioned(file_path: Optional[str] = None) -> Tuple[Dict, Optional[str], Optional[str]]:
+    """
+    Load tenants from JSON file together with the version of the content that was read.
+    
+    Returns:
+        Tuple of (tenants_dict, version, error_message)
+        If successful, error_message is None
+    """
     path = file_path or TENANTS_FILE
     
     if not os.path.exists(path):
-        return {}, f"File not found: {path}"
+        return {}, None, f"File not found: {path}"
     
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if not isinstance(data, dict):
-                return {}, f"Invalid format: {path} must contain a JSON object"
-            
-            # Normalize tenant IDs (keys) and update id field in each tenant
+        with phase('load tenants.json'):
+            with open(path, 'rb') as f:
+                content = f.read()
+            version = _content_version(content)
+            data = json.loads(content.decode('utf-8'))
+        if not isinstance(data, dict):
+            return {}, None, f"Invalid format: {path} must contain a JSON object"
+        
+        # Normalize tenant IDs (keys) and update id field in each tenant
+        with phase('normalize tenant IDs'):
             normalized_data = {}
             for key, tenant in data.items():
                 # Normalize the key
@@ -59,12 +102,12 @@ def load_tenants(file_path: Optional[str] = None) -> Tuple[Dict, Optional[str]]:
                     tenant['id'] = normalized_key
                 # Use normalized key
                 normalized_data[normalized_key] = tenant
-            
-            return normalized_data, None
+        
+        return normalized_data, version, None
     except json.JSONDecodeError as e:
-        return {}, f"Invalid JSON in {path}: {str(e)}"
+        return {}, None, f"Invalid JSON in {path}: {str(e)}"
     except Exception as e:
-        return {}, f"Error reading {path}: {str(e)}"
+        return {}, None, f"Error reading {path}: {str(e)}"
 
 
 def load_plugins(file_path: Optional[str] = None) -> Tuple[Dict, Optional[str]]:
@@ -81,11 +124,11 @@ def load_plugins(file_path: Optional[str] = None) -> Tuple[Dict, Optional[str]]:
         return {}, f"File not found: {path}"
     
     try:
-        with open(path, 'r', encoding='utf-8') as f:
+        with phase('load plugins.json'), open(path, 'r', encoding='utf-8') as f:
             data = json.load(f)
-            if not isinstance(data, dict):
-                return {}, f"Invalid format: {path} must contain a JSON object"
-            return data, None
+        if not isinstance(data, dict):
+            return {}, f"Invalid format: {path} must contain a JSON object"
+        return data, None
     except json.JSONDecodeError as e:
         return {}, f"Invalid JSON in {path}: {str(e)}"
     except Exception as e:
@@ -170,18 +213,44 @@ def validate_all_tenants(tenants: Dict, plugins: Dict) -> Tuple[bool, Optional[s
     if not tenants:
         return False, "No tenants found"
     
-    for tenant_id, tenant in tenants.items():
-        is_valid, error = validate_tenant(tenant, tenant_id, plugins)
-        if not is_valid:
-            return False, error
+    with phase('validate tenants'):
+        for tenant_id, tenant in tenants.items():
+            is_valid, error = validate_tenant(tenant, tenant_id, plugins)
+            if not is_valid:
+                return False, error
     
     return True, None
 
 
-def save_tenants(tenants: Dict, plugins: Dict, file_path: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+def collect_tenant_errors(tenants: Dict, plugins: Dict) -> List[Tuple[str, str]]:
+    """
+    Validate every tenant, unlike validate_all_tenants which stops at the first error.
+    
+    Returns:
+        List of (tenant_id, error_message) for the invalid tenants, in registry order
+    """
+    errors = []
+    with phase('validate tenants'):
+        for tenant_id, tenant in tenants.items():
+            is_valid, error = validate_tenant(tenant, tenant_id, plugins)
+            if not is_valid:
+                errors.append((tenant_id, error))
+    return errors
+
+
+def save_tenants(tenants: Dict, plugins: Dict, file_path: Optional[str] = None,
+                 validate: bool = True, expected_version: Optional[str] = None) -> Tuple[bool, Optional[str]]:
     """
     Save tenants to JSON file with validation.
     Normalizes tenant IDs to lowercase kebab-case format before saving.
+    The file is replaced atomically, so readers never see a partial write.
+    
+    Args:
+        tenants: Tenants to save
+        plugins: Plugin registry used for validation
+        file_path: Target file (defaults to TENANTS_FILE)
+        validate: Validate all tenants first (callers that already validated the changed tenants pass False)
+        expected_version: Refuse to save if the file on disk is no longer this version (see tenants_version)
     
     Returns:
         Tuple of (success, error_message)
@@ -189,29 +258,130 @@ def save_tenants(tenants: Dict, plugins: Dict, file_path: Optional[str] = None)
     path = file_path or TENANTS_FILE
     
     # Normalize tenant IDs before validation
-    normalized_tenants = {}
-    for key, tenant in tenants.items():
-        normalized_key = normalize_tenant_id(key)
-        if isinstance(tenant, dict):
-            tenant['id'] = normalized_key
-        normalized_tenants[normalized_key] = tenant
+    with phase('normalize tenant IDs'):
+        normalized_tenants = {}
+        for key, tenant in tenants.items():
+            normalized_key = normalize_tenant_id(key)
+            if isinstance(tenant, dict):
+                tenant['id'] = normalized_key
+            normalized_tenants[normalized_key] = tenant
     
     # Validate before saving
-    is_valid, error = validate_all_tenants(normalized_tenants, plugins)
-    if not is_valid:
-        return False, error
+    if validate:
+        is_valid, error = validate_all_tenants(normalized_tenants, plugins)
+        if not is_valid:
+            return False, error
     
+    temp_path = f"{path}.tmp"
     try:
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(normalized_tenants, f, indent=2, ensure_ascii=False)
+        with phase('save tenants.json'):
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(normalized_tenants, f, indent=2, ensure_ascii=False)
+            if expected_version is not None and tenants_version(path) != expected_version:
+                return False, f"{path} was changed by another process since it was loaded"
+            os.replace(temp_path, path)
         return True, None
     except PermissionError:
         return False, f"Permission denied: Cannot write to {path}"
     except Exception as e:
         return False, f"Error writing to {path}: {str(e)}"
+    finally:
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
 
 
 def get_plugin_ids(plugins: Dict) -> List[str]:
     """Get list of plugin IDs from plugins dictionary."""
     return list(plugins.keys()) if plugins else []
 
+
+def merge_tenant_changes(base: Dict[str, Optional[Dict]], ours: Dict,
+                         theirs: Dict) -> Tuple[Dict, List[str]]:
+    """
+    Merge our tenant changes into a registry another writer saved in the meantime.
+    
+    Args:
+        base: Tenants we changed, as they were when we loaded them (None for tenants we created)
+        ours: Our registry, including our changes
+        theirs: Registry currently on disk
+    
+    Returns:
+        Tuple of (merged registry, IDs of tenants both writers changed differently)
+    """
+    merged = dict(theirs)
+    conflicts = []
+    for tenant_id, base_tenant in base.items():
+        our_tenant = ours.get(tenant_id)
+        their_tenant = theirs.get(tenant_id)
+        if their_tenant != base_tenant and their_tenant != our_tenant:
+            conflicts.append(tenant_id)
+        elif our_tenant is None:
+            merged.pop(tenant_id, None)
+        else:
+            merged[tenant_id] = our_tenant
+    return merged, sorted(conflicts)
+
+
+def save_tenant_changes(base: Dict[str, Optional[Dict]], ours: Dict, plugins: Dict,
+                        loaded_version: Optional[str], file_path: Optional[str] = None,
+                        validate: bool = True) -> Tuple[Optional[Dict], Optional[str], Optional[str]]:
+    """
+    Save tenants.json under the registry lock without discarding other writers' changes.
+    
+    If tenants.json changed on disk since loaded_version, our changes to the
+    tenants in base are merged into the file's current content. The save only
+    fails if another writer changed one of those tenants differently.
+    
+    Args:
+        base: Tenants this save changes, as they were when loaded (None for new tenants)
+        ours: Our registry, including our changes
+        plugins: Plugin registry used for validation
+        loaded_version: tenants_version() of the file ours was loaded from
+        file_path: Target file (defaults to TENANTS_FILE)
+        validate: Validate all tenants before saving
+    
+    Returns:
+        Tuple of (saved registry, its version, error_message)
+        If successful, error_message is None
+    """
+    path = file_path or TENANTS_FILE
+    try:
+        with FileLock(path):
+            for _ in range(SAVE_ATTEMPTS):
+                to_save = ours
+                version = tenants_version(path)
+                if version != loaded_version:
+                    theirs, version, error = load_tenants_versioned(path)
+                    if error:
+                        return None, None, error
+                    to_save, conflicts = merge_tenant_changes(base, ours, theirs)
+                    if conflicts:
+                        return None, None, (f"Tenant(s) {', '.join(conflicts)} were changed by another writer "
+                                            "since they were loaded (reload and try again)")
+                
+                success, error = save_tenants(to_save, plugins, path, validate=validate, expected_version=version)
+                if success:
+                    return to_save, tenants_version(path), None
+                if tenants_version(path) == version:
+                    # Failed for another reason than a concurrent write
+                    return None, None, error
+    except TimeoutError as e:
+        return None, None, str(e)
+    
+    return None, None, f"{path} kept changing, gave up after {SAVE_ATTEMPTS} attempts"
+
+
+def diff_registries(old: Dict, new: Dict) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Compare two parsed registries (tenants or plugins) by entry content.
+    
+    Returns:
+        Tuple of (added_ids, removed_ids, changed_ids), each sorted
+    """
+    added = sorted(key for key in new if key not in old)
+    removed = sorted(key for key in old if key not in new)
+    changed = sorted(key for key in new if key in old and new[key] != old[key])
+    return added, removed, changed
@@ -0,0 +1,91 @@
+"""
+Config Preview Module
+Incremental app.config.ts rendering and diffing against the generated app's file, for the GUI preview
+"""
+
+import difflib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from repo_generator import CONFIG_SECTIONS
+from repo_context import get_repo_context
+
+
+def config_file_path(tenant_id: str) -> Optional[Path]:
+    """config/app.config.ts of the tenant's generated app (None if there is no apps directory)."""
+    app_dir = get_repo_context().app_dir(tenant_id)
+    return app_dir / 'config' / 'app.config.ts' if app_dir else None
+
+
+class ConfigPreview:
+    """
+    Renders app.config.ts like generate_config_from_tenant, section by section.
+    
+    Each section is cached with the tenant fields it is rendered from, so
+    an edit only re-renders the sections that read the changed fields
+    (e.g. a theme change re-renders branding, a plugin toggle the header
+    and menu). The file on disk is re-read only when its mtime or size
+    changes.
+    """
+    
+    def __init__(self):
+        self._sections: Dict[str, Tuple[str, str]] = {}   # name -> (inputs key, rendered text)
+        self._disk: Dict[Path, Tuple[Tuple[int, int], str]] = {}   # path -> (signature, content)
+        
+        # Sections re-rendered by the last render() call
+        self.rendered_sections: List[str] = []
+    
+    def render(self, tenant: Dict, tenant_id: str) -> str:
+        """Return the tenant's app.config.ts, re-rendering only sections whose inputs changed."""
+        self.rendered_sections = []
+        parts = []
+        for name, fields, render in CONFIG_SECTIONS:
+            inputs = json.dumps([tenant_id, {field: tenant[field] for field in fields if field in tenant}],
+                                sort_keys=True, default=str)
+            cached = self._sections.get(name)
+            if cached and cached[0] == inputs:
+                parts.append(cached[1])
+                continue
+            text = render(tenant, tenant_id)
+            self._sections[name] = (inputs, text)
+            self.rendered_sections.append(name)
+            parts.append(text)
+        return ''.join(parts)
+    
+    def read_disk(self, path: Optional[Path]) -> Optional[str]:
+        """Content of the file on disk (None if it does not exist or cannot be read)."""
+        if path is None:
+            return None
+        try:
+            stat = path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+            cached = self._disk.get(path)
+            if cached and cached[0] == signature:
+                return cached[1]
+            content = path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            self._disk.pop(path, None)
+            return None
+        self._disk[path] = (signature, content)
+        return content
+    
+    def diff(self, rendered: str, tenant_id: str) -> Tuple[Optional[List[str]], str]:
+        """
+        Diff the rendered config against the generated app's file.
+        
+        Returns:
+            Tuple of (unified diff lines, or None if there is no file on disk; description of the file state)
+        """
+        path = config_file_path(tenant_id)
+        on_disk = self.read_disk(path)
+        if on_disk is None:
+            return None, f"No generated app.config.ts for '{tenant_id}'"
+        if on_disk == rendered:
+            return [], f"Matches {path}"
+        lines = list(difflib.unified_diff(
+            on_disk.splitlines(keepends=True), rendered.splitlines(keepends=True),
+            fromfile=f"{path} (on disk)", tofile="preview"
+        ))
+        changed = sum(1 for line in lines if line[:1] in '+-' and not line.startswith(('+++', '---')))
+        return lines, f"{changed} line(s) differ from {path}"
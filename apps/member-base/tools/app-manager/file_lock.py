@@ -0,0 +1,84 @@
+"""
+File Lock Module
+Advisory inter-process lock held on a sidecar "<file>.lock" (fcntl on Unix, msvcrt on Windows)
+"""
+
+import os
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+    msvcrt = None
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+# Seconds to wait for another writer before giving up
+LOCK_TIMEOUT = 30.0
+
+# Seconds between attempts while the lock is taken
+POLL_INTERVAL = 0.05
+
+
+class FileLock:
+    """
+    Exclusive advisory lock for a file.
+    
+    Only processes that take the same lock wait for each other; plain
+    readers are never blocked. The lock is released if the process dies.
+    """
+    
+    def __init__(self, path, timeout: float = LOCK_TIMEOUT):
+        self.lock_path = Path(f"{path}.lock")
+        self.timeout = timeout
+        self._fd = None
+    
+    def _try_lock(self) -> bool:
+        try:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(self._fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+    
+    def acquire(self):
+        """
+        Take the lock, waiting up to timeout seconds.
+        
+        Raises:
+            TimeoutError: If another process held the lock for the whole timeout
+        """
+        self._fd = os.open(str(self.lock_path), os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout
+        while not self._try_lock():
+            if time.monotonic() >= deadline:
+                os.close(self._fd)
+                self._fd = None
+                raise TimeoutError(f"Timed out after {self.timeout:.0f}s waiting for {self.lock_path}")
+            time.sleep(POLL_INTERVAL)
+    
+    def release(self):
+        """Release the lock (no-op if it is not held)."""
+        if self._fd is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc):
+        self.release()
+        return False
@@ -0,0 +1,281 @@
+"""
+Generation Queue Module
+Run generate_repo for several tenants at once on a process pool, with per-job progress for the GUI dashboard
+"""
+
+import os
+import time
+import queue
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from repo_generator import generate_repo, GenerationProgress
+
+
+# Jobs run at the same time unless configured otherwise
+DEFAULT_GENERATION_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+# Seconds between progress reports a worker sends for one job
+REPORT_INTERVAL = 0.2
+
+# Job states, in the order a job goes through them
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+# Set in each worker process by _init_worker
+_reports = None
+_cancel_event = None
+
+
+def _init_worker(reports, cancel_event):
+    global _reports, _cancel_event
+    _reports = reports
+    _cancel_event = cancel_event
+
+
+class _ReportingProgress(GenerationProgress):
+    """GenerationProgress that sends snapshots to the parent process (at most every REPORT_INTERVAL)."""
+    
+    def __init__(self, job_id: int):
+        super().__init__(cancel_event=_cancel_event)
+        self.job_id = job_id
+        self._last_report = 0.0
+    
+    def report(self, force: bool = False):
+        now = time.monotonic()
+        if force or now - self._last_report >= REPORT_INTERVAL:
+            self._last_report = now
+            _reports.put(('progress', self.job_id, self.snapshot()))
+    
+    def set_phase(self, name: str):
+        super().set_phase(name)
+        self.report(force=True)
+    
+    def copy_file(self, src, dst, *, follow_symlinks: bool = True):
+        result = super().copy_file(src, dst, follow_symlinks=follow_symlinks)
+        self.report()
+        return result
+
+
+def _run_job(job_id: int, kwargs: Dict):
+    """Worker process entry point: generate one repo and return (success, message, final snapshot)."""
+    _reports.put(('started', job_id, None))
+    progress = _ReportingProgress(job_id)
+    try:
+        success, message = generate_repo(progress=progress, **kwargs)
+    except Exception as e:
+        success, message = False, f"Error generating repository: {str(e)}"
+    return success, message, progress.snapshot()
+
+
+class GenerationJob:
+    """One queued generation and what is known about it in the GUI process."""
+    
+    def __init__(self, job_id: int, tenant_id: str, kwargs: Dict):
+        self.job_id = job_id
+        self.tenant_id = tenant_id
+        self.folder_name = kwargs.get('app_folder_name') or tenant_id
+        self.kwargs = kwargs          # generate_repo arguments (except progress), kept for retries
+        self.state = QUEUED
+        self.message = ''
+        self.snapshot: Dict = {}      # Last GenerationProgress.snapshot() from the worker
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.cancel_requested = False
+        self.future = None
+    
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+    
+    @property
+    def bytes(self) -> int:
+        return self.snapshot.get('bytes', 0)
+    
+    @property
+    def files(self) -> int:
+        return self.snapshot.get('files', 0)
+
+
+class GenerationQueue:
+    """
+    Generation jobs run on a ProcessPoolExecutor with a configurable number of workers.
+    
+    Workers send progress over a multiprocessing queue; the GUI calls poll()
+    from its own thread to take in progress and results, so no Tk call is
+    made from another thread. The pool is started for the first job of a
+    batch and shut down when the batch is finished (a new worker count
+    applies from the next batch). cancel_all() drops queued jobs and stops
+    running ones at their next file, which removes their half-written
+    folders.
+    """
+    
+    def __init__(self, workers: int = DEFAULT_GENERATION_WORKERS):
+        self.workers = workers
+        self.jobs: List[GenerationJob] = []
+        self._next_id = 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._reports = None
+        self._cancel_event = None
+        
+        # Jobs submitted since the pool was started, for the aggregate throughput
+        self._batch: List[GenerationJob] = []
+        self._batch_started: Optional[float] = None
+        self._batch_finished: Optional[float] = None
+    
+    @property
+    def active(self) -> bool:
+        """Whether any job is queued or running."""
+        return any(job.state not in FINISHED_STATES for job in self.jobs)
+    
+    def enqueue(self, tenant_id: str, **kwargs) -> GenerationJob:
+        """
+        Queue a generate_repo(tenant_id=..., **kwargs) run.
+        
+        kwargs must be picklable (the tenant dict is copied into the worker).
+        """
+        job = GenerationJob(self._next_id, tenant_id, dict(kwargs, tenant_id=tenant_id))
+        self._next_id += 1
+        self.jobs.append(job)
+        self._submit(job)
+        return job
+    
+    def retry_failed(self) -> int:
+        """Queue failed and cancelled jobs again; returns how many."""
+        retried = 0
+        for job in self.jobs:
+            if job.state in (FAILED, CANCELLED):
+                job.state = QUEUED
+                job.message = ''
+                job.snapshot = {}
+                job.started = job.finished = None
+                job.cancel_requested = False
+                self._submit(job)
+                retried += 1
+        return retried
+    
+    def cancel_all(self):
+        """Drop queued jobs and ask running ones to stop."""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+        for job in self.jobs:
+            if job.state in FINISHED_STATES:
+                continue
+            job.cancel_requested = True
+            if job.future is not None and job.future.cancel():
+                self._finish(job, CANCELLED, "Cancelled before it started")
+    
+    def clear_finished(self):
+        """Forget finished jobs."""
+        self.jobs = [job for job in self.jobs if job.state not in FINISHED_STATES]
+    
+    def totals(self) -> Dict:
+        """Job counts per state, bytes written and aggregate throughput of the last batch."""
+        counts = {state: 0 for state in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}
+        for job in self.jobs:
+            counts[job.state] += 1
+        total_bytes = sum(job.bytes for job in self.jobs)
+        elapsed = 0.0
+        if self._batch_started is not None:
+            elapsed = (self._batch_finished or time.monotonic()) - self._batch_started
+        batch_bytes = sum(job.bytes for job in self._batch)
+        return {
+            'counts': counts,
+            'bytes': total_bytes,
+            'elapsed': elapsed,
+            'bytes_per_second': batch_bytes / elapsed if elapsed > 0 else 0.0,
+        }
+    
+    def poll(self) -> bool:
+        """
+        Take in progress reports and finished jobs (call from the GUI thread).
+        
+        Returns:
+            Whether anything changed
+        """
+        changed = False
+        jobs = {job.job_id: job for job in self.jobs}
+        while self._reports is not None:
+            try:
+                kind, job_id, snapshot = self._reports.get_nowait()
+            except queue.Empty:
+                break
+            job = jobs.get(job_id)
+            if job is None or job.state in FINISHED_STATES:
+                continue
+            if kind == 'started':
+                job.state = RUNNING
+                job.started = time.monotonic()
+            else:
+                job.snapshot = snapshot
+            changed = True
+        
+        for job in self.jobs:
+            if job.state in FINISHED_STATES or job.future is None or not job.future.done():
+                continue
+            if job.future.cancelled():
+                self._finish(job, CANCELLED, "Cancelled before it started")
+            else:
+                try:
+                    success, message, snapshot = job.future.result()
+                except Exception as e:
+                    # The worker process died (BrokenProcessPool) or could not take the job
+                    success, message, snapshot = False, f"Worker failed: {e}", job.snapshot
+                job.snapshot = snapshot
+                if success:
+                    self._finish(job, DONE, message)
+                elif job.cancel_requested:
+                    self._finish(job, CANCELLED, message)
+                else:
+                    self._finish(job, FAILED, message)
+            changed = True
+        
+        if self._executor is not None and not self.active:
+            self._batch_finished = time.monotonic()
+            self._shutdown_pool()
+        return changed
+    
+    def shutdown(self):
+        """Cancel everything and stop the workers (e.g. when the window closes)."""
+        self.cancel_all()
+        self._shutdown_pool(wait=True)
+    
+    def _submit(self, job: GenerationJob):
+        if self._executor is not None and self._cancel_event.is_set():
+            # Jobs cancelled by cancel_all() still wind down in the old pool; start a fresh one
+            self._shutdown_pool()
+        if self._executor is None:
+            context = multiprocessing.get_context()
+            self._reports = context.Queue()
+            self._cancel_event = context.Event()
+            self._executor = ProcessPoolExecutor(
+                max_workers=max(1, self.workers), mp_context=context,
+                initializer=_init_worker, initargs=(self._reports, self._cancel_event)
+            )
+            self._batch = []
+            self._batch_started = time.monotonic()
+            self._batch_finished = None
+        self._batch.append(job)
+        job.future = self._executor.submit(_run_job, job.job_id, job.kwargs)
+    
+    def _finish(self, job: GenerationJob, state: str, message: str):
+        job.state = state
+        job.message = message
+        if job.started is not None:
+            job.finished = time.monotonic()
+    
+    def _shutdown_pool(self, wait: bool = False):
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._executor = None
+        self._reports = None
+        self._cancel_event = None
@@ -0,0 +1,301 @@
+"""
+History Module
+Undo/redo for tenant registry changes, kept as persistent snapshots that share structure
+"""
+
+import copy
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Tuple, Union
+
+
+# Steps kept before the oldest ones are dropped
+HISTORY_LIMIT = 10000
+
+# Bits of the key hash consumed per trie level (32-way branches)
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_HASH_MASK = (1 << 64) - 1
+
+_MISSING = object()
+
+
+class _Leaf:
+    """Entries whose keys share one full hash (almost always a single entry)."""
+    
+    __slots__ = ('hash', 'items')
+    
+    def __init__(self, key_hash: int, items: Tuple):
+        self.hash = key_hash
+        self.items = items
+
+
+class _Branch:
+    """32 child slots (None, _Leaf or _Branch), selected by 5 bits of the key hash."""
+    
+    __slots__ = ('slots',)
+    
+    def __init__(self, slots: Tuple):
+        self.slots = slots
+
+
+def _hash(key: Hashable) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def _set(node, shift: int, key_hash: int, key, value):
+    """Return (new node, whether the key was added); nodes off the key's path are reused."""
+    if node is None:
+        return _Leaf(key_hash, ((key, value),)), True
+    
+    if isinstance(node, _Leaf):
+        if node.hash == key_hash:
+            for i, (existing, _) in enumerate(node.items):
+                if existing == key:
+                    return _Leaf(key_hash, node.items[:i] + ((key, value),) + node.items[i + 1:]), False
+            return _Leaf(key_hash, node.items + ((key, value),)), True
+        # Different hashes in one slot: push the existing leaf one level down
+        slots = [None] * _WIDTH
+        slots[(node.hash >> shift) & _MASK] = node
+        node = _Branch(tuple(slots))
+    
+    index = (key_hash >> shift) & _MASK
+    child, added = _set(node.slots[index], shift + _BITS, key_hash, key, value)
+    return _Branch(node.slots[:index] + (child,) + node.slots[index + 1:]), added
+
+
+def _delete(node, shift: int, key_hash: int, key):
+    """Return (new node or None, whether the key was removed)."""
+    if node is None:
+        return None, False
+    
+    if isinstance(node, _Leaf):
+        if node.hash != key_hash:
+            return node, False
+        items = tuple(item for item in node.items if item[0] != key)
+        if len(items) == len(node.items):
+            return node, False
+        return (_Leaf(key_hash, items) if items else None), True
+    
+    index = (key_hash >> shift) & _MASK
+    child, removed = _delete(node.slots[index], shift + _BITS, key_hash, key)
+    if not removed:
+        return node, False
+    slots = node.slots[:index] + (child,) + node.slots[index + 1:]
+    occupied = [slot for slot in slots if slot is not None]
+    if not occupied:
+        return None, True
+    if len(occupied) == 1 and isinstance(occupied[0], _Leaf):
+        # Keep the trie canonical: a lone leaf moves back up
+        return occupied[0], True
+    return _Branch(slots), True
+
+
+def _build(entries: List[Tuple], shift: int):
+    """Build the canonical trie for (hash, key, value) entries with distinct keys."""
+    if len(entries) == 1 or all(entry[0] == entries[0][0] for entry in entries):
+        return _Leaf(entries[0][0], tuple((key, value) for _, key, value in entries))
+    buckets = [[] for _ in range(_WIDTH)]
+    for entry in entries:
+        buckets[(entry[0] >> shift) & _MASK].append(entry)
+    return _Branch(tuple(_build(bucket, shift + _BITS) if bucket else None for bucket in buckets))
+
+
+def _iter_items(node) -> Iterator[Tuple]:
+    if node is None:
+        return
+    if isinstance(node, _Leaf):
+        yield from node.items
+        return
+    for slot in node.slots:
+        yield from _iter_items(slot)
+
+
+def _diff(a, b, changed: List):
+    """Append keys whose values differ between two subtrees, skipping subtrees they share."""
+    if a is b:
+        return
+    if isinstance(a, _Branch) and isinstance(b, _Branch):
+        for slot_a, slot_b in zip(a.slots, b.slots):
+            _diff(slot_a, slot_b, changed)
+        return
+    items_a = dict(_iter_items(a))
+    items_b = dict(_iter_items(b))
+    for key in items_a.keys() | items_b.keys():
+        value_a = items_a.get(key, _MISSING)
+        value_b = items_b.get(key, _MISSING)
+        if value_a is not value_b and (value_a is _MISSING or value_b is _MISSING or value_a != value_b):
+            changed.append(key)
+
+
+class PersistentMap:
+    """
+    Immutable mapping stored as a hash array mapped trie.
+    
+    set()/delete()/update() return a new map that shares every trie node
+    except the few on the changed keys' paths, so keeping many versions of
+    a large mapping costs memory proportional to the changes between them.
+    """
+    
+    __slots__ = ('_root', '_len')
+    
+    def __init__(self, root=None, length: int = 0):
+        self._root = root
+        self._len = length
+    
+    @classmethod
+    def from_items(cls, items) -> 'PersistentMap':
+        """Build a map in one pass (later items win for repeated keys)."""
+        mapping = dict(items)
+        if not mapping:
+            return cls()
+        entries = [(_hash(key), key, value) for key, value in mapping.items()]
+        return cls(_build(entries, 0), len(entries))
+    
+    def __len__(self) -> int:
+        return self._len
+    
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+    
+    def __iter__(self):
+        return (key for key, _ in _iter_items(self._root))
+    
+    def items(self) -> Iterator[Tuple]:
+        return _iter_items(self._root)
+    
+    def get(self, key, default=None):
+        key_hash = _hash(key)
+        node = self._root
+        shift = 0
+        while isinstance(node, _Branch):
+            node = node.slots[(key_hash >> shift) & _MASK]
+            shift += _BITS
+        if node is not None and node.hash == key_hash:
+            for existing, value in node.items:
+                if existing == key:
+                    return value
+        return default
+    
+    def set(self, key, value) -> 'PersistentMap':
+        root, added = _set(self._root, 0, _hash(key), key, value)
+        return PersistentMap(root, self._len + (1 if added else 0))
+    
+    def delete(self, key) -> 'PersistentMap':
+        root, removed = _delete(self._root, 0, _hash(key), key)
+        return PersistentMap(root, self._len - 1) if removed else self
+    
+    def update(self, changes: Dict) -> 'PersistentMap':
+        """Apply {key: value} changes, where a value of None deletes the key."""
+        result = self
+        for key, value in changes.items():
+            result = result.delete(key) if value is None else result.set(key, value)
+        return result
+    
+    def diff(self, other: 'PersistentMap') -> List:
+        """Keys whose values differ from other (added, removed or changed)."""
+        changed = []
+        _diff(self._root, other._root, changed)
+        return changed
+
+
+# Applies {tenant_id: tenant or None} changes; gets the values the changed tenants
+# are expected to have now, and returns (success, message)
+ApplyChanges = Callable[[Dict[str, Optional[Dict]], Dict[str, Optional[Dict]]], Tuple[bool, str]]
+
+
+class History:
+    """
+    Undo/redo stack of registry snapshots (tenant ID -> tenant).
+    
+    Each step keeps the snapshot from before it; snapshots are
+    PersistentMaps that share everything but the tenants a step changed.
+    Tenants are copied when recorded and when handed back, so later
+    in-place edits can't alter the history.
+    """
+    
+    def __init__(self, limit: int = HISTORY_LIMIT):
+        self.limit = limit
+        self.reset()
+    
+    def reset(self):
+        """Forget all steps (e.g. after the registry was reloaded)."""
+        self.current: Optional[PersistentMap] = None
+        self._undo: List[Tuple[str, PersistentMap]] = []   # (label, snapshot before the step)
+        self._redo: List[Tuple[str, PersistentMap]] = []   # (label, snapshot after the step)
+        self._coalesce_key = None
+    
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+    
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+    
+    def record(self, label: str, before: Dict[str, Optional[Dict]], after: Dict[str, Optional[Dict]],
+               registry: Optional[Union[Dict, Callable[[], Dict]]] = None, coalesce_key: Optional[Hashable] = None):
+        """
+        Record a step that changed some tenants.
+        
+        Args:
+            label: Description shown when undoing/redoing the step
+            before: Changed tenants before the step (None for tenants it created)
+            after: Changed tenants after the step (None for tenants it deleted)
+            registry: Full registry (before or after the step), or a callable returning it;
+                      only read for the first step, so a callable saves building it on every edit
+            coalesce_key: Steps recorded in a row with the same key merge into one (e.g. typing in a field)
+        """
+        before = copy.deepcopy(before)
+        after = copy.deepcopy(after)
+        if self.current is None:
+            if callable(registry):
+                registry = registry()
+            # Copied too: callers may go on editing the registry's tenants in place
+            self.current = PersistentMap.from_items(
+                (tenant_id, copy.deepcopy(tenant)) for tenant_id, tenant in (registry or {}).items()
+            )
+        
+        if coalesce_key is not None and coalesce_key == self._coalesce_key and self._undo:
+            self.current = self.current.update(after)
+            return
+        
+        start = self.current.update(before)
+        self._undo.append((label, start))
+        if len(self._undo) > self.limit:
+            del self._undo[:len(self._undo) - self.limit]
+        self.current = start.update(after)
+        self._redo = []
+        self._coalesce_key = coalesce_key
+    
+    def undo(self, apply: ApplyChanges) -> Tuple[bool, str]:
+        """Restore the snapshot before the last step through apply (history only moves if it succeeds)."""
+        if not self._undo:
+            return False, "Nothing to undo"
+        label, target = self._undo[-1]
+        success, message = self._move_to(target, apply)
+        if not success:
+            return False, message
+        self._undo.pop()
+        self._redo.append((label, self.current))
+        self.current = target
+        return True, f"Undid: {label}"
+    
+    def redo(self, apply: ApplyChanges) -> Tuple[bool, str]:
+        """Re-apply the last undone step through apply."""
+        if not self._redo:
+            return False, "Nothing to redo"
+        label, target = self._redo[-1]
+        success, message = self._move_to(target, apply)
+        if not success:
+            return False, message
+        self._redo.pop()
+        self._undo.append((label, self.current))
+        self.current = target
+        return True, f"Redid: {label}"
+    
+    def _move_to(self, target: PersistentMap, apply: ApplyChanges) -> Tuple[bool, str]:
+        self._coalesce_key = None
+        changed = self.current.diff(target)
+        changes = {tenant_id: copy.deepcopy(target.get(tenant_id)) for tenant_id in changed}
+        expected = {tenant_id: self.current.get(tenant_id) for tenant_id in changed}
+        return apply(changes, expected)
@@ -18,16 +18,48 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
 import os
 import sys
-from typing import Dict, Optional
+import copy
+import queue
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
 
 # Import local modules
 from config_io import (
     normalize_tenant_id,
-    load_tenants, load_plugins, save_tenants,
-    validate_tenant
+    TENANTS_FILE, load_tenants_versioned, load_plugins, save_tenant_changes, tenants_version,
+    validate_tenant, collect_tenant_errors, diff_registries
 )
-from ui_components import TenantDetailFrame, PluginMatrixFrame
-from repo_generator import generate_repo, list_generated_apps
+from tenant_edits import TenantEdits, apply_bulk_edit, summarize_bulk_edit
+from history import History
+from ui_components import (
+    TenantDetailFrame, PluginMatrixFrame, VirtualTenantList, GenerationProgressDialog, ValidationPanel,
+    ConfigPreviewFrame, BulkEditDialog, GenerationQueueWindow
+)
+from config_preview import ConfigPreview
+from repo_generator import generate_repo, list_generated_apps, GenerationProgress
+from repo_context import get_repo_context
+from profiler import Profiler, use_profiler, default_report_file
+
+
+# Milliseconds between checks on background work (loading, generation)
+WORKER_POLL_MS = 100
+
+# Milliseconds to wait after the last edit before re-rendering the config preview
+PREVIEW_DELAY_MS = 300
+
+# Milliseconds between stat checks of tenants.json for changes by other writers
+EXTERNAL_POLL_MS = 2000
+
+
+def _file_signature(path) -> Optional[Tuple[int, int]]:
+    """Cheap change signature of a file (mtime and size, None if missing)."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
 
 class ClosepayManagerApp(tk.Tk):
@@ -41,47 +73,161 @@ class ClosepayManagerApp(tk.Tk):
         self.minsize(600, 500)
         
         # Data storage
-        self.tenants: Dict = {}
+        self.tenants: Dict = {}        # Registry as last loaded or saved
+        self.tenants_version: Optional[str] = None
         self.plugins: Dict = {}
         self.current_tenant_id: Optional[str] = None
-        self.unsaved_changes = False
+        
+        # Unsaved changes per tenant (changed fields only); they survive switching tenants
+        self.edits = TenantEdits()
+        self._loading_tenant = False
+        
+        # Undo/redo of edits (Ctrl+Z / Ctrl+Y); saving keeps it, reloading clears it
+        self.history = History()
+        
+        # app.config.ts preview (sections are re-rendered only when their fields change)
+        self.preview = ConfigPreview()
+        self._preview_job = None
+        
+        # Background generation in progress (thread, progress, dialog, result), if any
+        self.generation: Optional[Dict] = None
+        self._close_after_generation = False
+        
+        # Queue of "Generate Selected" jobs on a process pool, and its dashboard (created on first use)
+        self.generation_queue = None
+        self.queue_window: Optional[GenerationQueueWindow] = None
+        self._queue_poll_job = None
+        
+        # Background load in progress (message queue, reload flag, profiling), if any
+        self.loading: Optional[Dict] = None
+        
+        # Changes other writers make to tenants.json are merged in while the window is open
+        self._tenants_signature: Optional[Tuple[int, int]] = None
+        self.external_load: Optional[Dict] = None
+        self.external_conflicts: Set[str] = set()   # Edited here and changed on disk since
         
         # Change to script directory to find JSON files
         script_dir = os.path.dirname(os.path.abspath(__file__))
         os.chdir(script_dir)
         
-        # Load data
-        self._load_data()
-        
-        # Create UI
+        # Create UI first, so the window appears while the data loads
         self._create_widgets()
         
         # Bind window close event
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
+        
+        # Undo/redo shortcuts
+        self.bind_all('<Control-z>', lambda e: self._undo())
+        self.bind_all('<Control-y>', lambda e: self._redo())
+        self.bind_all('<Control-Z>', lambda e: self._redo())
+        
+        # Load data, then keep watching tenants.json
+        self._load_data()
+        self.after(EXTERNAL_POLL_MS, self._watch_tenants_file)
     
-    def _load_data(self):
-        """Load tenants and plugins from JSON files."""
-        # Load plugins first (needed for validation)
-        plugins, error = load_plugins()
-        if error:
-            messagebox.showerror("Error Loading Plugins", error)
-            sys.exit(1)
-        self.plugins = plugins
+    def _load_data(self, reload: bool = False):
+        """
+        Load tenants and plugins from JSON files on a worker thread.
         
-        # Load tenants
-        tenants, error = load_tenants()
-        if error:
-            messagebox.showerror("Error Loading Tenants", error)
-            sys.exit(1)
-        self.tenants = tenants
+        The tenant list is filled as soon as both files are parsed; validation
+        runs afterwards on the same thread and its problems are shown in the
+        validation panel instead of a blocking dialog.
         
-        # Validate tenants
-        from config_io import validate_all_tenants
-        is_valid, error = validate_all_tenants(self.tenants, self.plugins)
-        if not is_valid:
-            messagebox.showwarning("Validation Warning", 
-                                 f"Some tenants have validation errors:\n{error}\n\n"
-                                 "You can still edit and save, but please fix errors.")
+        Args:
+            reload: Reloading on request (profiled as 'reload', errors keep the current data)
+        """
+        messages = queue.Queue()
+        profiler = self._start_profile('reload') if reload else None
+        
+        def run():
+            use_profiler(profiler)
+            try:
+                # Load plugins first (needed for validation)
+                plugins, error = load_plugins()
+                if error:
+                    messages.put(('error', "Error Loading Plugins", error))
+                    return
+                
+                tenants, version, error = load_tenants_versioned()
+                if error:
+                    messages.put(('error', "Error Loading Tenants", error))
+                    return
+                
+                # The GUI gets its own dict, so adding tenants can't disturb validation
+                messages.put(('loaded', plugins, dict(tenants), version))
+                
+                problems = collect_tenant_errors(tenants, plugins) if tenants else [('', "No tenants found")]
+                messages.put(('validated', problems))
+            except Exception as e:
+                messages.put(('error', "Error Loading Data", str(e)))
+        
+        self.loading = {
+            'messages': messages,
+            'reload': reload,
+            'profiler': profiler,
+        }
+        self._set_loading(True)
+        threading.Thread(target=run, name='load-data', daemon=True).start()
+        self.after(WORKER_POLL_MS, self._poll_loading)
+    
+    def _poll_loading(self):
+        """Apply whatever the load worker has finished since the last poll."""
+        loading = self.loading
+        if not loading:
+            return
+        
+        while True:
+            try:
+                message = loading['messages'].get_nowait()
+            except queue.Empty:
+                break
+            
+            if message[0] == 'loaded':
+                _, plugins, tenants, version = message
+                self.plugins = plugins
+                self.tenants = tenants
+                self.tenants_version = version
+                self._tenants_signature = None   # Checked against version on the next watch
+                self.edits.clear()
+                self.history.reset()
+                self.external_conflicts.clear()
+                self.plugin_matrix.set_plugins(plugins)
+                self._refresh_tenant_list()
+                self.status_var.set(f"Loaded {len(tenants)} tenant(s), validating...")
+            elif message[0] == 'validated':
+                problems = message[1]
+                self.validation_panel.set_problems(problems)
+                status = "Data reloaded from disk" if loading['reload'] else f"Loaded {len(self.tenants)} tenant(s)"
+                if problems:
+                    status += f" ({len(problems)} with validation errors)"
+                self._finish_loading(status)
+                return
+            else:
+                _, title, error = message
+                self._finish_loading(f"Error: {error}")
+                messagebox.showerror(title, error)
+                if not loading['reload']:
+                    sys.exit(1)
+                return
+        
+        self.after(WORKER_POLL_MS, self._poll_loading)
+    
+    def _finish_loading(self, status: str):
+        """Leave the loading state and show status."""
+        loading = self.loading
+        self.loading = None
+        self._set_loading(False)
+        if loading['profiler']:
+            self._stop_profile('reload', loading['profiler'])
+        self.status_var.set(status)
+    
+    def _set_loading(self, loading: bool):
+        """Show the loading state: buttons that need loaded data are disabled meanwhile."""
+        for button in self.data_buttons:
+            button.configure(state=tk.DISABLED if loading else tk.NORMAL)
+        if loading:
+            self.status_var.set("Loading tenants and plugins...")
+            self.tenant_list.count_var.set("Loading...")
     
     def _create_widgets(self):
         """Create all UI widgets."""
@@ -105,20 +251,9 @@ class ClosepayManagerApp(tk.Tk):
             row=0, column=0, sticky="w", pady=(0, 5)
         )
         
-        # Tenant listbox with scrollbar
-        list_frame = ttk.Frame(left_panel)
-        list_frame.grid(row=1, column=0, sticky="nsew")
-        list_frame.columnconfigure(0, weight=1)
-        list_frame.rowconfigure(0, weight=1)
-        
-        self.tenant_listbox = tk.Listbox(list_frame, selectmode=tk.SINGLE)
-        self.tenant_listbox.grid(row=0, column=0, sticky="nsew")
-        self.tenant_listbox.bind('<<ListboxSelect>>', self._on_tenant_select)
-        
-        list_scrollbar = ttk.Scrollbar(list_frame, orient="vertical", 
-                                       command=self.tenant_listbox.yview)
-        list_scrollbar.grid(row=0, column=1, sticky="ns")
-        self.tenant_listbox.config(yscrollcommand=list_scrollbar.set)
+        # Tenant list with filter box (only visible rows are rendered)
+        self.tenant_list = VirtualTenantList(left_panel, on_select=self._on_tenant_select)
+        self.tenant_list.grid(row=1, column=0, sticky="nsew")
         
         # Right panel: Tenant detail and plugins
         right_panel = ttk.Frame(main_container)
@@ -130,135 +265,455 @@ class ClosepayManagerApp(tk.Tk):
         self.tenant_detail = TenantDetailFrame(right_panel, on_change=self._on_tenant_change)
         self.tenant_detail.grid(row=0, column=0, sticky="ew", pady=(0, 10))
         
+        # Plugins and app.config.ts preview share the space below the details
+        self.right_tabs = ttk.Notebook(right_panel)
+        self.right_tabs.grid(row=1, column=0, sticky="nsew")
+        
         # Plugin matrix frame
-        self.plugin_matrix = PluginMatrixFrame(right_panel, self.plugins, 
+        self.plugin_matrix = PluginMatrixFrame(self.right_tabs, self.plugins, 
                                                on_change=self._on_plugin_change)
-        self.plugin_matrix.grid(row=1, column=0, sticky="nsew")
+        self.right_tabs.add(self.plugin_matrix, text="Plugins")
+        
+        # Live preview (rendered only while its tab is shown)
+        self.preview_frame = ConfigPreviewFrame(self.right_tabs)
+        self.right_tabs.add(self.preview_frame, text="app.config.ts Preview")
+        self.right_tabs.bind('<<NotebookTabChanged>>', lambda e: self._schedule_preview(0))
         
         # Button bar
         button_frame = ttk.Frame(main_container)
         button_frame.grid(row=1, column=1, sticky="ew", pady=(10, 0))
         
-        ttk.Button(button_frame, text="Save", command=self._save_changes).grid(
-            row=0, column=0, padx=(0, 5)
-        )
-        ttk.Button(button_frame, text="Reload", command=self._reload_data).grid(
-            row=0, column=1, padx=(0, 5)
-        )
-        ttk.Button(button_frame, text="Add Tenant", command=self._add_tenant).grid(
-            row=0, column=2, padx=(0, 5)
+        # Buttons that need loaded data (disabled while loading)
+        self.data_buttons = []
+        for column, (text, command) in enumerate([
+            ("Save", self._save_changes),
+            ("Reload", self._reload_data),
+            ("Add Tenant", self._add_tenant),
+            ("Delete Tenant", self._delete_tenant),
+            ("Bulk Edit...", self._bulk_edit),
+        ]):
+            button = ttk.Button(button_frame, text=text, command=command)
+            button.grid(row=0, column=column, padx=(0, 5))
+            self.data_buttons.append(button)
+        self.generate_button = ttk.Button(button_frame, text="Generate Repo", command=self._generate_repo)
+        self.generate_button.grid(row=0, column=5, padx=(0, 5))
+        ttk.Button(button_frame, text="Generate Selected...", command=self._generate_selected).grid(
+            row=0, column=6, padx=(0, 5)
         )
-        ttk.Button(button_frame, text="Delete Tenant", command=self._delete_tenant).grid(
-            row=0, column=3, padx=(0, 5)
+        
+        # Profile toggle: time Save/Reload/Generate phases and write a report per action
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="Profile", variable=self.profile_var).grid(
+            row=0, column=7, padx=(10, 5)
         )
-        ttk.Button(button_frame, text="Generate Repo", command=self._generate_repo).grid(
-            row=0, column=4, padx=(0, 5)
+        self.profile_result_var = tk.StringVar(value="")
+        ttk.Label(button_frame, textvariable=self.profile_result_var, foreground="gray").grid(
+            row=1, column=0, columnspan=8, sticky="w"
         )
         
+        # Validation problems (hidden until there are some)
+        self.validation_panel = ValidationPanel(main_container, on_select=self._on_validation_select)
+        self.validation_panel.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(10, 0))
+        self.validation_panel.grid_remove()
+        
         # Status bar
         self.status_var = tk.StringVar(value="Ready")
         status_label = ttk.Label(main_container, textvariable=self.status_var, 
                                 relief=tk.SUNKEN, anchor="w")
-        status_label.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(10, 0))
+        status_label.grid(row=3, column=0, columnspan=2, sticky="ew", pady=(10, 0))
+    
+    @contextmanager
+    def _profiled(self, command: str):
+        """Profile the wrapped work (run on the Tk thread) when the Profile toggle is on."""
+        profiler = self._start_profile(command)
+        if not profiler:
+            yield
+            return
         
-        # Populate tenant list (after all widgets are created)
-        self._refresh_tenant_list()
+        use_profiler(profiler)
+        try:
+            yield
+        finally:
+            use_profiler(None)
+            self._stop_profile(command, profiler)
+    
+    def _start_profile(self, command: str) -> Optional[Profiler]:
+        """
+        Start profiling command if the Profile toggle is on.
+        
+        Every action gets its own Profiler, so a save during a generation
+        doesn't mix their phases; the thread doing the work must call
+        use_profiler() with it.
+        
+        Returns:
+            The started Profiler, or None if profiling is off
+        """
+        if not self.profile_var.get():
+            return None
+        profiler = Profiler()
+        profiler.start(command)
+        return profiler
+    
+    def _stop_profile(self, command: str, profiler: Profiler):
+        """Stop profiling, write the report and show its summary."""
+        report_file = default_report_file(Path(os.path.dirname(os.path.abspath(__file__))), command)
+        report = profiler.stop(report_file)
+        self.profile_result_var.set(
+            f"Profile of '{command}': {report['total']['wall_s']:.3f}s wall, "
+            f"{report['total']['cpu_s']:.3f}s CPU -> {report_file.name}"
+        )
+    
+    def _watch_tenants_file(self):
+        """
+        Stat tenants.json every EXTERNAL_POLL_MS; when it changed, read it on
+        a worker thread and merge the tenants another writer changed.
+        """
+        self.after(EXTERNAL_POLL_MS, self._watch_tenants_file)
+        if self.loading or self.external_load:
+            return
+        signature = _file_signature(TENANTS_FILE)
+        if signature is None or signature == self._tenants_signature:
+            return
+        
+        known_version = self.tenants_version
+        external_load = {'signature': signature, 'known_version': known_version, 'result': None}
+        
+        def run():
+            try:
+                # Hashing is cheaper than parsing: our own saves and touched files stop here
+                if tenants_version() == known_version:
+                    external_load['result'] = ('unchanged',)
+                    return
+                tenants, version, error = load_tenants_versioned()
+                external_load['result'] = ('error', error) if error else ('loaded', tenants, version)
+            except Exception as e:
+                external_load['result'] = ('error', str(e))
+        
+        external_load['thread'] = threading.Thread(target=run, name='load-external', daemon=True)
+        self.external_load = external_load
+        external_load['thread'].start()
+        self.after(WORKER_POLL_MS, self._poll_external_load)
+    
+    def _poll_external_load(self):
+        external_load = self.external_load
+        if not external_load:
+            return
+        if external_load['thread'].is_alive():
+            self.after(WORKER_POLL_MS, self._poll_external_load)
+            return
+        
+        self.external_load = None
+        result = external_load['result']
+        if self.loading:
+            # A full load started meanwhile and supersedes this one
+            return
+        if self.tenants_version != external_load['known_version']:
+            # Saved (or reloaded) meanwhile: the result may be older than that; check again next time
+            return
+        if result[0] == 'error':
+            # Probably caught mid-write by a writer that doesn't replace the file atomically; retry next time
+            return
+        self._tenants_signature = external_load['signature']
+        if result[0] == 'loaded':
+            _, tenants, version = result
+            self._merge_external_tenants(tenants, version)
+    
+    def _merge_external_tenants(self, theirs: Dict, version: Optional[str]):
+        """
+        Take in tenants.json as saved by another writer, touching only the tenants that changed.
+        
+        Unedited tenants are replaced and refreshed in the list in place.
+        Tenants with unsaved edits keep their changed fields on top of the
+        new saved version (see TenantEdits.rebase); if the other writer
+        changed one of those fields too (differently), they are flagged as
+        conflicts and Save asks before overwriting them.
+        """
+        old = self.tenants
+        added, removed, changed = diff_registries(old, theirs)
+        touched = added + removed + changed
+        if not touched:
+            self.tenants_version = version
+            return
+        
+        existed = {tenant_id: self.edits.exists(old, tenant_id) for tenant_id in touched}
+        edited = [tenant_id for tenant_id in touched if tenant_id in self.edits]
+        self.tenants = theirs
+        self.tenants_version = version
+        
+        # Keep the changed fields on top of the new saved versions
+        for tenant_id in edited:
+            if self.edits.rebase(old, theirs, tenant_id):
+                self.external_conflicts.add(tenant_id)
+            elif tenant_id not in self.edits:
+                # The other writer made the same change
+                self.external_conflicts.discard(tenant_id)
+        
+        for tenant_id in touched:
+            exists = self.edits.exists(theirs, tenant_id)
+            if existed[tenant_id] and not exists:
+                self.tenant_list.remove(tenant_id)
+            elif existed[tenant_id]:
+                self.tenant_list.set_name(tenant_id, self.edits.get(theirs, tenant_id).get('name', ''))
+            elif exists:
+                self.tenant_list.add(tenant_id, self.edits.get(theirs, tenant_id).get('name', ''))
+        
+        if self.current_tenant_id in touched:
+            current = self.edits.get(theirs, self.current_tenant_id)
+            if current is None:
+                self.current_tenant_id = None
+                self._loading_tenant = True
+                try:
+                    self.tenant_detail.clear()
+                    self.plugin_matrix.set_enabled_features([])
+                finally:
+                    self._loading_tenant = False
+            else:
+                self._show_tenant(current)
+            self._schedule_preview(0)
+        
+        status = f"tenants.json changed on disk: {len(added)} added, {len(changed)} changed, {len(removed)} removed"
+        invalid = collect_tenant_errors({tenant_id: theirs[tenant_id] for tenant_id in added + changed}, self.plugins)
+        if invalid:
+            status += f" ({len(invalid)} invalid)"
+        conflicts = sorted(self.external_conflicts & set(edited))
+        if conflicts:
+            status += f"; also edited here: {', '.join(conflicts)}"
+        self.status_var.set(status)
     
     def _refresh_tenant_list(self):
-        """Refresh the tenant listbox."""
-        self.tenant_listbox.delete(0, tk.END)
-        for tenant_id in sorted(self.tenants.keys()):
-            self.tenant_listbox.insert(tk.END, tenant_id)
+        """Rebuild the tenant list (after loading or reloading all tenants)."""
+        self.tenant_list.set_tenants(self.tenants)
         
         # Select first tenant if available
-        if self.tenant_listbox.size() > 0:
-            self.tenant_listbox.selection_set(0)
-            self._on_tenant_select(None)
+        first = self.tenant_list.first()
+        if first:
+            self.tenant_list.select(first)
     
-    def _on_tenant_select(self, event):
+    def _on_tenant_select(self, tenant_id: str):
         """Handle tenant list selection."""
         # Check if widgets are initialized
         if not hasattr(self, 'tenant_detail') or not hasattr(self, 'plugin_matrix'):
             return
-            
-        selection = self.tenant_listbox.curselection()
-        if not selection:
-            return
         
-        tenant_id = self.tenant_listbox.get(selection[0])
-        if tenant_id in self.tenants:
+        tenant = self.edits.get(self.tenants, tenant_id)
+        if tenant is not None:
             self.current_tenant_id = tenant_id
-            tenant = self.tenants[tenant_id]
+            self._show_tenant(tenant)
+            self._schedule_preview(0)
+            dirty = " (unsaved changes)" if tenant_id in self.edits else ""
+            if tenant_id in self.external_conflicts:
+                dirty += " (also changed on disk; Save will ask before overwriting)"
+            self.status_var.set(f"Loaded tenant: {tenant_id}{dirty}")
+    
+    def _show_tenant(self, tenant: Dict):
+        """Put a tenant into the detail fields and plugin tree without recording it as an edit."""
+        self._loading_tenant = True
+        try:
             self.tenant_detail.load_tenant(tenant)
             self.plugin_matrix.set_enabled_features(tenant.get('enabledFeatures', []))
-            self.unsaved_changes = False
-            self.status_var.set(f"Loaded tenant: {tenant_id}")
+        finally:
+            self._loading_tenant = False
+    
+    def _on_validation_select(self, tenant_id: str):
+        """Open a tenant from the validation panel."""
+        if self.edits.exists(self.tenants, tenant_id):
+            self.tenant_list.select(tenant_id)
     
     def _on_tenant_change(self):
         """Handle changes to tenant detail fields."""
-        if self.current_tenant_id:
-            self.unsaved_changes = True
-            self.status_var.set("Unsaved changes")
+        self._record_current_tenant()
     
     def _on_plugin_change(self):
         """Handle plugin checkbox changes."""
-        if self.current_tenant_id:
-            self.unsaved_changes = True
-            self.status_var.set("Unsaved changes")
+        self._record_current_tenant()
     
-    def _save_current_tenant(self):
-        """Save current tenant data from UI to memory."""
-        if not self.current_tenant_id:
+    def _record_current_tenant(self):
+        """Record the current tenant's fields from the UI in the dirty set (no validation yet)."""
+        if self._loading_tenant or not self.current_tenant_id:
             return
         
-        # Get data from UI
-        tenant_data = self.tenant_detail.get_tenant_data()
+        current = self.edits.get(self.tenants, self.current_tenant_id)
+        if current is None:
+            return
+        
+        # UI fields replace the current ones; fields the UI doesn't show are kept
+        tenant_data = dict(current)
+        tenant_data.update(self.tenant_detail.get_tenant_data())
         enabled_features = self.plugin_matrix.get_enabled_features()
-        tenant_data['enabledFeatures'] = enabled_features
+        if set(enabled_features) != set(current.get('enabledFeatures', [])):
+            tenant_data['enabledFeatures'] = enabled_features
+        else:
+            # Same plugins: keep their saved order so the tenant isn't dirty for nothing
+            tenant_data['enabledFeatures'] = current.get('enabledFeatures', [])
+        
+        changed = sorted(field for field in tenant_data.keys() | current.keys()
+                         if tenant_data.get(field) != current.get(field))
+        if not changed:
+            return
+        
+        # Typing in one field is one undo step; every plugin toggle is its own step
+        coalesce_key = None if 'enabledFeatures' in changed else (self.current_tenant_id, tuple(changed))
+        self.history.record(
+            f"edit {self.current_tenant_id} ({', '.join(changed)})",
+            {self.current_tenant_id: current}, {self.current_tenant_id: tenant_data},
+            registry=lambda: self.edits.apply(self.tenants), coalesce_key=coalesce_key
+        )
+        
+        self.edits.set_tenant(self.tenants, self.current_tenant_id, tenant_data)
+        if tenant_data['name'] != current.get('name'):
+            self.tenant_list.set_name(self.current_tenant_id, tenant_data['name'])
+        self._show_dirty_status()
+        self._schedule_preview()
+    
+    def _schedule_preview(self, delay: int = PREVIEW_DELAY_MS):
+        """Re-render the config preview once edits pause for delay ms."""
+        if self._preview_job:
+            self.after_cancel(self._preview_job)
+        self._preview_job = self.after(delay, self._update_preview)
+    
+    def _update_preview(self):
+        """Render the current tenant's app.config.ts (with its edits) and diff it against disk."""
+        self._preview_job = None
+        if self.right_tabs.select() != str(self.preview_frame):
+            return
+        
+        tenant = self.edits.get(self.tenants, self.current_tenant_id) if self.current_tenant_id else None
+        if tenant is None:
+            self.preview_frame.clear()
+            return
         
-        # Validate
-        is_valid, error = validate_tenant(tenant_data, self.current_tenant_id, self.plugins)
+        rendered = self.preview.render(tenant, self.current_tenant_id)
+        diff_lines, disk_status = self.preview.diff(rendered, self.current_tenant_id)
+        sections = ', '.join(self.preview.rendered_sections) or "nothing"
+        self.preview_frame.show(rendered, diff_lines, f"Re-rendered: {sections}. {disk_status}")
+    
+    def _undo(self):
+        """Undo the last edit, add or delete (Ctrl+Z)."""
+        if self.loading:
+            return 'break'
+        _, message = self.history.undo(self._apply_history)
+        self.status_var.set(message)
+        return 'break'
+    
+    def _redo(self):
+        """Redo the last undone edit (Ctrl+Y / Ctrl+Shift+Z)."""
+        if self.loading:
+            return 'break'
+        _, message = self.history.redo(self._apply_history)
+        self.status_var.set(message)
+        return 'break'
+    
+    def _apply_history(self, changes: Dict[str, Optional[Dict]],
+                       expected: Dict[str, Optional[Dict]]) -> Tuple[bool, str]:
+        """Put tenants from a history snapshot into the edits (None deletes) and show them."""
+        changed_since = sorted(tenant_id for tenant_id, tenant in expected.items()
+                               if self.edits.get(self.tenants, tenant_id) != tenant)
+        if changed_since:
+            # Only a save that merged another writer's changes gets here
+            return False, f"Cannot undo/redo: {', '.join(changed_since)} changed by another writer"
+        
+        shown = None
+        for tenant_id in sorted(changes):
+            tenant = changes[tenant_id]
+            if tenant is None:
+                self.edits.delete(self.tenants, tenant_id)
+                self.tenant_list.remove(tenant_id)
+                if tenant_id == self.current_tenant_id:
+                    self.current_tenant_id = None
+                    self._loading_tenant = True
+                    try:
+                        self.tenant_detail.clear()
+                        self.plugin_matrix.set_enabled_features([])
+                    finally:
+                        self._loading_tenant = False
+                    self._schedule_preview(0)
+            else:
+                self.edits.set_tenant(self.tenants, tenant_id, tenant)
+                self.tenant_list.add(tenant_id, tenant.get('name', ''))
+                if shown is None or tenant_id == self.current_tenant_id:
+                    shown = tenant_id
+        
+        if shown:
+            self.tenant_list.select(shown)
+        return True, ''
+    
+    def _show_dirty_status(self):
+        if self.edits:
+            self.status_var.set(f"Unsaved changes in {len(self.edits)} tenant(s)")
+        else:
+            self.status_var.set("No unsaved changes")
+    
+    def _validate_tenant(self, tenant_id: str) -> bool:
+        """Validate a tenant with its edits, showing the error if it is invalid."""
+        tenant = self.edits.get(self.tenants, tenant_id)
+        is_valid, error = validate_tenant(tenant, tenant_id, self.plugins)
         if not is_valid:
             messagebox.showerror("Validation Error", error)
             return False
-        
-        # Update in memory
-        self.tenants[self.current_tenant_id] = tenant_data
         return True
     
     def _save_changes(self):
-        """Save all changes to JSON file."""
-        # Save current tenant first
-        if self.current_tenant_id:
-            if not self._save_current_tenant():
+        """Validate and save the changed tenants (other tenants are neither validated nor touched)."""
+        if not self.edits:
+            self.status_var.set("No unsaved changes")
+            return
+        
+        dirty_ids = self.edits.dirty_ids()
+        for tenant_id in dirty_ids:
+            if self.edits.exists(self.tenants, tenant_id) and not self._validate_tenant(tenant_id):
+                self.tenant_list.select(tenant_id)
                 return
         
-        # Save to file
-        success, error = save_tenants(self.tenants, self.plugins)
-        if success:
-            self.unsaved_changes = False
-            self.status_var.set("Changes saved successfully")
-            messagebox.showinfo("Success", "Configuration saved successfully!")
-        else:
+        conflicts = sorted(self.external_conflicts.intersection(dirty_ids))
+        if conflicts and not messagebox.askyesno(
+            "Changed On Disk",
+            f"{len(conflicts)} tenant(s) you edited were also changed on disk by another writer: "
+            f"{', '.join(conflicts[:10])}{', ...' if len(conflicts) > 10 else ''}\n\n"
+            "Overwrite them with your version?",
+            icon="warning"
+        ):
+            return
+        
+        # Save to file, merging into the file if another writer saved in the meantime
+        ours = self.edits.apply(self.tenants)
+        with self._profiled('save'):
+            saved, version, error = save_tenant_changes(
+                self.edits.base(self.tenants), ours, self.plugins,
+                self.tenants_version, validate=False
+            )
+        if error:
             messagebox.showerror("Save Error", error)
             self.status_var.set(f"Error: {error}")
+            return
+        
+        self.tenants = saved
+        self.tenants_version = version
+        self.edits.clear()
+        self.external_conflicts.clear()
+        # Tenants added or removed by another writer show up in the list
+        for tenant_id in saved.keys() - ours.keys():
+            self.tenant_list.add(tenant_id, saved[tenant_id].get('name', ''))
+        for tenant_id in ours.keys() - saved.keys():
+            self.tenant_list.remove(tenant_id)
+        self.status_var.set(f"Saved {len(dirty_ids)} changed tenant(s)")
+        messagebox.showinfo("Success", "Configuration saved successfully!")
     
     def _reload_data(self):
         """Reload data from disk."""
-        if self.unsaved_changes:
+        if self.loading:
+            return
+        
+        if self.edits:
             response = messagebox.askyesno(
                 "Unsaved Changes",
-                "You have unsaved changes. Reload anyway?",
+                f"You have unsaved changes in {len(self.edits)} tenant(s). Reload anyway?",
                 icon="warning"
             )
             if not response:
                 return
         
-        # Reload from disk
-        self._load_data()
-        self._refresh_tenant_list()
-        self.unsaved_changes = False
-        self.status_var.set("Data reloaded from disk")
+        # Reload from disk (in the background)
+        self._load_data(reload=True)
     
     def _add_tenant(self):
         """Add a new tenant."""
@@ -279,7 +734,7 @@ class ClosepayManagerApp(tk.Tk):
             messagebox.showerror("Error", "Tenant ID cannot be empty")
             return
         
-        if tenant_id in self.tenants:
+        if self.edits.exists(self.tenants, tenant_id):
             messagebox.showerror("Error", f"Tenant '{tenant_id}' already exists")
             return
         
@@ -300,8 +755,9 @@ class ClosepayManagerApp(tk.Tk):
             return
         
         # Duplicate DEFAULT tenant as base, or create default
-        if 'DEFAULT' in self.tenants:
-            new_tenant = self.tenants['DEFAULT'].copy()
+        default_tenant = self.edits.get(self.tenants, 'DEFAULT')
+        if default_tenant is not None:
+            new_tenant = default_tenant.copy()
             new_tenant['id'] = tenant_id
             new_tenant['name'] = tenant_name
             # Clear enabled features for new tenant
@@ -326,18 +782,14 @@ class ClosepayManagerApp(tk.Tk):
                 'homeTabs': []
             }
         
-        # Add to tenants
-        self.tenants[tenant_id] = new_tenant
-        self._refresh_tenant_list()
-        
-        # Select the new tenant
-        index = sorted(self.tenants.keys()).index(tenant_id)
-        self.tenant_listbox.selection_clear(0, tk.END)
-        self.tenant_listbox.selection_set(index)
-        self._on_tenant_select(None)
+        # Add to tenants and select the new tenant
+        self.history.record(f"add {tenant_id}", {tenant_id: None}, {tenant_id: new_tenant},
+                            registry=lambda: self.edits.apply(self.tenants))
+        self.edits.set_tenant(self.tenants, tenant_id, new_tenant)
+        self.tenant_list.add(tenant_id, tenant_name)
+        self.tenant_list.select(tenant_id)
         
-        self.unsaved_changes = True
-        self.status_var.set(f"Added tenant: {tenant_id}")
+        self.status_var.set(f"Added tenant: {tenant_id} (unsaved)")
     
     def _delete_tenant(self):
         """Delete the currently selected tenant."""
@@ -359,17 +811,85 @@ class ClosepayManagerApp(tk.Tk):
             return
         
         # Delete tenant
-        del self.tenants[self.current_tenant_id]
+        self.history.record(f"delete {self.current_tenant_id}",
+                            {self.current_tenant_id: self.edits.get(self.tenants, self.current_tenant_id)},
+                            {self.current_tenant_id: None}, registry=lambda: self.edits.apply(self.tenants))
+        self.edits.delete(self.tenants, self.current_tenant_id)
+        self.tenant_list.remove(self.current_tenant_id)
         self.current_tenant_id = None
-        self.tenant_detail.clear()
-        self.plugin_matrix.set_enabled_features([])
+        self._loading_tenant = True
+        try:
+            self.tenant_detail.clear()
+            self.plugin_matrix.set_enabled_features([])
+        finally:
+            self._loading_tenant = False
+        self._schedule_preview(0)
         
-        self._refresh_tenant_list()
-        self.unsaved_changes = True
-        self.status_var.set("Tenant deleted")
+        self.status_var.set("Tenant deleted (unsaved)")
+    
+    def _bulk_edit(self):
+        """Change plugins, role or theme of all multi-selected tenants, validated together and saved once."""
+        tenant_ids = [tenant_id for tenant_id in self.tenant_list.get_selection()
+                      if self.edits.exists(self.tenants, tenant_id)]
+        if not tenant_ids:
+            messagebox.showwarning("No Selection", "Select tenants first (Ctrl+click, Shift+click or Ctrl+A)")
+            return
+        
+        dialog = BulkEditDialog(self, self.plugins, len(tenant_ids))
+        self.wait_window(dialog)
+        if dialog.result is None:
+            return
+        
+        # Apply in memory and validate all changed tenants before recording anything
+        before = {}
+        after = {}
+        for tenant_id in tenant_ids:
+            current = self.edits.get(self.tenants, tenant_id)
+            edited = apply_bulk_edit(current, dialog.result)
+            if edited != current:
+                before[tenant_id] = current
+                after[tenant_id] = edited
+        if not after:
+            self.status_var.set(f"Bulk edit changed none of the {len(tenant_ids)} selected tenant(s)")
+            return
+        
+        errors = collect_tenant_errors(after, self.plugins)
+        if errors:
+            self.validation_panel.set_problems(errors)
+            messagebox.showerror(
+                "Validation Error",
+                f"The bulk edit would make {len(errors)} tenant(s) invalid, so nothing was changed:\n\n"
+                + "\n".join(message for _, message in errors[:10])
+                + ("\n..." if len(errors) > 10 else "")
+            )
+            return
+        
+        self.history.record(f"bulk edit {len(after)} tenant(s)", before, after,
+                            registry=lambda: self.edits.apply(self.tenants))
+        for tenant_id, tenant in after.items():
+            self.edits.set_tenant(self.tenants, tenant_id, tenant)
+        if self.current_tenant_id in after:
+            self._show_tenant(after[self.current_tenant_id])
+            self._schedule_preview(0)
+        
+        summary = "\n".join(summarize_bulk_edit(before, after))
+        unchanged = len(tenant_ids) - len(after)
+        if unchanged:
+            summary += f"\n({unchanged} selected tenant(s) already matched)"
+        if messagebox.askyesno(
+            "Bulk Edit",
+            f"Changed {len(after)} tenant(s):\n{summary}\n\n"
+            f"Save now? This saves all {len(self.edits)} tenant(s) with unsaved changes in one write."
+        ):
+            self._save_changes()
+        else:
+            self.status_var.set(f"Bulk edit changed {len(after)} tenant(s) (unsaved, Ctrl+Z to undo)")
     
     def _generate_repo(self):
         """Generate app repository for current tenant."""
+        if self.generation:
+            return
+        
         if not self.current_tenant_id:
             messagebox.showwarning("No Selection", "Please select a tenant to generate repository")
             return
@@ -421,12 +941,11 @@ class ClosepayManagerApp(tk.Tk):
             output_path = output_dir
         
         # Check if repo already exists
-        from repo_generator import get_repo_root
-        repo_root = get_repo_root()
+        apps_dir = get_repo_context().apps_dir
         if output_path:
             target_path = os.path.join(output_path, folder_name)
         else:
-            target_path = os.path.join(repo_root, 'apps', folder_name) if repo_root else None
+            target_path = os.path.join(apps_dir, folder_name) if apps_dir else None
         
         overwrite = False
         if target_path and os.path.exists(target_path):
@@ -440,46 +959,215 @@ class ClosepayManagerApp(tk.Tk):
                 return
             overwrite = True
         
-        # Save current tenant first to ensure we have latest data
-        if self.current_tenant_id:
-            if not self._save_current_tenant():
-                return
-        
-        # Get tenant data
-        tenant = self.tenants[self.current_tenant_id]
+        # Generate from the tenant as edited (saved or not), if it is valid
+        if not self._validate_tenant(self.current_tenant_id):
+            return
+        tenant = self.edits.get(self.tenants, self.current_tenant_id)
         
         # Determine template variant (prefer member-base for member role/variant)
         home_variant = tenant.get('homeVariant', 'member')
         role = tenant.get('role', 'member')
         template_variant = 'member' if (role == 'member' or home_variant == 'member') else 'merchant'
         
-        # Generate repository
-        success, message = generate_repo(
-            self.current_tenant_id, 
-            tenant, 
-            overwrite=overwrite, 
-            app_folder_name=folder_name,
-            output_path=output_path,
-            template_variant=template_variant
+        # Generate repository on a worker thread; the window stays responsive and
+        # _poll_generation reports progress back from the Tk thread
+        # The worker gets its own copy, so edits made meanwhile don't race with it
+        tenant_id = self.current_tenant_id
+        tenant = copy.deepcopy(tenant)
+        progress = GenerationProgress()
+        generation = {
+            'progress': progress,
+            'result': None,
+            'profiler': self._start_profile('generate'),
+        }
+        
+        def run():
+            use_profiler(generation['profiler'])
+            try:
+                generation['result'] = generate_repo(
+                    tenant_id, 
+                    tenant, 
+                    overwrite=overwrite, 
+                    app_folder_name=folder_name,
+                    output_path=output_path,
+                    template_variant=template_variant,
+                    progress=progress
+                )
+            except Exception as e:
+                generation['result'] = (False, f"Error generating repository: {str(e)}")
+        
+        generation['dialog'] = GenerationProgressDialog(
+            self, f"Generating {folder_name}", on_cancel=progress.cancel
         )
+        generation['thread'] = threading.Thread(target=run, name='generate-repo', daemon=True)
+        self.generation = generation
+        self.generate_button.configure(state=tk.DISABLED)
+        self.status_var.set(f"Generating {folder_name}...")
+        generation['thread'].start()
+        self.after(WORKER_POLL_MS, self._poll_generation)
+    
+    def _poll_generation(self):
+        """Show the running generation's progress, and its result once the worker is done."""
+        generation = self.generation
+        if not generation:
+            return
+        
+        generation['dialog'].update_progress(generation['progress'].snapshot())
+        if generation['thread'].is_alive():
+            self.after(WORKER_POLL_MS, self._poll_generation)
+            return
+        
+        self.generation = None
+        generation['dialog'].destroy()
+        self.generate_button.configure(state=tk.NORMAL)
+        if generation['profiler']:
+            self._stop_profile('generate', generation['profiler'])
         
+        if self._close_after_generation:
+            self._close_after_generation = False
+            self._on_closing()
+            return
+        
+        success, message = generation['result']
         if success:
             self.status_var.set(message)
             messagebox.showinfo("Success", f"{message}")
+        elif generation['progress'].cancelled:
+            self.status_var.set(message)
         else:
             self.status_var.set(f"Error: {message}")
             messagebox.showerror("Generation Error", message)
     
+    def _generate_selected(self):
+        """Queue generation of every multi-selected tenant into apps/<tenant ID> and show the dashboard."""
+        from generation_queue import GenerationQueue
+        
+        # Template apps (member-base, merchant-base) are what the others are generated from
+        context = get_repo_context()
+        templates = {context.get_template_path(variant) for variant in ('member', 'merchant')}
+        tenant_ids = [tenant_id for tenant_id in self.tenant_list.get_selection()
+                      if tenant_id != 'DEFAULT' and self.edits.exists(self.tenants, tenant_id)
+                      and context.app_dir(tenant_id) not in templates]
+        if not tenant_ids:
+            messagebox.showwarning("No Selection", "Select the tenants to generate (Ctrl+click, Shift+click or Ctrl+A)")
+            return
+        
+        # Generate the tenants as edited (saved or not), if they are all valid
+        tenants = {tenant_id: self.edits.get(self.tenants, tenant_id) for tenant_id in tenant_ids}
+        errors = collect_tenant_errors(tenants, self.plugins)
+        if errors:
+            self.validation_panel.set_problems(errors)
+            messagebox.showerror("Validation Error", f"{len(errors)} selected tenant(s) are invalid; nothing was queued")
+            return
+        
+        existing = [tenant_id for tenant_id in tenant_ids if context.apps_dir and (context.apps_dir / tenant_id).exists()]
+        overwrite = False
+        if existing:
+            response = messagebox.askyesnocancel(
+                "Repositories Exist",
+                f"{len(existing)} of {len(tenant_ids)} app folder(s) already exist "
+                f"({', '.join(existing[:5])}{', ...' if len(existing) > 5 else ''}).\n\n"
+                "Yes: overwrite them\nNo: skip them\nCancel: queue nothing",
+                icon="warning"
+            )
+            if response is None:
+                return
+            overwrite = response
+            if not overwrite:
+                tenant_ids = [tenant_id for tenant_id in tenant_ids if tenant_id not in existing]
+                if not tenant_ids:
+                    return
+        
+        if self.generation_queue is None:
+            self.generation_queue = GenerationQueue()
+        for tenant_id in tenant_ids:
+            # Workers get their own copy of the tenant (pickled), so later edits don't affect the job
+            self.generation_queue.enqueue(tenant_id, tenant=tenants[tenant_id], overwrite=overwrite)
+        self._show_queue_window()
+        self.status_var.set(f"Queued {len(tenant_ids)} generation job(s)")
+        self._start_queue_polling()
+    
+    def _show_queue_window(self):
+        if self.queue_window is None:
+            self.queue_window = GenerationQueueWindow(
+                self, self.generation_queue.workers,
+                on_workers_change=self._set_queue_workers,
+                on_retry=self._retry_failed_generations,
+                on_cancel=self.generation_queue.cancel_all,
+                on_clear=self._clear_finished_generations
+            )
+        else:
+            self.queue_window.deiconify()
+            self.queue_window.lift()
+    
+    def _set_queue_workers(self, workers: int):
+        self.generation_queue.workers = workers
+        self.status_var.set(f"Generation queue: {workers} parallel job(s) from the next batch")
+    
+    def _retry_failed_generations(self):
+        retried = self.generation_queue.retry_failed()
+        self.status_var.set(f"Retrying {retried} generation job(s)")
+        if retried:
+            self._start_queue_polling()
+    
+    def _clear_finished_generations(self):
+        self.generation_queue.clear_finished()
+        self.queue_window.update_jobs(self.generation_queue.jobs, self.generation_queue.totals())
+    
+    def _start_queue_polling(self):
+        if self._queue_poll_job is None:
+            self._queue_poll_job = self.after(WORKER_POLL_MS, self._poll_queue)
+    
+    def _poll_queue(self):
+        """Show queue progress until no job is queued or running."""
+        self._queue_poll_job = None
+        generation_queue = self.generation_queue
+        generation_queue.poll()
+        self.queue_window.update_jobs(generation_queue.jobs, generation_queue.totals())
+        if generation_queue.active:
+            self._start_queue_polling()
+            return
+        
+        counts = generation_queue.totals()['counts']
+        self.status_var.set(
+            f"Generation queue finished: {counts['done']} done, {counts['failed']} failed, "
+            f"{counts['cancelled']} cancelled"
+        )
+    
     def _on_closing(self):
         """Handle window close event."""
-        if self.unsaved_changes:
+        if self.generation:
+            response = messagebox.askyesno(
+                "Generation Running",
+                "A repository is still being generated. Cancel it and exit?",
+                icon="warning"
+            )
+            if not response:
+                return
+            # Close once the worker has stopped and removed the partial app folder
+            self._close_after_generation = True
+            self.generation['dialog'].cancel()
+            return
+        
+        if self.edits:
             response = messagebox.askyesno(
                 "Unsaved Changes",
-                "You have unsaved changes. Exit anyway?",
+                f"You have unsaved changes in {len(self.edits)} tenant(s). Exit anyway?",
+                icon="warning"
+            )
+            if not response:
+                return
+        
+        if self.generation_queue and self.generation_queue.active:
+            response = messagebox.askyesno(
+                "Generation Running",
+                "Queued repositories are still being generated. Cancel them and exit?",
                 icon="warning"
             )
             if not response:
                 return
+            # Waits for running jobs to stop and remove their partial app folders
+            self.generation_queue.shutdown()
         
         self.destroy()
 
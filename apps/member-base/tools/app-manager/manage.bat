@@ -16,6 +16,7 @@ if "%~1"=="" (
     echo   manage.bat list
     echo   manage.bat status
     echo   manage.bat sync {tenant_id}
+    echo   manage.bat watch
     echo.
     echo Examples:
     echo   manage.bat generate member-base --output D:\MyApps
@@ -0,0 +1,208 @@
+"""
+Profiler Module
+Opt-in wall/CPU timing per phase of a command, written as a JSON report (and optionally a .prof file)
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# Reports are written under the tool's cache directory by default
+PROFILE_DIR = Path('.cache') / 'profiles'
+
+
+class _NullPhase:
+    """Phase used while profiling is off (does nothing)."""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """Times one run of a phase and adds it to the profiler totals."""
+    
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+    
+    def __enter__(self):
+        stack = self.profiler._stack()
+        stack.append(self.name)
+        self.path = '/'.join(stack)
+        self.wall_start = time.perf_counter()
+        # Per-thread CPU time, so phases running in worker threads are not double counted
+        self.cpu_start = time.thread_time()
+        return self
+    
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.thread_time() - self.cpu_start
+        self.profiler._stack().pop()
+        self.profiler._record(self.path, wall, cpu)
+        return False
+
+
+class Profiler:
+    """
+    Collects per-phase timings for one command at a time.
+    
+    Phases nest per thread ("generate/copy ios") and repeated phases are
+    aggregated by path (calls, total wall time, total CPU time).
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.command = ''
+        self._phases: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._cprofile = None
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+    
+    def _stack(self) -> List[str]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    def _record(self, path: str, wall: float, cpu: float):
+        with self._lock:
+            totals = self._phases.setdefault(path, {'calls': 0, 'wall': 0.0, 'cpu': 0.0})
+            totals['calls'] += 1
+            totals['wall'] += wall
+            totals['cpu'] += cpu
+    
+    def phase(self, name: str):
+        """Context manager timing a named phase (no-op while profiling is off)."""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+    
+    def start(self, command: str, cprofile: bool = False):
+        """
+        Start profiling a command.
+        
+        Args:
+            command: Command name stored in the report
+            cprofile: Also run cProfile and write a .prof file next to the report
+        """
+        self.command = command
+        self._phases = {}
+        self._local = threading.local()
+        self._cprofile = None
+        if cprofile:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self.enabled = True
+    
+    def stop(self, report_file: Path) -> Dict:
+        """
+        Stop profiling and write the JSON report (and .prof file if cProfile was on).
+        
+        Returns:
+            The report dict, including 'report_file' and 'prof_file' paths
+        """
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+        self.enabled = False
+        
+        report = {
+            'command': self.command,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'total': {'wall_s': round(wall, 6), 'cpu_s': round(cpu, 6)},
+            'phases': [
+                {
+                    'name': path,
+                    'calls': totals['calls'],
+                    'wall_s': round(totals['wall'], 6),
+                    'cpu_s': round(totals['cpu'], 6),
+                }
+                for path, totals in self._phases.items()
+            ],
+            'report_file': str(report_file),
+            'prof_file': None,
+        }
+        
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            prof_file = report_file.with_suffix('.prof')
+            self._cprofile.dump_stats(str(prof_file))
+            report['prof_file'] = str(prof_file)
+            self._cprofile = None
+        
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return report
+
+
+_profiler = Profiler()
+
+# Profiler phase() reports to on each thread that set one with use_profiler()
+_thread_profilers = threading.local()
+
+
+def get_profiler() -> Profiler:
+    """Get the process-wide profiler (used by the CLI, whose worker threads all belong to one command)."""
+    return _profiler
+
+
+def use_profiler(profiler: Optional[Profiler]):
+    """
+    Make phase() calls on the current thread report to profiler.
+    
+    Lets actions that overlap in one process (e.g. a GUI save while a
+    generation runs on a worker thread) each keep their own report.
+    None goes back to the process-wide profiler.
+    """
+    _thread_profilers.current = profiler
+
+
+def phase(name: str):
+    """Time a named phase of the current command (no-op unless profiling is on)."""
+    return (getattr(_thread_profilers, 'current', None) or _profiler).phase(name)
+
+
+def default_report_file(tool_dir: Path, command: str) -> Path:
+    """Report path for a command: .cache/profiles/<command>-<timestamp>-<ms>-<pid>.json (never an existing file)."""
+    safe_command = ''.join(c if c.isalnum() or c in '-_' else '-' for c in command) or 'command'
+    now = time.time()
+    stamp = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1000) % 1000:03d}-{os.getpid()}"
+    report_file = tool_dir / PROFILE_DIR / f"{safe_command}-{stamp}.json"
+    counter = 1
+    while report_file.exists():
+        counter += 1
+        report_file = tool_dir / PROFILE_DIR / f"{safe_command}-{stamp}-{counter}.json"
+    return report_file
+
+
+def format_report(report: Dict, limit: int = 20) -> str:
+    """Format the slowest phases of a report as a table."""
+    lines = [
+        f"Profile of '{report['command']}': {report['total']['wall_s']:.3f}s wall, "
+        f"{report['total']['cpu_s']:.3f}s CPU",
+        f"  {'wall':>9} {'cpu':>9} {'calls':>6}  phase",
+    ]
+    phases = sorted(report['phases'], key=lambda p: p['wall_s'], reverse=True)
+    for entry in phases[:limit]:
+        lines.append(f"  {entry['wall_s']:>8.3f}s {entry['cpu_s']:>8.3f}s {entry['calls']:>6}  {entry['name']}")
+    if len(phases) > limit:
+        lines.append(f"  ... {len(phases) - limit} more phase(s) in the report")
+    lines.append(f"  Report: {report['report_file']}")
+    if report.get('prof_file'):
+        lines.append(f"  cProfile: {report['prof_file']} (view with: python -m pstats {report['prof_file']})")
+    return '\n'.join(lines)
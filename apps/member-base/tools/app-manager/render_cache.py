@@ -0,0 +1,123 @@
+"""
+Render Cache Module
+Persistent cache of rendered app.config.ts hashes used by drift detection
+"""
+
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from repo_generator import generate_config_from_tenant
+
+
+CACHE_DIR_NAME = ".cache"
+CACHE_FILE_NAME = "render_cache.json"
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def tenant_fingerprint(tenant_id: str, tenant: Dict) -> str:
+    """Stable hash of a tenant's configuration."""
+    canonical = json.dumps({tenant_id: tenant}, sort_keys=True, ensure_ascii=False)
+    return _sha256(canonical.encode('utf-8'))
+
+
+class RenderCache:
+    """
+    Cache of expected and on-disk config hashes.
+    
+    Expected hashes are keyed by tenant fingerprint plus a hash of the
+    generator source, so editing repo_generator.py invalidates them.
+    On-disk hashes are keyed by file mtime and size.
+    """
+    
+    def __init__(self, tool_dir: Path):
+        self.cache_file = tool_dir / CACHE_DIR_NAME / CACHE_FILE_NAME
+        self._generator_hash = self._hash_file_contents(tool_dir / 'repo_generator.py')
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._data = self._load()
+    
+    @staticmethod
+    def _hash_file_contents(path: Path) -> str:
+        try:
+            with open(path, 'rb') as f:
+                return _sha256(f.read())
+        except OSError:
+            return ''
+    
+    def _load(self) -> Dict:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('generator') == self._generator_hash:
+                return data
+        except (OSError, json.JSONDecodeError):
+            pass
+        return {'generator': self._generator_hash, 'expected': {}, 'files': {}}
+    
+    def expected_hash(self, tenant_id: str, tenant: Dict) -> str:
+        """Hash of the app.config.ts that generate_config_from_tenant would produce."""
+        fingerprint = tenant_fingerprint(tenant_id, tenant)
+        with self._lock:
+            cached = self._data['expected'].get(tenant_id)
+            if cached and cached['key'] == fingerprint:
+                return cached['hash']
+        
+        rendered = generate_config_from_tenant(tenant, tenant_id)
+        digest = _sha256(rendered.encode('utf-8'))
+        with self._lock:
+            self._data['expected'][tenant_id] = {'key': fingerprint, 'hash': digest}
+            self._dirty = True
+        return digest
+    
+    def file_hash(self, path: Path) -> Optional[str]:
+        """Hash of a file on disk (None if missing)."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        
+        key = f"{stat.st_mtime_ns}:{stat.st_size}"
+        path_key = str(path)
+        with self._lock:
+            cached = self._data['files'].get(path_key)
+            if cached and cached['key'] == key:
+                return cached['hash']
+        
+        try:
+            with open(path, 'rb') as f:
+                # Configs are written in text mode, so ignore Windows line endings
+                digest = _sha256(f.read().replace(b'\r\n', b'\n'))
+        except OSError:
+            return None
+        with self._lock:
+            self._data['files'][path_key] = {'key': key, 'hash': digest}
+            self._dirty = True
+        return digest
+    
+    def save(self):
+        """Write the cache to disk if anything changed (replaced atomically, errors are ignored)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            temp_path = f"{self.cache_file}.tmp"
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._data, f)
+                os.replace(temp_path, self.cache_file)
+                self._dirty = False
+            except OSError:
+                pass
+            finally:
+                if os.path.exists(temp_path):
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
@@ -0,0 +1,189 @@
+"""
+Repo Context Module
+Resolve the repository layout once and share it between all app manager modules
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# Written into generated standalone copies of the tool to describe their layout
+CONTEXT_FILE = "repo_context.json"
+
+# Template apps that are not listed as generated apps
+TEMPLATE_APP_NAMES = ['merchant-base']
+
+
+class RepoContext:
+    """
+    Resolved repository layout.
+    
+    Layouts:
+        monorepo:   repo_root/tools/<tool>/ with repo_root/apps and repo_root/packages
+        standalone: repo_root/apps/<app>/tools/app-manager/ (copied by generate_repo)
+    
+    Paths are resolved once on construction. Directory listings are cached
+    and invalidated when the directory mtime changes.
+    """
+    
+    def __init__(self, tool_dir: Optional[Path] = None):
+        self.tool_dir = Path(tool_dir or Path(__file__).parent).resolve()
+        self.tenants_file = self.tool_dir / 'tenants.json'
+        self.plugins_file = self.tool_dir / 'plugins.json'
+        
+        # tenant_id -> app folder name (standalone copies generated with --folder)
+        self.app_folders: Dict[str, str] = {}
+        self.standalone = False
+        self.repo_root: Optional[Path] = None
+        self.apps_dir: Optional[Path] = None
+        # App folder the tool itself lives in, when that app is not a generated app
+        self.host_app: Optional[str] = None
+        
+        self._template_paths: Dict[str, Optional[Path]] = {}
+        self._listing_cache: Dict[Path, Tuple[int, List[str]]] = {}
+        self._lock = threading.Lock()
+        
+        if not self._load_context_file():
+            self._probe_layout()
+    
+    def _load_context_file(self) -> bool:
+        """Load layout from repo_context.json (generated standalone copies)."""
+        context_file = self.tool_dir / CONTEXT_FILE
+        if not context_file.exists():
+            return False
+        
+        try:
+            with open(context_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+        
+        if data.get('layout') != 'standalone':
+            return False
+        
+        # Layout: repo_root/apps/<app>/tools/app-manager
+        app_root = self.tool_dir.parent.parent
+        self.standalone = True
+        self.apps_dir = app_root.parent
+        self.repo_root = self.apps_dir.parent
+        self.app_folders = dict(data.get('apps', {}))
+        return True
+    
+    def _probe_layout(self):
+        """Resolve layout from the tool location (same rules as the old get_repo_root)."""
+        current = self.tool_dir
+        
+        # Standalone app repo: app_root/tools/app-manager/
+        if current.name == 'app-manager' and current.parent.name == 'tools':
+            app_root = current.parent.parent
+            if (app_root / 'src').exists() or (app_root / 'config').exists():
+                self.standalone = True
+                self.apps_dir = app_root.parent
+                self.repo_root = self.apps_dir.parent
+                self.app_folders = {}
+                # Without repo_context.json this is a template's own copy of the tool
+                self.host_app = app_root.name
+                return
+        
+        # Monorepo: repo_root/tools/closepay-core-manager/ (or one level deeper)
+        for candidate in [current.parent.parent, current.parent.parent.parent]:
+            if (candidate / 'apps').exists() and (candidate / 'packages').exists():
+                self.repo_root = candidate
+                self.apps_dir = candidate / 'apps'
+                return
+    
+    @property
+    def core_dir(self) -> Optional[Path]:
+        """Path to packages/core."""
+        return self.repo_root / 'packages' / 'core' if self.repo_root else None
+    
+    @property
+    def plugins_dir(self) -> Optional[Path]:
+        """Path to packages/plugins."""
+        return self.repo_root / 'packages' / 'plugins' if self.repo_root else None
+    
+    def get_template_path(self, variant: str = 'member') -> Optional[Path]:
+        """
+        Get the path to the template for a variant.
+        
+        For standalone apps, return None (no template needed).
+        """
+        if self.standalone or not self.apps_dir:
+            return None
+        
+        if variant not in self._template_paths:
+            # Try member-base first for member variant, merchant-base as fallback
+            candidates = ['member-base', 'merchant-base'] if variant == 'member' else ['merchant-base']
+            self._template_paths[variant] = next(
+                (self.apps_dir / name for name in candidates if (self.apps_dir / name).exists()),
+                None
+            )
+        return self._template_paths[variant]
+    
+    def list_subdirs(self, path: Path) -> List[str]:
+        """List subdirectory names of path (cached until the directory mtime changes)."""
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return []
+        
+        with self._lock:
+            cached = self._listing_cache.get(path)
+            if cached and cached[0] == mtime:
+                return list(cached[1])
+        
+        names = sorted(item.name for item in path.iterdir() if item.is_dir())
+        with self._lock:
+            self._listing_cache[path] = (mtime, names)
+        return list(names)
+    
+    def app_dir(self, tenant_id: str) -> Optional[Path]:
+        """Get the app directory of a tenant."""
+        if not self.apps_dir:
+            return None
+        return self.apps_dir / self.app_folders.get(tenant_id, tenant_id)
+    
+    def list_generated_apps(self) -> List[str]:
+        """List generated apps by tenant ID (excluding templates and the tool's host app)."""
+        if not self.apps_dir:
+            return []
+        
+        folder_to_tenant = {folder: tenant_id for tenant_id, folder in self.app_folders.items()}
+        apps = [
+            folder_to_tenant.get(name, name)
+            for name in self.list_subdirs(self.apps_dir)
+            if name not in TEMPLATE_APP_NAMES and name != self.host_app
+        ]
+        return sorted(apps)
+    
+    def write_standalone_context(self, tools_target: Path, tenant_id: str, folder_name: str):
+        """Describe the layout of a generated standalone copy of the tool."""
+        data = {
+            "layout": "standalone",
+            "apps": {tenant_id: folder_name},
+        }
+        with open(tools_target / CONTEXT_FILE, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+_context: Optional[RepoContext] = None
+_context_lock = threading.Lock()
+
+
+def get_repo_context() -> RepoContext:
+    """Get the shared RepoContext of this tool (resolved on first use)."""
+    global _context
+    if _context is None:
+        with _context_lock:
+            if _context is None:
+                _context = RepoContext()
+    return _context
+
+
+def set_repo_context(context: RepoContext):
+    """Replace the shared RepoContext (e.g. to point the tool at another repository)."""
+    global _context
+    with _context_lock:
+        _context = context
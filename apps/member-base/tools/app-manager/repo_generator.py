@@ -4,38 +4,128 @@ Generate new app repository from template based on tenant configuration
 """
 
 import os
+import time
 import shutil
+import hashlib
 import json
-from typing import Dict, Optional, Tuple
+import threading
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from repo_context import get_repo_context
+from profiler import phase
 
-def get_repo_root() -> Optional[Path]:
-    """Find the repository root directory (contains apps/, packages/, etc.)."""
-    current = Path(__file__).resolve()
-    
-    # If we're in a standalone app repo (tools/app-manager/), go up to app root
-    # Expected structure: app_root/tools/app-manager/repo_generator.py
-    if current.parent.name == 'app-manager' and current.parent.parent.name == 'tools':
-        app_root = current.parent.parent.parent
-        # Check if this looks like an app directory (has src/, config/, etc.)
-        if (app_root / 'src').exists() or (app_root / 'config').exists():
-            return app_root
-    
-    # Original logic: Go up from tools/closepay-core-manager/ to repo root
-    # Expected structure: repo_root/tools/closepay-core-manager/repo_generator.py
-    repo_root = current.parent.parent.parent
+
+# Per-app generated plugin registry consumed by packages/core/config/plugins/pluginLoader.ts
+PLUGIN_REGISTRY_FILE = 'plugins.generated.ts'
+
+# What standalone generation leaves out of each copied tree
+CORE_IGNORE = shutil.ignore_patterns(
+    '__pycache__', '*.pyc', '.git', 'node_modules', '*.test.ts', '*.test.tsx', '__tests__'
+)
+PLUGIN_IGNORE = shutil.ignore_patterns('__pycache__', '*.pyc', '.git', 'node_modules', '__tests__')
+ANDROID_IGNORE = shutil.ignore_patterns('build', '.gradle', 'node_modules', '*.iml', 'local.properties')
+IOS_IGNORE = shutil.ignore_patterns('Pods', 'build', 'DerivedData', 'node_modules', '.xcode.env.local')
+
+
+class GenerationCancelled(BaseException):
+    """
+    Raised inside generate_repo when its GenerationProgress was cancelled.
     
-    # Verify it's the repo root by checking for apps/ and packages/ directories
-    if (repo_root / 'apps').exists() and (repo_root / 'packages').exists():
-        return repo_root
+    Derives from BaseException so the per-step `except Exception` handlers
+    (which only log a warning and carry on) do not swallow it.
+    """
+
+
+class GenerationProgress:
+    """
+    Progress and cancellation for one generate_repo call.
     
-    # Try one more level up (in case we're in a subdirectory)
-    repo_root = repo_root.parent
-    if (repo_root / 'apps').exists() and (repo_root / 'packages').exists():
-        return repo_root
+    generate_repo updates it from the thread it runs on; another thread (the
+    GUI) may read snapshot() and call cancel() at any time. Cancellation is
+    checked between phases and before every copied file, so a cancelled run
+    never leaves a half-written file behind.
+    """
     
-    return None
+    def __init__(self, cancel_event=None):
+        """
+        Args:
+            cancel_event: Event to cancel through (defaults to a new threading.Event;
+                          a multiprocessing.Event lets another process cancel)
+        """
+        self.phase = ''
+        self.files = 0
+        self.total_files = 0
+        self.bytes = 0
+        self.started = time.monotonic()
+        self._cancelled = cancel_event if cancel_event is not None else threading.Event()
+    
+    def cancel(self):
+        """Ask the running generation to stop at the next file."""
+        self._cancelled.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+    
+    def check(self):
+        """
+        Raises:
+            GenerationCancelled: If cancel() was called
+        """
+        if self._cancelled.is_set():
+            raise GenerationCancelled()
+    
+    def set_phase(self, name: str):
+        self.check()
+        self.phase = name
+    
+    def copy_file(self, src, dst, *, follow_symlinks: bool = True):
+        """shutil.copy2 that counts files and bytes (usable as a copytree copy_function)."""
+        self.check()
+        result = shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+        self.files += 1
+        try:
+            self.bytes += os.path.getsize(result)
+        except OSError:
+            pass
+        return result
+    
+    def snapshot(self) -> Dict:
+        """Current phase, counters, elapsed seconds and throughput in bytes per second."""
+        elapsed = time.monotonic() - self.started
+        return {
+            'phase': self.phase,
+            'files': self.files,
+            'total_files': max(self.total_files, self.files),
+            'bytes': self.bytes,
+            'elapsed': elapsed,
+            'bytes_per_second': self.bytes / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+def _phase(progress: Optional[GenerationProgress], name: str):
+    """Profiler phase that is also reported to progress (stopping there if cancelled)."""
+    if progress:
+        progress.set_phase(name)
+    return phase(name)
+
+
+def _count_files(source: Path, ignore=None) -> int:
+    """Number of files copytree(source, ..., ignore=ignore) would copy."""
+    count = 0
+    for root, dirs, files in os.walk(source):
+        if ignore:
+            ignored = ignore(root, dirs + files)
+            dirs[:] = [name for name in dirs if name not in ignored]
+            files = [name for name in files if name not in ignored]
+        count += len(files)
+    return count
+
+
+def get_repo_root() -> Optional[Path]:
+    """Find the repository root directory (contains apps/, packages/, etc.)."""
+    return get_repo_context().repo_root
 
 
 def get_template_path(variant: str = 'member') -> Optional[Path]:
@@ -44,160 +134,82 @@ def get_template_path(variant: str = 'member') -> Optional[Path]:
     
     For standalone apps, return None (no template needed).
     """
-    current = Path(__file__).resolve()
-    
-    # If we're in a standalone app, no template needed
-    if current.parent.name == 'app-manager' and current.parent.parent.name == 'tools':
-        return None
-    
-    # Original logic for main repo
-    repo_root = get_repo_root()
-    if not repo_root:
-        return None
-    
-    # Try member-base first (default), then merchant-base as fallback
-    if variant == 'member':
-        template_path = repo_root / 'apps' / 'member-base'
-        if template_path.exists():
-            return template_path
-        
-        # Fallback to merchant-base if member-base doesn't exist
-        template_path = repo_root / 'apps' / 'merchant-base'
-        if template_path.exists():
-            return template_path
-    else:
-        # For merchant variant, use merchant-base
-        template_path = repo_root / 'apps' / 'merchant-base'
-        if template_path.exists():
-            return template_path
-    
-    return None
-    
-    # Try member-base first (default), then merchant-base as fallback
-    if variant == 'member':
-        template_path = repo_root / 'apps' / 'member-base'
-        if template_path.exists():
-            return template_path
-        
-        # Fallback to merchant-base if member-base doesn't exist
-        template_path = repo_root / 'apps' / 'merchant-base'
-        if template_path.exists():
-            return template_path
-    else:
-        # For merchant variant, use merchant-base
-        template_path = repo_root / 'apps' / 'merchant-base'
-        if template_path.exists():
-            return template_path
-    
-    return None
+    return get_repo_context().get_template_path(variant)
 
 
-def generate_config_from_tenant(tenant: Dict, tenant_id: str) -> str:
-    """Generate app.config.ts content from tenant configuration."""
+# Menu items added for enabled features, in enabledFeatures order after Home
+FEATURE_MENU_MAP = {
+    'balance': {
+        'id': 'balance',
+        'label': 'Balance',
+        'icon': 'wallet',
+        'route': 'TransactionHistory',
+    },
+    'payment': {
+        'id': 'payment',
+        'label': 'Payment',
+        'icon': 'creditcard',
+        'route': 'TopUp',
+    },
+    'catalog': {
+        'id': 'catalog',
+        'label': 'Catalog',
+        'icon': 'shopping',
+        'route': 'Catalog',
+    },
+    'order': {
+        'id': 'order',
+        'label': 'Order',
+        'icon': 'list',
+        'route': 'OrderList',
+    },
+    'reporting': {
+        'id': 'reporting',
+        'label': 'Reports',
+        'icon': 'chart',
+        'route': 'Reports',
+    },
+}
+
+# Segment ID per tenant role (unknown roles get the merchant segment)
+SEGMENT_ID_MAP = {
+    'merchant': 'balance-management',
+    'member': 'member-app',
+    'pos': 'pos-system',
+}
+
+
+def _format_ts_array(items) -> str:
+    """Format strings as a TypeScript array literal."""
+    if not items:
+        return '[]'
+    items_str = ', '.join([f"'{item}'" for item in items])
+    return f'[{items_str}]'
+
+
+def _format_ts_objects(items) -> str:
+    """Format flat dicts (menu items, home tabs) as a TypeScript array of objects."""
+    if not items:
+        return '[]'
+    lines = ['[']
+    for i, item in enumerate(items):
+        lines.append('    {')
+        for key, value in item.items():
+            if isinstance(value, str):
+                lines.append(f"      {key}: '{value}',")
+            elif isinstance(value, bool):
+                lines.append(f"      {key}: {str(value).lower()},")
+            else:
+                lines.append(f"      {key}: {value},")
+        lines.append('    }' + (',' if i < len(items) - 1 else ''))
+    lines.append('  ]')
+    return '\n'.join(lines)
+
+
+def _render_config_header(tenant: Dict, tenant_id: str) -> str:
     enabled_features = tenant.get('enabledFeatures', [])
-    theme = tenant.get('theme', {})
-    home_variant = tenant.get('homeVariant', 'dashboard')
-    home_tabs = tenant.get('homeTabs', [])
-    
-    # Build menu config from enabled features
-    menu_config = []
-    menu_order = 1
-    
-    # Always add home
-    menu_config.append({
-        'id': 'home',
-        'label': 'Home',
-        'icon': 'home',
-        'route': 'Home',
-        'visible': True,
-        'order': menu_order,
-    })
-    menu_order += 1
-    
-    # Add menu items based on enabled features
-    feature_menu_map = {
-        'balance': {
-            'id': 'balance',
-            'label': 'Balance',
-            'icon': 'wallet',
-            'route': 'TransactionHistory',
-        },
-        'payment': {
-            'id': 'payment',
-            'label': 'Payment',
-            'icon': 'creditcard',
-            'route': 'TopUp',
-        },
-        'catalog': {
-            'id': 'catalog',
-            'label': 'Catalog',
-            'icon': 'shopping',
-            'route': 'Catalog',
-        },
-        'order': {
-            'id': 'order',
-            'label': 'Order',
-            'icon': 'list',
-            'route': 'OrderList',
-        },
-        'reporting': {
-            'id': 'reporting',
-            'label': 'Reports',
-            'icon': 'chart',
-            'route': 'Reports',
-        },
-    }
-    
-    for feature in enabled_features:
-        if feature in feature_menu_map:
-            menu_item = feature_menu_map[feature].copy()
-            menu_item['visible'] = True
-            menu_item['order'] = menu_order
-            menu_config.append(menu_item)
-            menu_order += 1
-    
-    # Determine segment ID from role or use default
-    role = tenant.get('role', 'merchant')
-    segment_id_map = {
-        'merchant': 'balance-management',
-        'member': 'member-app',
-        'pos': 'pos-system',
-    }
-    segment_id = segment_id_map.get(role, 'balance-management')
-    
-    # Format enabled features as TypeScript array
-    def format_ts_array(items):
-        if not items:
-            return '[]'
-        items_str = ', '.join([f"'{item}'" for item in items])
-        return f'[{items_str}]'
-    
-    # Format menu config as TypeScript array
-    def format_menu_config(menu_items):
-        if not menu_items:
-            return '[]'
-        lines = ['[']
-        for i, item in enumerate(menu_items):
-            lines.append('    {')
-            for key, value in item.items():
-                if isinstance(value, str):
-                    lines.append(f"      {key}: '{value}',")
-                elif isinstance(value, bool):
-                    lines.append(f"      {key}: {str(value).lower()},")
-                else:
-                    lines.append(f"      {key}: {value},")
-            lines.append('    }' + (',' if i < len(menu_items) - 1 else ''))
-        lines.append('  ]')
-        return '\n'.join(lines)
-    
-    # Format home tabs config
-    def format_home_tabs_config(tabs):
-        if not tabs:
-            return 'undefined'
-        return format_menu_config(tabs)
-    
-    # Build config content
-    config_content = f"""/**
+    segment_id = SEGMENT_ID_MAP.get(tenant.get('role', 'merchant'), 'balance-management')
+    return f"""/**
  * {tenant.get('name', tenant_id)} App Configuration
  * Auto-generated from tenant configuration
  */
@@ -210,24 +222,53 @@ export const appConfig: AppConfig = {{
   segmentId: '{segment_id}',
   
   // Enabled features (feature flags)
-  enabledFeatures: {format_ts_array(enabled_features)},
+  enabledFeatures: {_format_ts_array(enabled_features)},
   
   // Enabled modules/plugins
-  enabledModules: {format_ts_array(enabled_features)},
+  enabledModules: {_format_ts_array(enabled_features)},
   
   // Home variant from tenant config
-  homeVariant: '{home_variant}',
+  homeVariant: '{tenant.get('homeVariant', 'dashboard')}',
   
-  // Home tabs configuration (for member variant)
-  homeTabs: {format_home_tabs_config(home_tabs)},
+"""
+
+
+def _render_config_home_tabs(tenant: Dict, tenant_id: str) -> str:
+    home_tabs = tenant.get('homeTabs', [])
+    return f"""  // Home tabs configuration (for member variant)
+  homeTabs: {_format_ts_objects(home_tabs) if home_tabs else 'undefined'},
   
-  // Menu configuration
-  menuConfig: {format_menu_config(menu_config)},
+"""
+
+
+def _render_config_menu(tenant: Dict, tenant_id: str) -> str:
+    # Home always comes first
+    menu_config = [{
+        'id': 'home',
+        'label': 'Home',
+        'icon': 'home',
+        'route': 'Home',
+        'visible': True,
+        'order': 1,
+    }]
+    for feature in tenant.get('enabledFeatures', []):
+        if feature in FEATURE_MENU_MAP:
+            menu_item = FEATURE_MENU_MAP[feature].copy()
+            menu_item['visible'] = True
+            menu_item['order'] = len(menu_config) + 1
+            menu_config.append(menu_item)
+    return f"""  // Menu configuration
+  menuConfig: {_format_ts_objects(menu_config)},
   
   // Payment methods
   paymentMethods: ['balance', 'bank_transfer', 'virtual_account'],
   
-  // Branding
+"""
+
+
+def _render_config_branding(tenant: Dict, tenant_id: str) -> str:
+    theme = tenant.get('theme', {})
+    return f"""  // Branding
   branding: {{
     primaryColor: '{theme.get('primary', '#0066CC')}',
     primaryDark: '{theme.get('primaryDark', '#0052A3')}',
@@ -236,24 +277,257 @@ export const appConfig: AppConfig = {{
     appName: '{tenant.get('name', tenant_id)}',
   }},
   
-  // Service configuration
-  services: {{
-    api: {{
+"""
+
+
+def _render_config_services(tenant: Dict, tenant_id: str) -> str:
+    return """  // Service configuration
+  services: {
+    api: {
       baseUrl: 'https://api.stg.solusiuntuknegeri.com',
       timeout: 30000,
-    }},
-    auth: {{
+    },
+    auth: {
       useMock: __DEV__, // Use mock in development, real API in production
-    }},
-    features: {{
+    },
+    features: {
       pushNotification: true,
       analytics: true,
       crashReporting: false,
-    }},
+    },
+  },
+};
+"""
+
+
+# Sections of app.config.ts in file order: (name, tenant fields it is rendered from, renderer).
+# Every section also depends on the tenant ID; ConfigPreview re-renders a section only when these change.
+CONFIG_SECTIONS = (
+    ('header', ('name', 'role', 'enabledFeatures', 'homeVariant'), _render_config_header),
+    ('homeTabs', ('homeTabs',), _render_config_home_tabs),
+    ('menu', ('enabledFeatures',), _render_config_menu),
+    ('branding', ('name', 'theme'), _render_config_branding),
+    ('services', (), _render_config_services),
+)
+
+
+def generate_config_from_tenant(tenant: Dict, tenant_id: str) -> str:
+    """Generate app.config.ts content from tenant configuration."""
+    return ''.join(render(tenant, tenant_id) for _, _, render in CONFIG_SECTIONS)
+
+
+# Where a manifest's exports.components are looked up in the plugin directory (name, name.tsx, name/index.tsx, ...)
+COMPONENT_DIRS = ('components', 'src/components', 'screens', 'src/screens', '')
+COMPONENT_EXTENSIONS = ('.tsx', '.ts', '.jsx', '.js')
+
+
+def _resolve_module_file(path: Path) -> Optional[Path]:
+    """File Metro would resolve an extensionless import of path to (None if there is none)."""
+    if path.is_file():
+        return path
+    for extension in COMPONENT_EXTENSIONS:
+        if path.with_name(path.name + extension).is_file():
+            return path.with_name(path.name + extension)
+    for extension in COMPONENT_EXTENSIONS:
+        if (path / f'index{extension}').is_file():
+            return path / f'index{extension}'
+    return None
+
+
+def _resolve_component_file(plugin_dir: Path, manifest: Dict, component_name: str) -> Optional[Path]:
+    """
+    Source file of a component the manifest exports.
+    
+    A path the manifest gives for the name under exports.screens wins;
+    otherwise the component is looked up by name in COMPONENT_DIRS.
+    """
+    declared = (manifest.get('exports', {}).get('screens') or {}).get(component_name)
+    candidates = [plugin_dir / declared] if declared else []
+    candidates += [plugin_dir / directory / component_name for directory in COMPONENT_DIRS]
+    for candidate in candidates:
+        resolved = _resolve_module_file(candidate)
+        if resolved:
+            return resolved
+    return None
+
+
+def _module_specifier(path: Path, from_dir: Path, keep_extension: bool = False) -> str:
+    """Relative import specifier for path as seen from a file in from_dir."""
+    if not keep_extension and path.suffix in COMPONENT_EXTENSIONS:
+        path = path.with_suffix('')
+    relative = Path(os.path.relpath(path, from_dir)).as_posix()
+    return relative if relative.startswith('.') else f'./{relative}'
+
+
+def generate_plugin_registry_from_tenant(tenant: Dict, tenant_id: str,
+                                        plugins_dir: Optional[Path] = None,
+                                        app_dir: Optional[Path] = None,
+                                        repo_root: Optional[Path] = None) -> Tuple[str, List[str], List[str]]:
+    """
+    Generate plugins.generated.ts content from tenant configuration.
+    
+    Only the tenant's enabledFeatures are referenced, so Metro never sees
+    disabled plugins. Plugins without a plugin.manifest.json in plugins_dir
+    and components whose file cannot be found are left out, because a
+    static import of a missing file breaks the bundle.
+    
+    Import paths are relative to the app's config/ directory and point at
+    where packages/core and packages/plugins are in the repo the app lives
+    in (repo_root), which is not the monorepo for standalone repos.
+    
+    Args:
+        tenant: Tenant configuration dictionary
+        tenant_id: Tenant ID
+        plugins_dir: Path to packages/plugins used to read plugin manifests (defaults to the RepoContext's)
+        app_dir: App directory the file is written into (defaults to the tenant's app in the RepoContext)
+        repo_root: Root of the repo app_dir belongs to (defaults to the RepoContext's)
+        
+    Returns:
+        Tuple of (file content, list of included plugin IDs, list of warnings)
+    """
+    ctx = get_repo_context()
+    plugins_dir = plugins_dir or ctx.plugins_dir
+    repo_root = repo_root or ctx.repo_root
+    app_dir = app_dir or ctx.app_dir(tenant_id)
+    config_dir = app_dir / 'config'
+    enabled_features = tenant.get('enabledFeatures', [])
+    
+    def in_output_repo(path: Path) -> Path:
+        # The same file in the repo the app is written into (plugins are copied there at the same place)
+        try:
+            return repo_root / path.relative_to(ctx.repo_root)
+        except ValueError:
+            return path
+    
+    def to_identifier(plugin_id: str) -> str:
+        parts = plugin_id.replace('_', '-').split('-')
+        return parts[0] + ''.join(part.capitalize() for part in parts[1:]) + 'Manifest'
+    
+    warnings = []
+    if enabled_features and (not plugins_dir or not plugins_dir.exists()):
+        warnings.append(f"No packages/plugins directory, {len(enabled_features)} enabled plugin(s) left out")
+        enabled_features = []
+    
+    included = []
+    manifests = {}
+    components = {}
+    for plugin_id in enabled_features:
+        if plugin_id in included:
+            continue
+        plugin_dir = plugins_dir / plugin_id
+        manifest_file = plugin_dir / 'plugin.manifest.json'
+        if not manifest_file.exists():
+            warnings.append(f"{plugin_id}: plugin manifest not found, skipped")
+            continue
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except Exception as e:
+            warnings.append(f"{plugin_id}: could not read manifest, skipped ({str(e)})")
+            continue
+        included.append(plugin_id)
+        manifests[plugin_id] = _module_specifier(in_output_repo(manifest_file), config_dir, keep_extension=True)
+        components[plugin_id] = []
+        for component_name in manifest.get('exports', {}).get('components', []) or []:
+            component_file = _resolve_component_file(plugin_dir, manifest, component_name)
+            if component_file is None:
+                warnings.append(f"{plugin_id}: no source file for component {component_name}, skipped")
+                continue
+            components[plugin_id].append(
+                (component_name, _module_specifier(in_output_repo(component_file), config_dir))
+            )
+    
+    import_lines = []
+    manifest_lines = []
+    component_lines = []
+    for plugin_id in included:
+        identifier = to_identifier(plugin_id)
+        import_lines.append(f"import {identifier} from '{manifests[plugin_id]}';")
+        manifest_lines.append(f"    '{plugin_id}': () => Promise.resolve({identifier}),")
+        component_lines.append(f"    '{plugin_id}': {{")
+        for component_name, specifier in components[plugin_id]:
+            component_lines.append(f"      {component_name}: () => import('{specifier}'),")
+        component_lines.append('    },')
+    
+    imports = '\n'.join(import_lines)
+    manifests_block = '\n'.join(manifest_lines)
+    component_loaders = '\n'.join(component_lines)
+    types_module = _module_specifier(
+        in_output_repo(ctx.core_dir / 'config' / 'plugins' / 'types') if ctx.core_dir
+        else repo_root / 'packages' / 'core' / 'config' / 'plugins' / 'types',
+        config_dir
+    )
+    
+    content = f"""/**
+ * {tenant.get('name', tenant_id)} Plugin Registry
+ * Auto-generated from tenant configuration - do not edit by hand
+ * Only enabled plugins are imported so Metro does not bundle the rest
+ */
+
+import type {{ GeneratedPluginRegistry }} from '{types_module}';
+{imports}
+
+export const generatedPlugins: GeneratedPluginRegistry = {{
+  manifests: {{
+{manifests_block}
+  }},
+  components: {{
+{component_loaders}
   }},
 }};
 """
-    return config_content
+    return content, included, warnings
+
+
+def wire_generated_plugins(content: str) -> str:
+    """Make index.tsx pass config/plugins.generated.ts to initializePlugins (idempotent)."""
+    if 'plugins.generated' in content:
+        return content
+    
+    import_line = "import { generatedPlugins } from './config/plugins.generated';"
+    anchor = "import { initializePlugins } from '@core/config';"
+    if anchor not in content or 'await initializePlugins();' not in content:
+        return content
+    
+    content = content.replace(anchor, f"{anchor}\n{import_line}", 1)
+    content = content.replace('await initializePlugins();', 'await initializePlugins(generatedPlugins);')
+    return content
+
+
+def write_plugin_registry(app_dir: Path, tenant: Dict, tenant_id: str,
+                          plugins_dir: Optional[Path] = None,
+                          repo_root: Optional[Path] = None,
+                          progress: Optional[GenerationProgress] = None) -> Tuple[int, List[str]]:
+    """
+    Write config/plugins.generated.ts for an app and wire it into index.tsx.
+    
+    Args:
+        repo_root: Root of the repo app_dir belongs to (see generate_plugin_registry_from_tenant)
+        progress: Optional GenerationProgress the phase is reported to
+    
+    Returns:
+        Tuple of (number of plugins included in the generated registry, warnings about left out plugins/components)
+    """
+    with _phase(progress, 'write plugin registry'):
+        content, included, warnings = generate_plugin_registry_from_tenant(
+            tenant, tenant_id, plugins_dir, app_dir=app_dir, repo_root=repo_root
+        )
+        
+        config_dir = app_dir / 'config'
+        config_dir.mkdir(exist_ok=True)
+        with open(config_dir / PLUGIN_REGISTRY_FILE, 'w', encoding='utf-8') as f:
+            f.write(content)
+        
+        index_file = app_dir / 'index.tsx'
+        if index_file.exists():
+            with open(index_file, 'r', encoding='utf-8') as f:
+                index_content = f.read()
+            wired_content = wire_generated_plugins(index_content)
+            if wired_content != index_content:
+                with open(index_file, 'w', encoding='utf-8') as f:
+                    f.write(wired_content)
+    
+    return len(included), warnings
 
 
 def update_ios_config(ios_dir: Path, app_name: str, display_name: str, tenant_id: str, tenant: Optional[Dict] = None) -> None:
@@ -313,19 +587,20 @@ def update_ios_config(ios_dir: Path, app_name: str, display_name: str, tenant_id
     
     if info_plist.exists():
         try:
-            with open(info_plist, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Update CFBundleDisplayName
-            content = re.sub(
-                r'<key>CFBundleDisplayName</key>\s*<string>.*?</string>',
-                f'<key>CFBundleDisplayName</key>\n\t<string>{display_name}</string>',
-                content
-            )
-            
-            with open(info_plist, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f"      ✓ Updated Info.plist")
+            with phase('Info.plist'):
+                with open(info_plist, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                # Update CFBundleDisplayName
+                content = re.sub(
+                    r'<key>CFBundleDisplayName</key>\s*<string>.*?</string>',
+                    f'<key>CFBundleDisplayName</key>\n\t<string>{display_name}</string>',
+                    content
+                )
+                
+                with open(info_plist, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                print(f"      ✓ Updated Info.plist")
         except Exception as e:
             print(f"      ⚠ Warning: Could not update Info.plist: {str(e)}")
     
@@ -336,19 +611,20 @@ def update_ios_config(ios_dir: Path, app_name: str, display_name: str, tenant_id
     
     if app_delegate.exists():
         try:
-            with open(app_delegate, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Update module name
-            content = re.sub(
-                r'withModuleName:\s*"[^"]+"',
-                f'withModuleName: "{app_identifier}"',
-                content
-            )
-            
-            with open(app_delegate, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f"      ✓ Updated AppDelegate.swift")
+            with phase('AppDelegate.swift'):
+                with open(app_delegate, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                # Update module name
+                content = re.sub(
+                    r'withModuleName:\s*"[^"]+"',
+                    f'withModuleName: "{app_identifier}"',
+                    content
+                )
+                
+                with open(app_delegate, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                print(f"      ✓ Updated AppDelegate.swift")
         except Exception as e:
             print(f"      ⚠ Warning: Could not update AppDelegate.swift: {str(e)}")
     
@@ -356,19 +632,20 @@ def update_ios_config(ios_dir: Path, app_name: str, display_name: str, tenant_id
     podfile = ios_dir / 'Podfile'
     if podfile.exists():
         try:
-            with open(podfile, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Update target name
-            content = re.sub(
-                r"target\s+'[^']+'",
-                f"target '{app_identifier}'",
-                content
-            )
-            
-            with open(podfile, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f"      ✓ Updated Podfile")
+            with phase('Podfile'):
+                with open(podfile, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                # Update target name
+                content = re.sub(
+                    r"target\s+'[^']+'",
+                    f"target '{app_identifier}'",
+                    content
+                )
+                
+                with open(podfile, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                print(f"      ✓ Updated Podfile")
         except Exception as e:
             print(f"      ⚠ Warning: Could not update Podfile: {str(e)}")
     
@@ -376,36 +653,37 @@ def update_ios_config(ios_dir: Path, app_name: str, display_name: str, tenant_id
     pbxproj_files = list(ios_dir.glob('*.xcodeproj/project.pbxproj'))
     for pbxproj in pbxproj_files:
         try:
-            with open(pbxproj, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Replace all occurrences of MerchantClosepayV2 with app_identifier
-            content = content.replace('MerchantClosepayV2', app_identifier)
-            
-            # Update PRODUCT_BUNDLE_IDENTIFIER
-            content = re.sub(
-                r'PRODUCT_BUNDLE_IDENTIFIER\s*=\s*"[^"]+";',
-                f'PRODUCT_BUNDLE_IDENTIFIER = "{bundle_id}";',
-                content
-            )
-            
-            # Update PRODUCT_NAME
-            content = re.sub(
-                r'PRODUCT_NAME\s*=\s*[^;]+;',
-                f'PRODUCT_NAME = {app_identifier};',
-                content
-            )
-            
-            with open(pbxproj, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            # Rename .xcodeproj directory if needed
-            xcodeproj_dir = pbxproj.parent.parent
-            if xcodeproj_dir.name == 'MerchantClosepayV2.xcodeproj' or xcodeproj_dir.name == 'merchantBaseApp.xcodeproj':
-                new_xcodeproj = xcodeproj_dir.parent / f'{app_identifier}.xcodeproj'
-                xcodeproj_dir.rename(new_xcodeproj)
-            
-            print(f"      ✓ Updated project.pbxproj")
+            with phase('project.pbxproj'):
+                with open(pbxproj, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                # Replace all occurrences of MerchantClosepayV2 with app_identifier
+                content = content.replace('MerchantClosepayV2', app_identifier)
+                
+                # Update PRODUCT_BUNDLE_IDENTIFIER
+                content = re.sub(
+                    r'PRODUCT_BUNDLE_IDENTIFIER\s*=\s*"[^"]+";',
+                    f'PRODUCT_BUNDLE_IDENTIFIER = "{bundle_id}";',
+                    content
+                )
+                
+                # Update PRODUCT_NAME
+                content = re.sub(
+                    r'PRODUCT_NAME\s*=\s*[^;]+;',
+                    f'PRODUCT_NAME = {app_identifier};',
+                    content
+                )
+                
+                with open(pbxproj, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                
+                # Rename .xcodeproj directory if needed
+                xcodeproj_dir = pbxproj.parent.parent
+                if xcodeproj_dir.name == 'MerchantClosepayV2.xcodeproj' or xcodeproj_dir.name == 'merchantBaseApp.xcodeproj':
+                    new_xcodeproj = xcodeproj_dir.parent / f'{app_identifier}.xcodeproj'
+                    xcodeproj_dir.rename(new_xcodeproj)
+                
+                print(f"      ✓ Updated project.pbxproj")
         except Exception as e:
             print(f"      ⚠ Warning: Could not update project.pbxproj: {str(e)}")
     
@@ -413,16 +691,17 @@ def update_ios_config(ios_dir: Path, app_name: str, display_name: str, tenant_id
     app_json = ios_dir.parent / 'app.json'
     if app_json.exists():
         try:
-            import json
-            with open(app_json, 'r', encoding='utf-8') as f:
-                app_config = json.load(f)
-            
-            app_config['name'] = app_identifier
-            app_config['displayName'] = display_name
-            
-            with open(app_json, 'w', encoding='utf-8') as f:
-                json.dump(app_config, f, indent=2, ensure_ascii=False)
-            print(f"      ✓ Updated app.json")
+            with phase('app.json'):
+                import json
+                with open(app_json, 'r', encoding='utf-8') as f:
+                    app_config = json.load(f)
+                
+                app_config['name'] = app_identifier
+                app_config['displayName'] = display_name
+                
+                with open(app_json, 'w', encoding='utf-8') as f:
+                    json.dump(app_config, f, indent=2, ensure_ascii=False)
+                print(f"      ✓ Updated app.json")
         except Exception as e:
             print(f"      ⚠ Warning: Could not update app.json: {str(e)}")
 
@@ -490,10 +769,39 @@ def update_index_tsx(content: str, tenant_id: str, tenant_name: str) -> str:
     return '\n'.join(result_lines)
 
 
+def _count_generate_files(template_path: Path, tenant: Dict, output_dir: Optional[Path],
+                          keep_all_assets: bool) -> int:
+    """
+    Estimate how many files generate_repo will copy, for progress reporting.
+    
+    Counts the template and the app manager tools plus, for standalone
+    repos, the trees that are not there yet. Referenced-only assets are not known before scanning and are
+    left out, so the estimate can fall short.
+    """
+    sources = [(template_path, None)]
+    ctx = get_repo_context()
+    repo_root = ctx.repo_root
+    if output_dir and repo_root:
+        if not (output_dir / 'packages' / 'core').exists():
+            sources.append((ctx.core_dir, CORE_IGNORE))
+        if ctx.plugins_dir:
+            for plugin_id in tenant.get('enabledFeatures', []):
+                sources.append((ctx.plugins_dir / plugin_id, PLUGIN_IGNORE))
+        for name, ignore in [('android', ANDROID_IGNORE), ('ios', IOS_IGNORE)]:
+            if not (output_dir / name).exists():
+                sources.append((repo_root / name, ignore))
+        if keep_all_assets and not (output_dir / 'assets').exists():
+            sources.append((repo_root / 'assets', None))
+    sources.append((ctx.tool_dir, shutil.ignore_patterns('__pycache__', '*.pyc', '.git', '.gitignore', '.cache', '*.lock')))
+    return sum(_count_files(source, ignore) for source, ignore in sources if source and source.exists())
+
+
 def generate_repo(tenant_id: str, tenant: Dict, overwrite: bool = False, 
                  app_folder_name: Optional[str] = None, 
                  output_path: Optional[str] = None,
-                 template_variant: Optional[str] = None) -> Tuple[bool, str]:
+                 template_variant: Optional[str] = None,
+                 keep_all_assets: bool = False,
+                 progress: Optional[GenerationProgress] = None) -> Tuple[bool, str]:
     """
     Generate a new app repository from template.
     
@@ -503,6 +811,8 @@ def generate_repo(tenant_id: str, tenant: Dict, overwrite: bool = False,
         overwrite: Whether to overwrite existing directory
         app_folder_name: Optional folder name for app (defaults to tenant_id if not provided)
         output_path: Optional full path where to save (if not provided, uses apps/{folder_name})
+        keep_all_assets: Copy the whole assets/ tree instead of only referenced files (standalone only)
+        progress: Optional progress to report to; cancelling it stops the run and removes the app folder
         
     Returns:
         Tuple of (success: bool, message: str)
@@ -516,7 +826,8 @@ def generate_repo(tenant_id: str, tenant: Dict, overwrite: bool = False,
         else:
             template_variant = 'merchant'
     
-    template_path = get_template_path(template_variant)
+    ctx = get_repo_context()
+    template_path = ctx.get_template_path(template_variant)
     if not template_path:
         return False, f"Could not find template directory (apps/{template_variant}-base or apps/merchant-base)"
     
@@ -542,12 +853,15 @@ def generate_repo(tenant_id: str, tenant: Dict, overwrite: bool = False,
         target_path = output_dir / 'apps' / folder_name
     else:
         # Default: use apps/ folder in main repo
-        repo_root = get_repo_root()
-        if not repo_root:
+        if not ctx.apps_dir:
             return False, "Could not find repository root directory"
-        target_path = repo_root / 'apps' / folder_name
+        target_path = ctx.apps_dir / folder_name
         output_dir = None  # Not a standalone repo
     
+    # Overwriting the template would delete the files it is about to copy
+    if target_path.resolve() == template_path.resolve():
+        return False, f"Cannot generate into the template itself ({target_path})"
+    
     # Check if directory already exists
     if target_path.exists() and not overwrite:
         path_str = str(target_path)
@@ -563,46 +877,63 @@ def generate_repo(tenant_id: str, tenant: Dict, overwrite: bool = False,
         if target_path.exists() and overwrite:
             shutil.rmtree(target_path)
         
+        copy_file = progress.copy_file if progress else shutil.copy2
+        if progress:
+            progress.total_files = _count_generate_files(template_path, tenant, output_dir, keep_all_assets)
+        
         # Copy template directory
-        shutil.copytree(template_path, target_path)
+        with _phase(progress, 'copy template'):
+            shutil.copytree(template_path, target_path, copy_function=copy_file)
         
         # Update index.tsx
-        index_file = target_path / 'index.tsx'
-        if index_file.exists():
-            with open(index_file, 'r', encoding='utf-8') as f:
-                index_content = f.read()
-            
-            updated_content = update_index_tsx(index_content, tenant_id, tenant.get('name', tenant_id))
-            
-            with open(index_file, 'w', encoding='utf-8') as f:
-                f.write(updated_content)
+        with _phase(progress, 'rewrite index.tsx'):
+            index_file = target_path / 'index.tsx'
+            if index_file.exists():
+                with open(index_file, 'r', encoding='utf-8') as f:
+                    index_content = f.read()
+                
+                updated_content = update_index_tsx(index_content, tenant_id, tenant.get('name', tenant_id))
+                
+                with open(index_file, 'w', encoding='utf-8') as f:
+                    f.write(updated_content)
         
         # Generate config file
         config_dir = target_path / 'config'
         config_dir.mkdir(exist_ok=True)
         
-        config_content = generate_config_from_tenant(tenant, tenant_id)
-        config_file = config_dir / 'app.config.ts'
+        with _phase(progress, 'render app.config.ts'):
+            config_content = generate_config_from_tenant(tenant, tenant_id)
+            config_file = config_dir / 'app.config.ts'
+            
+            with open(config_file, 'w', encoding='utf-8') as f:
+                f.write(config_content)
         
-        with open(config_file, 'w', encoding='utf-8') as f:
-            f.write(config_content)
+        # Generate static plugin registry (only enabled plugins get bundled)
+        plugin_count, plugin_warnings = write_plugin_registry(
+            target_path, tenant, tenant_id, ctx.plugins_dir, repo_root=output_dir or ctx.repo_root,
+            progress=progress
+        )
+        print(f"   ✓ Generated {PLUGIN_REGISTRY_FILE} ({plugin_count} plugins)")
+        for warning in plugin_warnings:
+            print(f"      ⚠ {warning}")
         
         # Update README if exists
-        readme_file = target_path / 'README.md'
-        if readme_file.exists():
-            with open(readme_file, 'r', encoding='utf-8') as f:
-                readme_content = f.read()
-            
-            readme_content = readme_content.replace('merchant-base', tenant_id)
-            readme_content = readme_content.replace('Merchant Base', tenant.get('name', tenant_id))
-            
-            with open(readme_file, 'w', encoding='utf-8') as f:
-                f.write(readme_content)
+        with _phase(progress, 'rewrite README.md'):
+            readme_file = target_path / 'README.md'
+            if readme_file.exists():
+                with open(readme_file, 'r', encoding='utf-8') as f:
+                    readme_content = f.read()
+                
+                readme_content = readme_content.replace('merchant-base', tenant_id)
+                readme_content = readme_content.replace('Merchant Base', tenant.get('name', tenant_id))
+                
+                with open(readme_file, 'w', encoding='utf-8') as f:
+                    f.write(readme_content)
         
         # Copy all necessary root files for standalone app (only if custom output_path)
         # If output_path is custom, create standalone repo with all dependencies
         if output_path and output_dir:
-            repo_root = get_repo_root()
+            repo_root = ctx.repo_root
             if repo_root:
                 print(f"\n📦 Setting up standalone repo at: {output_dir}")
                 print(f"   App folder: {target_path}")
@@ -631,51 +962,62 @@ def generate_repo(tenant_id: str, tenant: Dict, overwrite: bool = False,
                     if src_file.exists():
                         dest_file = output_dir / config_file
                         try:
-                            # Skip if file already exists (don't overwrite)
-                            if dest_file.exists() and config_file not in ['App.tsx']:
-                                print(f"   Skipping {config_file} (already exists)")
-                                continue
-                            
-                            if config_file == 'App.tsx':
-                                # Update App.tsx to import from generated app
-                                with open(src_file, 'r', encoding='utf-8') as f:
-                                    app_content = f.read()
-                                # Replace import to use generated app
-                                app_content = app_content.replace(
-                                    "import MerchantBaseApp from './apps/merchant-base';",
-                                    f"import {tenant_id.replace('-', '').title().replace(' ', '')}App from './apps/{folder_name}';"
-                                )
-                                app_content = app_content.replace(
-                                    "export default MerchantBaseApp;",
-                                    f"export default {tenant_id.replace('-', '').title().replace(' ', '')}App;"
-                                )
-                                with open(dest_file, 'w', encoding='utf-8') as f:
-                                    f.write(app_content)
-                                print(f"   ✓ Copied {config_file} (updated for {folder_name})")
-                            else:
-                                shutil.copy2(src_file, dest_file)
-                                print(f"   ✓ Copied {config_file}")
+                            with _phase(progress, f'copy {config_file}'):
+                                # Skip if file already exists (don't overwrite)
+                                if dest_file.exists() and config_file not in ['App.tsx']:
+                                    print(f"   Skipping {config_file} (already exists)")
+                                    continue
+                                
+                                if config_file == 'package.json':
+                                    # Only keep dependencies the app, core and enabled plugins need
+                                    from source_scanner import write_pruned_package_json
+                                    pruned, prune_msg = write_pruned_package_json(
+                                        repo_root, output_dir, target_path, tenant.get('enabledFeatures', [])
+                                    )
+                                    if pruned:
+                                        print(f"   ✓ Wrote pruned {config_file} ({prune_msg})")
+                                    else:
+                                        print(f"   ⚠ Warning: Could not prune {config_file} ({prune_msg}), copying as-is")
+                                        copy_file(src_file, dest_file)
+                                elif config_file == 'App.tsx':
+                                    # Update App.tsx to import from generated app
+                                    with open(src_file, 'r', encoding='utf-8') as f:
+                                        app_content = f.read()
+                                    # Replace import to use generated app
+                                    app_content = app_content.replace(
+                                        "import MerchantBaseApp from './apps/merchant-base';",
+                                        f"import {tenant_id.replace('-', '').title().replace(' ', '')}App from './apps/{folder_name}';"
+                                    )
+                                    app_content = app_content.replace(
+                                        "export default MerchantBaseApp;",
+                                        f"export default {tenant_id.replace('-', '').title().replace(' ', '')}App;"
+                                    )
+                                    with open(dest_file, 'w', encoding='utf-8') as f:
+                                        f.write(app_content)
+                                    print(f"   ✓ Copied {config_file} (updated for {folder_name})")
+                                else:
+                                    copy_file(src_file, dest_file)
+                                    print(f"   ✓ Copied {config_file}")
                         except Exception as e:
                             print(f"   ⚠ Warning: Could not copy {config_file}: {str(e)}")
                 
                 # Copy packages/core (essential)
-                core_source = repo_root / 'packages' / 'core'
+                core_source = ctx.core_dir
                 if core_source.exists():
                     core_target = output_dir / 'packages' / 'core'
                     if not core_target.exists():
                         try:
                             print(f"   Copying packages/core to {core_target}...")
-                            shutil.copytree(core_source, core_target, ignore=shutil.ignore_patterns(
-                                '__pycache__', '*.pyc', '.git', 'node_modules', '*.test.ts', '*.test.tsx', '__tests__'
-                            ))
+                            with _phase(progress, 'copy packages/core'):
+                                shutil.copytree(core_source, core_target, ignore=CORE_IGNORE, copy_function=copy_file)
                             print(f"   ✓ Copied packages/core")
                         except Exception as e:
                             print(f"   ⚠ Warning: Could not copy core packages: {str(e)}")
                     else:
-                        print(f"   ⚠ packages/core already exists, skipping...")
+                        print(f"   ⚠ packages/core already exists, skipping (use 'refresh' to update it)...")
                 
                 # Copy packages/plugins (only enabled ones)
-                plugins_source = repo_root / 'packages' / 'plugins'
+                plugins_source = ctx.plugins_dir
                 if plugins_source.exists():
                     enabled_features = tenant.get('enabledFeatures', [])
                     plugins_target = output_dir / 'packages' / 'plugins'
@@ -687,9 +1029,9 @@ def generate_repo(tenant_id: str, tenant: Dict, overwrite: bool = False,
                             if plugin_source.exists():
                                 plugin_target = plugins_target / plugin_id
                                 try:
-                                    shutil.copytree(plugin_source, plugin_target, ignore=shutil.ignore_patterns(
-                                        '__pycache__', '*.pyc', '.git', 'node_modules', '__tests__'
-                                    ))
+                                    with _phase(progress, f'copy plugin {plugin_id}'):
+                                        shutil.copytree(plugin_source, plugin_target, ignore=PLUGIN_IGNORE,
+                                                        copy_function=copy_file)
                                     print(f"      ✓ Copied plugin: {plugin_id}")
                                 except Exception as e:
                                     print(f"      ⚠ Warning: Could not copy plugin {plugin_id}: {str(e)}")
@@ -705,9 +1047,9 @@ def generate_repo(tenant_id: str, tenant: Dict, overwrite: bool = False,
                     android_target = output_dir / 'android'
                     if not android_target.exists():
                         try:
-                            shutil.copytree(android_source, android_target, ignore=shutil.ignore_patterns(
-                                'build', '.gradle', 'node_modules', '*.iml', 'local.properties'
-                            ))
+                            with _phase(progress, 'copy android'):
+                                shutil.copytree(android_source, android_target, ignore=ANDROID_IGNORE,
+                                                copy_function=copy_file)
                         except Exception as e:
                             print(f"Warning: Could not copy Android: {str(e)}")
                 
@@ -715,13 +1057,13 @@ def generate_repo(tenant_id: str, tenant: Dict, overwrite: bool = False,
                     ios_target = output_dir / 'ios'
                     if not ios_target.exists():
                         try:
-                            shutil.copytree(ios_source, ios_target, ignore=shutil.ignore_patterns(
-                                'Pods', 'build', 'DerivedData', 'node_modules', '.xcode.env.local'
-                            ))
+                            with _phase(progress, 'copy ios'):
+                                shutil.copytree(ios_source, ios_target, ignore=IOS_IGNORE, copy_function=copy_file)
                             print(f"   ✓ Copied iOS directory")
                             
                             # Update iOS configuration files
-                            update_ios_config(ios_target, folder_name, tenant.get('name', tenant_id), tenant_id, tenant)
+                            with _phase(progress, 'rewrite ios'):
+                                update_ios_config(ios_target, folder_name, tenant.get('name', tenant_id), tenant_id, tenant)
                         except Exception as e:
                             print(f"   ⚠ Warning: Could not copy iOS: {str(e)}")
                 
@@ -729,7 +1071,19 @@ def generate_repo(tenant_id: str, tenant: Dict, overwrite: bool = False,
                     assets_target = output_dir / 'assets'
                     if not assets_target.exists():
                         try:
-                            shutil.copytree(assets_source, assets_target)
+                            with _phase(progress, 'copy assets'):
+                                if keep_all_assets:
+                                    shutil.copytree(assets_source, assets_target, copy_function=copy_file)
+                                    print(f"   ✓ Copied all assets")
+                                else:
+                                    # Only copy assets referenced by the app, core and enabled plugins
+                                    from source_scanner import scan_asset_references, copy_referenced_assets, format_bytes
+                                    referenced = scan_asset_references(repo_root, target_path, tenant.get('enabledFeatures', []))
+                                    copied, dropped, dropped_bytes = copy_referenced_assets(
+                                        assets_source, assets_target, referenced, copy_function=copy_file
+                                    )
+                                    print(f"   ✓ Copied {copied} referenced assets "
+                                          f"(dropped {dropped} files, {format_bytes(dropped_bytes)})")
                         except Exception as e:
                             print(f"Warning: Could not copy assets: {str(e)}")
                 
@@ -775,15 +1129,16 @@ pause
 """
                 
                 try:
-                    with open(setup_script, 'w', encoding='utf-8') as f:
-                        f.write(setup_sh_content.format(app_name=tenant.get('name', tenant_id)))
-                    # Make executable on Unix
-                    import stat
-                    if setup_script.exists():
-                        setup_script.chmod(setup_script.stat().st_mode | stat.S_IEXEC)
-                    
-                    with open(setup_bat, 'w', encoding='utf-8') as f:
-                        f.write(setup_bat_content.format(app_name=tenant.get('name', tenant_id)))
+                    with _phase(progress, 'write setup scripts'):
+                        with open(setup_script, 'w', encoding='utf-8') as f:
+                            f.write(setup_sh_content.format(app_name=tenant.get('name', tenant_id)))
+                        # Make executable on Unix
+                        import stat
+                        if setup_script.exists():
+                            setup_script.chmod(setup_script.stat().st_mode | stat.S_IEXEC)
+                        
+                        with open(setup_bat, 'w', encoding='utf-8') as f:
+                            f.write(setup_bat_content.format(app_name=tenant.get('name', tenant_id)))
                 except Exception as e:
                     print(f"Warning: Could not create setup scripts: {str(e)}")
                 
@@ -868,155 +1223,46 @@ See the main repository documentation for development guidelines.
 Private - {tenant.get('name', tenant_id)}
 """
                 try:
-                    with open(readme_file, 'w', encoding='utf-8') as f:
-                        f.write(readme_content)
+                    with _phase(progress, 'write standalone README.md'):
+                        with open(readme_file, 'w', encoding='utf-8') as f:
+                            f.write(readme_content)
                 except Exception as e:
                     print(f"Warning: Could not create README: {str(e)}")
         
         # Copy app manager tools to the new repo
-        tools_source = Path(__file__).parent  # tools/closepay-core-manager
-        tools_target = target_path / 'tools' / 'app-manager'
-        
-        # Copy app manager tools to the new repo
-        tools_source = Path(__file__).parent  # tools/closepay-core-manager
+        tools_source = ctx.tool_dir  # tools/closepay-core-manager
         tools_target = target_path / 'tools' / 'app-manager'
         
         try:
-            # Create tools directory
-            tools_target.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Copy tools directory (exclude __pycache__ and .git)
-            if tools_target.exists():
-                shutil.rmtree(tools_target)
-            
-            # Copy files individually to exclude __pycache__
-            tools_target.mkdir(parents=True, exist_ok=True)
-            for item in tools_source.iterdir():
-                if item.name in ['__pycache__', '.git', '.gitignore']:
-                    continue
-                if item.is_file():
-                    shutil.copy2(item, tools_target / item.name)
-                elif item.is_dir() and item.name != '__pycache__':
-                    shutil.copytree(item, tools_target / item.name, ignore=shutil.ignore_patterns('__pycache__', '*.pyc'))
-            
-            # Update repo_generator.py to work from new repo location
-            repo_generator_file = tools_target / 'repo_generator.py'
-            if repo_generator_file.exists():
-                with open(repo_generator_file, 'r', encoding='utf-8') as f:
-                    repo_gen_content = f.read()
+            with _phase(progress, 'copy tools/app-manager'):
+                # Create tools directory
+                tools_target.parent.mkdir(parents=True, exist_ok=True)
                 
-                # Update get_repo_root and get_template_path for standalone app
-                import re
+                # Copy tools directory (exclude __pycache__ and .git)
+                if tools_target.exists():
+                    shutil.rmtree(tools_target)
                 
-                # Update get_repo_root
-                pattern_root = r'def get_repo_root\(\) -> Optional\[Path\]:.*?return None'
-                replacement_root = '''def get_repo_root() -> Optional[Path]:
-    """Find the repository root directory (contains apps/, packages/, etc.)."""
-    current = Path(__file__).resolve()
-    
-    # If we're in a standalone app repo (tools/app-manager/), go up to app root
-    # Expected structure: app_root/tools/app-manager/repo_generator.py
-    if current.parent.name == 'app-manager' and current.parent.parent.name == 'tools':
-        app_root = current.parent.parent.parent
-        # Check if this looks like an app directory (has src/, config/, etc.)
-        if (app_root / 'src').exists() or (app_root / 'config').exists():
-            return app_root
-    
-    # Original logic: Go up from tools/closepay-core-manager/ to repo root
-    # Expected structure: repo_root/tools/closepay-core-manager/repo_generator.py
-    repo_root = current.parent.parent.parent
-    
-    # Verify it's the repo root by checking for apps/ and packages/ directories
-    if (repo_root / 'apps').exists() and (repo_root / 'packages').exists():
-        return repo_root
-    
-    # Try one more level up (in case we're in a subdirectory)
-    repo_root = repo_root.parent
-    if (repo_root / 'apps').exists() and (repo_root / 'packages').exists():
-        return repo_root
-    
-    return None'''
+                # Copy files individually to exclude __pycache__
+                tools_target.mkdir(parents=True, exist_ok=True)
+                for item in tools_source.iterdir():
+                    if item.name in ['__pycache__', '.git', '.gitignore', '.cache'] or item.suffix == '.lock':
+                        continue
+                    if item.is_file():
+                        copy_file(item, tools_target / item.name)
+                    elif item.is_dir() and item.name != '__pycache__':
+                        shutil.copytree(item, tools_target / item.name, ignore=shutil.ignore_patterns('__pycache__', '*.pyc'),
+                                        copy_function=copy_file)
                 
-                repo_gen_content = re.sub(pattern_root, replacement_root, repo_gen_content, flags=re.DOTALL)
+                # Describe the copy's own layout (repo_root/apps/{folder}/tools/app-manager)
+                ctx.write_standalone_context(tools_target, tenant_id, folder_name)
                 
-                # Update get_template_path to return None for standalone apps (no template needed)
-                pattern_template = r'def get_template_path\(.*?\) -> Optional\[Path\]:.*?return None'
-                replacement_template = '''def get_template_path(variant: str = 'member') -> Optional[Path]:
-    """
-    Get the path to the template.
-    
-    For standalone apps, return None (no template needed).
-    """
-    current = Path(__file__).resolve()
-    
-    # If we're in a standalone app, no template needed
-    if current.parent.name == 'app-manager' and current.parent.parent.name == 'tools':
-        return None
-    
-    # Original logic for main repo
-    repo_root = get_repo_root()
-    if not repo_root:
-        return None
-    
-    # Try member-base first (default), then merchant-base as fallback
-    if variant == 'member':
-        template_path = repo_root / 'apps' / 'member-base'
-        if template_path.exists():
-            return template_path
-        
-        # Fallback to merchant-base if member-base doesn't exist
-        template_path = repo_root / 'apps' / 'merchant-base'
-        if template_path.exists():
-            return template_path
-    else:
-        # For merchant variant, use merchant-base
-        template_path = repo_root / 'apps' / 'merchant-base'
-        if template_path.exists():
-            return template_path
-    
-    return None (no template needed).
-    """
-    current = Path(__file__).resolve()
-    
-    # If we're in a standalone app, no template needed
-    if current.parent.name == 'app-manager' and current.parent.parent.name == 'tools':
-        return None
-    
-    # Original logic for main repo
-    repo_root = get_repo_root()
-    if not repo_root:
-        return None
-    
-    # Try member-base first (default), then merchant-base as fallback
-    if variant == 'member':
-        template_path = repo_root / 'apps' / 'member-base'
-        if template_path.exists():
-            return template_path
-        
-        # Fallback to merchant-base if member-base doesn't exist
-        template_path = repo_root / 'apps' / 'merchant-base'
-        if template_path.exists():
-            return template_path
-    else:
-        # For merchant variant, use merchant-base
-        template_path = repo_root / 'apps' / 'merchant-base'
-        if template_path.exists():
-            return template_path
-    
-    return None'''
-                
-                repo_gen_content = re.sub(pattern_template, replacement_template, repo_gen_content, flags=re.DOTALL)
-                
-                with open(repo_generator_file, 'w', encoding='utf-8') as f:
-                    f.write(repo_gen_content)
-            
-            # Create tenants.json for the new app (with just this tenant)
-            tenants_file = tools_target / 'tenants.json'
-            app_tenant = {
-                tenant_id: tenant
-            }
-            with open(tenants_file, 'w', encoding='utf-8') as f:
-                json.dump(app_tenant, f, indent=2, ensure_ascii=False)
+                # Create tenants.json for the new app (with just this tenant)
+                tenants_file = tools_target / 'tenants.json'
+                app_tenant = {
+                    tenant_id: tenant
+                }
+                with open(tenants_file, 'w', encoding='utf-8') as f:
+                    json.dump(app_tenant, f, indent=2, ensure_ascii=False)
             
             # Update README in tools to reflect this is app-specific
             tools_readme = tools_target / 'README.md'
@@ -1064,28 +1310,180 @@ This app manager is configured specifically for this app. The `tenants.json` con
         
         # Return relative or absolute path message
         if output_path:
-            return True, f"Successfully generated app repository at {target_path}"
+            return True, f"Successfully generated app repository at {target_path} ({plugin_count} plugins)"
         else:
-            return True, f"Successfully generated app repository at apps/{folder_name}"
+            return True, f"Successfully generated app repository at apps/{folder_name} ({plugin_count} plugins)"
         
+    except GenerationCancelled:
+        # Don't leave a half-generated app behind
+        if target_path.exists():
+            shutil.rmtree(target_path, ignore_errors=True)
+        return False, "Generation cancelled"
     except Exception as e:
         return False, f"Error generating repository: {str(e)}"
 
 
-def list_generated_apps() -> list:
-    """List all generated app directories (excluding merchant-base template)."""
-    repo_root = get_repo_root()
-    if not repo_root:
-        return []
+def _tree_files(root: Path, ignore=None) -> Dict[str, int]:
+    """Files under root (POSIX paths relative to it) with their sizes, skipping what ignore excludes."""
+    files = {}
+    for current, dirs, names in os.walk(root):
+        if ignore:
+            ignored = ignore(current, dirs + names)
+            dirs[:] = [name for name in dirs if name not in ignored]
+            names = [name for name in names if name not in ignored]
+        relative = Path(current).relative_to(root)
+        for name in names:
+            path = Path(current) / name
+            try:
+                files[(relative / name).as_posix()] = path.stat().st_size
+            except OSError:
+                continue
+    return files
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tree_delta(source: Path, target: Path, ignore=None) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Compare a source tree with its copy.
+    
+    Files only differing in size are changed without hashing; files of
+    equal size are compared by content hash, so touched but identical
+    files are not reported.
+    
+    Args:
+        source: Tree to copy from
+        target: Existing copy (may be missing)
+        ignore: shutil.ignore_patterns callable applied to both trees
+    
+    Returns:
+        Tuple of (added, changed, removed) relative paths, each sorted
+    """
+    source_files = _tree_files(source, ignore)
+    target_files = _tree_files(target, ignore) if target.exists() else {}
+    added = sorted(path for path in source_files if path not in target_files)
+    removed = sorted(path for path in target_files if path not in source_files)
+    changed = sorted(
+        path for path, size in source_files.items()
+        if path in target_files and (
+            size != target_files[path] or _file_hash(source / path) != _file_hash(target / path)
+        )
+    )
+    return added, changed, removed
+
+
+def apply_tree_delta(source: Path, target: Path, added: List[str], changed: List[str], removed: List[str],
+                     copy_file=shutil.copy2):
+    """Copy added and changed files from source to target, delete removed ones and the directories they leave empty."""
+    for path in added + changed:
+        destination = target / path
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        copy_file(source / path, destination)
+    
+    emptied = set()
+    for path in removed:
+        (target / path).unlink(missing_ok=True)
+        emptied.add((target / path).parent)
+    # Deepest first, so parents emptied by removing their children go too
+    for directory in sorted(emptied, key=lambda d: len(d.parts), reverse=True):
+        while directory != target and directory.is_dir() and not any(directory.iterdir()):
+            directory.rmdir()
+            directory = directory.parent
+
+
+def _standalone_enabled_features(repo: Path) -> Optional[List[str]]:
+    """Plugins enabled by the tenants.json of the repo's app manager copies (None if it has none)."""
+    features = None
+    for tenants_file in sorted(repo.glob('apps/*/tools/app-manager/tenants.json')):
+        try:
+            with open(tenants_file, 'r', encoding='utf-8') as f:
+                tenants = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        features = features or []
+        for tenant in tenants.values():
+            features += [feature for feature in tenant.get('enabledFeatures', []) if feature not in features]
+    return features
+
+
+def refresh_repo(repo_path: str, dry_run: bool = False,
+                 progress: Optional[GenerationProgress] = None) -> Tuple[bool, List[Tuple], str]:
+    """
+    Bring packages/core and the enabled plugins of a standalone repo up to date with the monorepo.
+    
+    Only files whose content differs are copied and files deleted in the
+    monorepo are removed from the repo; files CORE_IGNORE/PLUGIN_IGNORE
+    exclude (node_modules, tests, ...) are left alone on both sides. The
+    enabled plugins are read from the repo's own tenants.json (or, if it
+    has none, are the plugins it already contains).
     
-    apps_dir = repo_root / 'apps'
-    if not apps_dir.exists():
-        return []
+    Args:
+        repo_path: Root of a standalone repo created with generate --output
+        dry_run: Only compute the delta
+        progress: Optional GenerationProgress counting copied files (and cancelling between them)
     
-    apps = []
-    for item in apps_dir.iterdir():
-        if item.is_dir() and item.name != 'merchant-base':
-            apps.append(item.name)
+    Returns:
+        Tuple of (success, [(tree, added, changed, removed)] for trees with changes, message)
+    """
+    ctx = get_repo_context()
+    if ctx.standalone or not ctx.core_dir or not ctx.core_dir.exists():
+        return False, [], "Refresh must run from the monorepo's app manager (packages/core not found)"
+    
+    repo = Path(repo_path).expanduser().resolve()
+    if repo == ctx.repo_root.resolve():
+        return False, [], "Cannot refresh the monorepo itself"
+    if not (repo / 'packages' / 'core').is_dir():
+        return False, [], f"'{repo}' is not a standalone repo (no packages/core)"
+    
+    features = _standalone_enabled_features(repo)
+    plugins_target = repo / 'packages' / 'plugins'
+    if features is None:
+        features = sorted(p.name for p in plugins_target.iterdir() if p.is_dir()) if plugins_target.is_dir() else []
+    
+    trees = [('packages/core', ctx.core_dir, repo / 'packages' / 'core', CORE_IGNORE)]
+    missing = []
+    for plugin_id in features:
+        plugin_source = ctx.plugins_dir / plugin_id
+        if plugin_source.is_dir():
+            trees.append((f'packages/plugins/{plugin_id}', plugin_source, plugins_target / plugin_id, PLUGIN_IGNORE))
+        else:
+            missing.append(plugin_id)
     
-    return sorted(apps)
+    copy_file = progress.copy_file if progress else shutil.copy2
+    results = []
+    try:
+        for label, source, target, ignore in trees:
+            with _phase(progress, f'refresh {label}'):
+                added, changed, removed = tree_delta(source, target, ignore)
+                if not (added or changed or removed):
+                    continue
+                results.append((label, added, changed, removed))
+                if not dry_run:
+                    apply_tree_delta(source, target, added, changed, removed, copy_file=copy_file)
+    except GenerationCancelled:
+        return False, results, "Refresh cancelled (files already copied are kept)"
+    except Exception as e:
+        return False, results, f"Error refreshing repository: {str(e)}"
+    
+    totals = [sum(len(result[i]) for result in results) for i in (1, 2, 3)]
+    summary = f"{totals[0]} added, {totals[1]} changed, {totals[2]} removed in {len(results)} of {len(trees)} tree(s)"
+    if not results:
+        message = f"{repo} is up to date ({len(trees)} tree(s) checked)"
+    elif dry_run:
+        message = f"Would refresh {repo}: {summary}"
+    else:
+        message = f"Refreshed {repo}: {summary}"
+    if missing:
+        message += f"; plugin(s) not in the monorepo, left as they are: {', '.join(missing)}"
+    return True, results, message
 
+
+def list_generated_apps() -> list:
+    """List all generated app directories (excluding merchant-base template)."""
+    return get_repo_context().list_generated_apps()
@@ -0,0 +1,372 @@
+"""
+Source Scanner Module
+Scan app, core and plugin sources to find what a standalone repo actually needs
+"""
+
+import re
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+# Source files that can import npm packages
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx')
+
+# Directories never scanned
+IGNORED_DIRS = {'node_modules', '__pycache__', '.git', '__tests__', 'build', 'Pods'}
+
+# import x from 'pkg' / import 'pkg' / export ... from 'pkg' / require('pkg') / import('pkg')
+IMPORT_PATTERN = re.compile(
+    r"""(?:\bfrom\s+|\bimport\s+|\brequire\s*\(\s*|\bimport\s*\(\s*)['"]([^'"\n]+)['"]"""
+)
+
+# Root files of the monorepo that are copied into standalone repos and can pull in packages
+ROOT_SOURCE_FILES = [
+    'App.tsx',
+    'index.js',
+    'babel.config.js',
+    'metro.config.js',
+    'react-native.config.js',
+    'tailwind.config.js',
+]
+
+# Packages every React Native app needs regardless of imports
+ALWAYS_KEEP_DEPENDENCIES = {'react', 'react-native'}
+
+# Font family names used by core (matched against asset file names)
+FONTS_CONFIG_FILE = Path('packages') / 'core' / 'config' / 'utils' / 'fonts.ts'
+FONT_NAME_PATTERN = re.compile(r"""['"]([A-Za-z0-9_-]+)['"]""")
+FONT_EXTENSIONS = ('.ttf', '.otf')
+
+# Native project files (under ios/ and android/) that name bundled assets, e.g. UIAppFonts in Info.plist
+NATIVE_ASSET_FILES = ('Info.plist', 'project.pbxproj', 'link-assets-manifest.json')
+NATIVE_ASSET_DIRS = ('ios', 'android')
+ASSET_FILE_NAME_PATTERN = re.compile(r"[\w@.+-]+\.\w+")
+
+# assets: ['./assets/fonts/'] in react-native.config.js (directories linked into the native projects)
+LINKED_ASSETS_PATTERN = re.compile(r"\bassets\s*:\s*\[([^\]]*)\]")
+
+
+def iter_source_files(paths: Iterable[Path], extensions: Tuple[str, ...] = SOURCE_EXTENSIONS) -> Iterator[Path]:
+    """Yield source files under the given files/directories."""
+    for path in paths:
+        if not path.exists():
+            continue
+        if path.is_file():
+            if path.suffix in extensions:
+                yield path
+            continue
+        for item in path.rglob('*'):
+            if any(part in IGNORED_DIRS for part in item.relative_to(path).parts):
+                continue
+            if item.is_file() and item.suffix in extensions:
+                yield item
+
+
+def package_name(specifier: str) -> Optional[str]:
+    """Get npm package name from an import specifier (None for relative/absolute paths)."""
+    if not specifier or specifier.startswith(('.', '/')):
+        return None
+    parts = specifier.split('/')
+    if specifier.startswith('@'):
+        if len(parts) < 2:
+            return None
+        return '/'.join(parts[:2])
+    return parts[0]
+
+
+def scan_package_imports(paths: Iterable[Path]) -> Set[str]:
+    """Collect npm package names imported by source files under paths."""
+    packages = set()
+    for source_file in iter_source_files(paths):
+        try:
+            with open(source_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+        for match in IMPORT_PATTERN.finditer(content):
+            name = package_name(match.group(1))
+            if name:
+                packages.add(name)
+    return packages
+
+
+def load_plugin_npm_dependencies(plugin_dir: Path) -> Set[str]:
+    """
+    Load npm dependencies declared by a plugin.
+    
+    Reads dependencies/peerDependencies from the plugin's package.json and
+    npmDependencies from plugin.manifest.json (manifest dependencies are
+    plugin IDs, not npm packages).
+    """
+    declared = set()
+    
+    package_file = plugin_dir / 'package.json'
+    if package_file.exists():
+        try:
+            with open(package_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            declared.update(data.get('dependencies', {}) or {})
+            declared.update(data.get('peerDependencies', {}) or {})
+        except (OSError, json.JSONDecodeError):
+            pass
+    
+    manifest_file = plugin_dir / 'plugin.manifest.json'
+    if manifest_file.exists():
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            declared.update(data.get('npmDependencies', []) or [])
+        except (OSError, json.JSONDecodeError):
+            pass
+    
+    return declared
+
+
+def _peer_dependencies(name: str, lock_data: Optional[Dict]) -> Set[str]:
+    """Get non-optional peer dependencies of an installed package from package-lock.json."""
+    if not lock_data:
+        return set()
+    entry = lock_data.get('packages', {}).get(f'node_modules/{name}', {})
+    optional = {
+        peer for peer, meta in (entry.get('peerDependenciesMeta', {}) or {}).items()
+        if meta.get('optional')
+    }
+    return set(entry.get('peerDependencies', {}) or {}) - optional
+
+
+def compute_required_dependencies(repo_root: Path, app_dir: Path, plugin_ids: List[str],
+                                  lock_data: Optional[Dict] = None) -> Set[str]:
+    """
+    Compute npm packages needed by an app, packages/core and the given plugins.
+    
+    Combines per-plugin declarations, an import scan and the peer dependencies
+    (from package-lock.json) of everything found.
+    """
+    plugins_dir = repo_root / 'packages' / 'plugins'
+    scan_paths = [app_dir, repo_root / 'packages' / 'core']
+    scan_paths.extend(repo_root / name for name in ROOT_SOURCE_FILES)
+    
+    required = set(ALWAYS_KEEP_DEPENDENCIES)
+    for plugin_id in plugin_ids:
+        plugin_dir = plugins_dir / plugin_id
+        scan_paths.append(plugin_dir)
+        required.update(load_plugin_npm_dependencies(plugin_dir))
+    
+    required.update(scan_package_imports(scan_paths))
+    
+    # Peer dependencies of required packages are required too
+    pending = list(required)
+    while pending:
+        for peer in _peer_dependencies(pending.pop(), lock_data):
+            if peer not in required:
+                required.add(peer)
+                pending.append(peer)
+    
+    return required
+
+
+def prune_package_json(package_data: Dict, required: Set[str]) -> Tuple[Dict, List[str]]:
+    """
+    Drop runtime dependencies that are not required.
+    
+    devDependencies are kept as-is (build toolchain).
+    
+    Returns:
+        Tuple of (pruned package.json dict, sorted list of removed dependencies)
+    """
+    pruned = dict(package_data)
+    dependencies = package_data.get('dependencies', {}) or {}
+    pruned['dependencies'] = {name: version for name, version in dependencies.items() if name in required}
+    removed = sorted(name for name in dependencies if name not in required)
+    return pruned, removed
+
+
+def write_pruned_package_json(repo_root: Path, output_dir: Path, app_dir: Path,
+                              plugin_ids: List[str]) -> Tuple[bool, str]:
+    """
+    Write a package.json for a standalone repo with only the needed dependencies.
+    
+    Returns:
+        Tuple of (success, message describing the dependency reduction)
+    """
+    source_file = repo_root / 'package.json'
+    try:
+        with open(source_file, 'r', encoding='utf-8') as f:
+            package_data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        return False, f"Could not read {source_file}: {str(e)}"
+    
+    lock_data = None
+    lock_file = repo_root / 'package-lock.json'
+    if lock_file.exists():
+        try:
+            with open(lock_file, 'r', encoding='utf-8') as f:
+                lock_data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            lock_data = None
+    
+    required = compute_required_dependencies(repo_root, app_dir, plugin_ids, lock_data)
+    pruned, removed = prune_package_json(package_data, required)
+    
+    try:
+        with open(output_dir / 'package.json', 'w', encoding='utf-8') as f:
+            json.dump(pruned, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+    except OSError as e:
+        return False, f"Could not write package.json: {str(e)}"
+    
+    total = len(package_data.get('dependencies', {}) or {})
+    kept = len(pruned['dependencies'])
+    message = f"dependencies {total} → {kept} (-{len(removed)})"
+    if removed:
+        message += f": removed {', '.join(removed)}"
+    return True, message
+
+
+def _resolve_asset_specifier(specifier: str, source_file: Path, repo_root: Path) -> Optional[Path]:
+    """Resolve an import/require specifier to a file path (None for npm packages)."""
+    if specifier.startswith('.'):
+        return (source_file.parent / specifier).resolve()
+    if specifier.startswith('assets/'):
+        # babel module-resolver root is the repo root
+        return (repo_root / specifier).resolve()
+    return None
+
+
+def scan_font_names(repo_root: Path) -> Set[str]:
+    """Collect font names listed in packages/core/config/utils/fonts.ts."""
+    fonts_file = repo_root / FONTS_CONFIG_FILE
+    if not fonts_file.exists():
+        return set()
+    try:
+        with open(fonts_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError):
+        return set()
+    return set(FONT_NAME_PATTERN.findall(content))
+
+
+def scan_native_asset_names(repo_root: Path) -> Set[str]:
+    """Collect file names mentioned in the native project files (Info.plist, project.pbxproj, link manifests)."""
+    names = set()
+    for directory in NATIVE_ASSET_DIRS:
+        native_dir = repo_root / directory
+        if not native_dir.exists():
+            continue
+        for file_name in NATIVE_ASSET_FILES:
+            for native_file in native_dir.rglob(file_name):
+                if IGNORED_DIRS.intersection(native_file.relative_to(native_dir).parts):
+                    continue
+                try:
+                    with open(native_file, 'r', encoding='utf-8') as f:
+                        names.update(ASSET_FILE_NAME_PATTERN.findall(f.read()))
+                except (OSError, UnicodeDecodeError):
+                    continue
+    return names
+
+
+def scan_linked_asset_dirs(repo_root: Path) -> List[Path]:
+    """Directories listed under assets in react-native.config.js (react-native-asset links all their files)."""
+    config_file = repo_root / 'react-native.config.js'
+    if not config_file.exists():
+        return []
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError):
+        return []
+    directories = []
+    for match in LINKED_ASSETS_PATTERN.finditer(content):
+        for specifier in re.findall(r"""['"]([^'"\n]+)['"]""", match.group(1)):
+            directories.append((repo_root / specifier).resolve())
+    return directories
+
+
+def scan_asset_references(repo_root: Path, app_dir: Path, plugin_ids: List[str]) -> Set[Path]:
+    """
+    Find files under repo_root/assets referenced by the app, packages/core and the given plugins.
+    
+    Looks at import/require of asset paths, at the font names in fonts.ts
+    and at what the copied native projects expect to bundle: files named
+    in Info.plist, project.pbxproj and link-assets-manifest.json, and every
+    file in the asset directories of react-native.config.js (a missing one
+    fails the Xcode build).
+    
+    Returns:
+        Set of paths relative to the assets directory
+    """
+    assets_dir = (repo_root / 'assets').resolve()
+    if not assets_dir.exists():
+        return set()
+    
+    scan_paths = [app_dir, repo_root / 'packages' / 'core']
+    scan_paths.extend(repo_root / name for name in ROOT_SOURCE_FILES)
+    scan_paths.extend(repo_root / 'packages' / 'plugins' / plugin_id for plugin_id in plugin_ids)
+    
+    referenced = set()
+    for source_file in iter_source_files(scan_paths):
+        try:
+            with open(source_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+        for match in IMPORT_PATTERN.finditer(content):
+            resolved = _resolve_asset_specifier(match.group(1), source_file.resolve(), repo_root)
+            if resolved and resolved.is_file() and assets_dir in resolved.parents:
+                referenced.add(resolved.relative_to(assets_dir))
+    
+    font_names = scan_font_names(repo_root)
+    native_names = scan_native_asset_names(repo_root)
+    linked_dirs = scan_linked_asset_dirs(repo_root)
+    for item in assets_dir.rglob('*'):
+        if not item.is_file():
+            continue
+        if item.suffix.lower() in FONT_EXTENSIONS and item.stem in font_names:
+            referenced.add(item.relative_to(assets_dir))
+        elif item.name in native_names or any(directory in item.parents for directory in linked_dirs):
+            referenced.add(item.relative_to(assets_dir))
+    
+    return referenced
+
+
+def copy_referenced_assets(assets_source: Path, assets_target: Path,
+                           referenced: Set[Path], copy_function=None) -> Tuple[int, int, int]:
+    """
+    Copy only referenced files from assets_source to assets_target.
+    
+    Args:
+        copy_function: Function used to copy each file (default: shutil.copy2)
+    
+    Returns:
+        Tuple of (copied files, dropped files, dropped bytes)
+    """
+    import shutil
+    
+    copy_function = copy_function or shutil.copy2
+    copied = dropped = dropped_bytes = 0
+    for item in assets_source.rglob('*'):
+        if not item.is_file():
+            continue
+        relative = item.relative_to(assets_source)
+        if relative in referenced:
+            target = assets_target / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            copy_function(item, target)
+            copied += 1
+        else:
+            dropped += 1
+            dropped_bytes += item.stat().st_size
+    return copied, dropped, dropped_bytes
+
+
+def format_bytes(size: int) -> str:
+    """Format a byte count for log output."""
+    if size < 1024:
+        return f"{size} B"
+    value = float(size)
+    for unit in ['KB', 'MB', 'GB']:
+        value /= 1024
+        if value < 1024 or unit == 'GB':
+            break
+    return f"{value:.1f} {unit}"
@@ -0,0 +1,177 @@
+"""
+Tenant Edits Module
+Unsaved changes per tenant, kept as the changed top-level fields over the saved registry
+"""
+
+from typing import Dict, List, Optional
+
+
+class _Removed:
+    """Marks a field the edit removes from the saved tenant."""
+    
+    def __repr__(self):
+        return 'REMOVED'
+
+
+REMOVED = _Removed()
+
+
+class TenantEdits:
+    """
+    Dirty set for an editor: tenant ID -> changed fields.
+    
+    The saved registry is never modified; get() lays a tenant's changed
+    fields over its saved version. A tenant edited back to its saved state
+    is clean again, new tenants hold all their fields and deleted tenants
+    are recorded as None.
+    """
+    
+    def __init__(self):
+        self.changes: Dict[str, Optional[Dict]] = {}
+    
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+    
+    def __len__(self) -> int:
+        return len(self.changes)
+    
+    def __contains__(self, tenant_id: str) -> bool:
+        return tenant_id in self.changes
+    
+    def dirty_ids(self) -> List[str]:
+        """IDs of changed, created and deleted tenants, sorted."""
+        return sorted(self.changes)
+    
+    def get(self, saved: Dict, tenant_id: str) -> Optional[Dict]:
+        """The tenant with its edits applied (None if it was deleted or does not exist)."""
+        if tenant_id not in self.changes:
+            return saved.get(tenant_id)
+        fields = self.changes[tenant_id]
+        if fields is None:
+            return None
+        tenant = dict(saved.get(tenant_id) or {})
+        for field, value in fields.items():
+            if value is REMOVED:
+                tenant.pop(field, None)
+            else:
+                tenant[field] = value
+        return tenant
+    
+    def exists(self, saved: Dict, tenant_id: str) -> bool:
+        if tenant_id in self.changes:
+            return self.changes[tenant_id] is not None
+        return tenant_id in saved
+    
+    def set_tenant(self, saved: Dict, tenant_id: str, tenant: Dict):
+        """Record tenant as the edited version of tenant_id (only fields that differ from saved are kept)."""
+        base = saved.get(tenant_id)
+        if base is None:
+            self.changes[tenant_id] = dict(tenant)
+            return
+        fields = {field: value for field, value in tenant.items() if base.get(field, REMOVED) != value}
+        fields.update({field: REMOVED for field in base if field not in tenant})
+        if fields:
+            self.changes[tenant_id] = fields
+        else:
+            self.changes.pop(tenant_id, None)
+    
+    def delete(self, saved: Dict, tenant_id: str):
+        """Record tenant_id as deleted (a tenant that was never saved is just dropped)."""
+        if tenant_id in saved:
+            self.changes[tenant_id] = None
+        else:
+            self.changes.pop(tenant_id, None)
+    
+    def rebase(self, old: Dict, new: Dict, tenant_id: str) -> bool:
+        """
+        Keep tenant_id's edits on top of a newer saved registry (another writer saved new over old).
+        
+        The changed fields are laid over the new saved tenant, so fields only
+        the other writer changed take their new values.
+        
+        Returns:
+            Whether the other writer changed something the edits change too (differently)
+        """
+        fields = self.changes[tenant_id]
+        before = old.get(tenant_id)
+        after = new.get(tenant_id)
+        if fields is None:
+            # Deleted here: a conflict if it was changed there
+            self.delete(new, tenant_id)
+            return after is not None and after != before
+        if after is None:
+            # Deleted there: saving would create it again as edited here
+            self.changes[tenant_id] = self.get(old, tenant_id)
+            return True
+        if before is None:
+            # Created here and there
+            self.set_tenant(new, tenant_id, self.get(old, tenant_id))
+            return tenant_id in self.changes
+        
+        conflict = any(
+            before.get(field, REMOVED) != after.get(field, REMOVED) and after.get(field, REMOVED) != value
+            for field, value in fields.items()
+        )
+        self.set_tenant(new, tenant_id, self.get(new, tenant_id))
+        return conflict
+    
+    def clear(self):
+        self.changes = {}
+    
+    def base(self, saved: Dict) -> Dict[str, Optional[Dict]]:
+        """Saved versions of the dirty tenants (None for new ones), for config_io.merge_tenant_changes."""
+        return {tenant_id: saved.get(tenant_id) for tenant_id in self.changes}
+    
+    def apply(self, saved: Dict) -> Dict:
+        """New registry with all edits applied (saved is not modified)."""
+        registry = dict(saved)
+        for tenant_id in self.changes:
+            tenant = self.get(saved, tenant_id)
+            if tenant is None:
+                registry.pop(tenant_id, None)
+            else:
+                registry[tenant_id] = tenant
+        return registry
+
+
+def apply_bulk_edit(tenant: Dict, bulk: Dict) -> Dict:
+    """
+    Tenant with a bulk edit applied (tenant is not modified).
+    
+    Args:
+        tenant: Tenant configuration
+        bulk: 'enable' and 'disable' (plugin ID lists), 'role' (None keeps the role)
+              and 'theme' (theme fields to set)
+    
+    Returns:
+        The edited tenant (equal to tenant if the edit changes nothing for it)
+    """
+    result = dict(tenant)
+    features = tenant.get('enabledFeatures', [])
+    new_features = [feature for feature in features if feature not in bulk['disable']]
+    new_features += [feature for feature in bulk['enable'] if feature not in new_features]
+    if new_features != features:
+        result['enabledFeatures'] = new_features
+    if bulk['role']:
+        result['role'] = bulk['role']
+    if bulk['theme']:
+        result['theme'] = {**tenant.get('theme', {}), **bulk['theme']}
+    return result
+
+
+def summarize_bulk_edit(before: Dict[str, Dict], after: Dict[str, Dict]) -> List[str]:
+    """One line per kind of change (plugin enabled/disabled, role, theme) with how many tenants got it."""
+    counts: Dict[str, int] = {}
+    for tenant_id, tenant in after.items():
+        old = before[tenant_id]
+        old_features = set(old.get('enabledFeatures', []))
+        new_features = set(tenant.get('enabledFeatures', []))
+        changes = [f"enabled {feature}" for feature in sorted(new_features - old_features)]
+        changes += [f"disabled {feature}" for feature in sorted(old_features - new_features)]
+        if tenant.get('role') != old.get('role'):
+            changes.append(f"role -> {tenant.get('role')}")
+        if tenant.get('theme') != old.get('theme'):
+            changes.append("theme colors")
+        for change in changes:
+            counts[change] = counts.get(change, 0) + 1
+    return [f"{change}: {count} tenant(s)" for change, count in counts.items()]
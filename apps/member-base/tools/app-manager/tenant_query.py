@@ -0,0 +1,192 @@
+"""
+Tenant Query Module
+Filter tenants by role, features, home variant and name, with an optional in-memory index
+"""
+
+import bisect
+import fnmatch
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+
+class TenantFilter:
+    """Filter for tenant queries (empty filter matches every tenant)."""
+    
+    def __init__(self, role: Optional[str] = None, features: Optional[List[str]] = None,
+                 home_variant: Optional[str] = None, name: Optional[str] = None):
+        self.role = role
+        self.features = set(features or [])
+        self.home_variant = home_variant
+        # Glob matched case-insensitively against the tenant name and ID
+        self.name = name.lower() if name else None
+    
+    def is_empty(self) -> bool:
+        """Check if no filter is set."""
+        return not (self.role or self.features or self.home_variant or self.name)
+    
+    def matches_name(self, tenant_id: str, tenant: Dict) -> bool:
+        """Check the name glob (the only filter an index cannot answer)."""
+        if not self.name:
+            return True
+        name = str(tenant.get('name') or '').lower()
+        return fnmatch.fnmatchcase(name, self.name) or fnmatch.fnmatchcase(tenant_id.lower(), self.name)
+    
+    def matches(self, tenant_id: str, tenant: Dict) -> bool:
+        """Check every filter against one tenant."""
+        if self.role and tenant.get('role') != self.role:
+            return False
+        if self.home_variant and tenant.get('homeVariant', 'dashboard') != self.home_variant:
+            return False
+        if self.features and not self.features.issubset(tenant.get('enabledFeatures') or []):
+            return False
+        return self.matches_name(tenant_id, tenant)
+
+
+class TenantIndex:
+    """
+    Secondary indexes over a tenant registry.
+    
+    Built once over a loaded registry and reused for many queries (the daemon
+    keeps one). The owner drops it whenever the registry changes.
+    """
+    
+    def __init__(self, tenants: Dict):
+        self.tenants = tenants
+        self.sorted_ids = sorted(tenants)
+        self.by_role: Dict[str, Set[str]] = {}
+        self.by_feature: Dict[str, Set[str]] = {}
+        self.by_home_variant: Dict[str, Set[str]] = {}
+        
+        for tenant_id, tenant in tenants.items():
+            self.by_role.setdefault(tenant.get('role'), set()).add(tenant_id)
+            self.by_home_variant.setdefault(tenant.get('homeVariant', 'dashboard'), set()).add(tenant_id)
+            for feature in tenant.get('enabledFeatures') or []:
+                self.by_feature.setdefault(feature, set()).add(tenant_id)
+    
+    def candidates(self, tenant_filter: TenantFilter) -> Optional[Set[str]]:
+        """
+        IDs matching the role, feature and home variant filters.
+        
+        Returns:
+            Set of tenant IDs, or None if the filter uses none of the indexed fields
+        """
+        sets = []
+        if tenant_filter.role:
+            sets.append(self.by_role.get(tenant_filter.role, set()))
+        if tenant_filter.home_variant:
+            sets.append(self.by_home_variant.get(tenant_filter.home_variant, set()))
+        for feature in tenant_filter.features:
+            sets.append(self.by_feature.get(feature, set()))
+        if not sets:
+            return None
+        
+        # Intersect starting from the smallest set
+        sets.sort(key=len)
+        result = set(sets[0])
+        for other in sets[1:]:
+            result &= other
+            if not result:
+                break
+        return result
+
+
+def iter_matching(tenants: Dict, tenant_filter: TenantFilter,
+                  index: Optional[TenantIndex] = None) -> Iterator[Tuple[str, Dict]]:
+    """
+    Yield (tenant_id, tenant) pairs matching the filter, ordered by tenant ID.
+    
+    With an index, only candidates from the indexed fields are visited;
+    without one, every tenant is checked. Only the matches are sorted.
+    """
+    if index is not None:
+        candidates = index.candidates(tenant_filter)
+        if candidates is None:
+            # Already sorted
+            for tenant_id in index.sorted_ids:
+                tenant = tenants[tenant_id]
+                if tenant_filter.matches_name(tenant_id, tenant):
+                    yield tenant_id, tenant
+            return
+        matching = [
+            tenant_id for tenant_id in candidates if tenant_filter.matches_name(tenant_id, tenants[tenant_id])
+        ]
+    else:
+        matching = [
+            tenant_id for tenant_id, tenant in tenants.items() if tenant_filter.matches(tenant_id, tenant)
+        ]
+    
+    for tenant_id in sorted(matching):
+        yield tenant_id, tenants[tenant_id]
+
+
+def _search_text(tenant_id: str, name: str) -> str:
+    return f"{tenant_id}\n{name}".lower()
+
+
+class SortedTenantIds:
+    """
+    Tenant IDs kept sorted across inserts and deletes, with substring search on ID and name.
+    
+    Backs the GUI tenant list: adding or removing a tenant is a binary
+    search plus one list shift instead of re-sorting every ID.
+    """
+    
+    def __init__(self, tenants: Optional[Dict] = None):
+        tenants = tenants or {}
+        self.ids: List[str] = sorted(tenants)
+        self._search: Dict[str, str] = {
+            tenant_id: _search_text(tenant_id, str(tenant.get('name') or ''))
+            for tenant_id, tenant in tenants.items()
+        }
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def __contains__(self, tenant_id: str) -> bool:
+        return tenant_id in self._search
+    
+    def index_of(self, tenant_id: str) -> int:
+        """Position of a tenant ID (-1 if it is not in the index)."""
+        position = bisect.bisect_left(self.ids, tenant_id)
+        if position < len(self.ids) and self.ids[position] == tenant_id:
+            return position
+        return -1
+    
+    def add(self, tenant_id: str, name: str = '') -> int:
+        """Insert a tenant ID (or update its name) and return its position."""
+        if tenant_id not in self._search:
+            bisect.insort(self.ids, tenant_id)
+        self._search[tenant_id] = _search_text(tenant_id, name)
+        return self.index_of(tenant_id)
+    
+    def remove(self, tenant_id: str) -> int:
+        """Remove a tenant ID and return its old position (-1 if it was not in the index)."""
+        position = self.index_of(tenant_id)
+        if position >= 0:
+            del self.ids[position]
+            del self._search[tenant_id]
+        return position
+    
+    def set_name(self, tenant_id: str, name: str):
+        """Update the name a tenant is searched by."""
+        if tenant_id in self._search:
+            self._search[tenant_id] = _search_text(tenant_id, name)
+    
+    def matches(self, tenant_id: str, query: str) -> bool:
+        """Check a lowercase query against one tenant's ID and name."""
+        return not query or query in self._search.get(tenant_id, '')
+    
+    def search(self, query: str, within: Optional[List[str]] = None) -> List[str]:
+        """
+        Sorted IDs whose ID or name contains query (case-insensitive).
+        
+        Args:
+            query: Search text (empty matches every tenant)
+            within: Sorted subset to search instead of every ID (the previous
+                result, when the query only got longer)
+        """
+        query = query.strip().lower()
+        candidates = self.ids if within is None else within
+        if not query:
+            return list(candidates)
+        search = self._search
+        return [tenant_id for tenant_id in candidates if query in search[tenant_id]]
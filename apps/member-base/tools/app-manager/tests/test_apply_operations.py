@@ -0,0 +1,143 @@
+"""
+Apply Operations Tests
+Batched tenant operations through AppManager on a scratch copy of the registries
+
+Usage:
+    python -m unittest discover -s tests
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+TOOL_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TOOL_DIR))
+
+from repo_context import RepoContext, get_repo_context, set_repo_context
+from app_manager import AppManager
+
+
+class ApplyOperationsTest(unittest.TestCase):
+    """apply_operations against a monorepo layout in a temp directory."""
+    
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix='app-manager-test-'))
+        tool_dir = self.work_dir / 'tools' / 'app-manager'
+        tool_dir.mkdir(parents=True)
+        (self.work_dir / 'apps').mkdir()
+        (self.work_dir / 'packages').mkdir()
+        for name in ('tenants.json', 'plugins.json'):
+            shutil.copy2(TOOL_DIR / name, tool_dir / name)
+        self.tenants_file = tool_dir / 'tenants.json'
+        self.original_bytes = self.tenants_file.read_bytes()
+        
+        self.previous_context = get_repo_context()
+        set_repo_context(RepoContext(tool_dir))
+        self.manager = AppManager()
+        self.tenant_id = next(iter(self.manager.tenants))
+    
+    def tearDown(self):
+        set_repo_context(self.previous_context)
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+    
+    def apply(self, operations, dry_run=False):
+        lines = [op if isinstance(op, str) else json.dumps(op) for op in operations]
+        return self.manager.apply_operations(lines, dry_run=dry_run)
+    
+    def on_disk(self):
+        with open(self.tenants_file, encoding='utf-8') as f:
+            return json.load(f)
+    
+    def test_batch_is_saved_once(self):
+        success, results, msg = self.apply([
+            {'op': 'create', 'id': 'acme', 'name': 'Acme'},
+            {'op': 'update', 'id': 'acme', 'name': 'Acme Corp'},
+            {'op': 'update', 'id': self.tenant_id, 'name': 'Renamed'},
+        ])
+        self.assertTrue(success, msg)
+        self.assertEqual(msg, "Applied 3 operation(s) to 2 tenant(s) with one save")
+        self.assertEqual([row[3] for row in results], [True, True, True])
+        tenants = self.on_disk()
+        self.assertEqual(tenants['acme']['name'], 'Acme Corp')
+        self.assertEqual(tenants[self.tenant_id]['name'], 'Renamed')
+    
+    def test_one_failed_operation_leaves_tenants_json_untouched(self):
+        success, results, msg = self.apply([
+            {'op': 'create', 'id': 'acme', 'name': 'Acme'},
+            {'op': 'update', 'id': self.tenant_id, 'name': 'Renamed'},
+            {'op': 'delete', 'id': 'missing'},
+        ])
+        self.assertFalse(success)
+        self.assertEqual(msg, "Nothing saved: 1 of 3 operation(s) failed")
+        self.assertEqual(results[2], (3, 'delete', 'missing', False, "Tenant 'missing' not found"))
+        self.assertEqual(self.tenants_file.read_bytes(), self.original_bytes)
+        self.assertNotIn('acme', self.manager.tenants)
+        self.assertNotEqual(self.manager.tenants[self.tenant_id]['name'], 'Renamed')
+    
+    def test_validation_failure_leaves_tenants_json_untouched(self):
+        success, results, msg = self.apply([
+            {'op': 'create', 'id': 'acme', 'name': 'Acme'},
+            {'op': 'update', 'id': 'acme', 'role': 'owner'},
+        ])
+        self.assertFalse(success)
+        self.assertTrue(results[0][3])
+        self.assertFalse(results[1][3])
+        self.assertTrue(results[1][4].startswith("Validation error:"))
+        self.assertEqual(self.tenants_file.read_bytes(), self.original_bytes)
+    
+    def test_dry_run_writes_nothing(self):
+        success, results, msg = self.apply([
+            {'op': 'create', 'id': 'acme', 'name': 'Acme'},
+            {'op': 'delete', 'id': self.tenant_id},
+        ], dry_run=True)
+        self.assertTrue(success, msg)
+        self.assertEqual(msg, "Dry run: 2 operation(s) valid, nothing saved")
+        self.assertEqual(self.tenants_file.read_bytes(), self.original_bytes)
+        self.assertIn(self.tenant_id, self.manager.tenants)
+        self.assertNotIn('acme', self.manager.tenants)
+    
+    def test_update_and_delete_ids_are_matched_exactly(self):
+        other_case = self.tenant_id.upper()
+        success, results, msg = self.apply([
+            {'op': 'update', 'id': other_case, 'name': 'Renamed'},
+            {'op': 'delete', 'id': f' {self.tenant_id} '},
+        ])
+        self.assertFalse(success)
+        self.assertEqual(results[0][2:4], (other_case, False))
+        self.assertEqual(results[1][2:4], (f' {self.tenant_id} ', False))
+        self.assertEqual(self.tenants_file.read_bytes(), self.original_bytes)
+    
+    def test_create_normalizes_id(self):
+        success, results, msg = self.apply([{'op': 'create', 'id': 'Acme Corp', 'name': 'Acme'}])
+        self.assertTrue(success, msg)
+        self.assertEqual(results[0][2], 'acme-corp')
+        self.assertIn('acme-corp', self.on_disk())
+    
+    def test_bad_lines_are_reported_with_their_line_number(self):
+        success, results, msg = self.apply([
+            '# comment',
+            '',
+            json.dumps({'op': 'rename', 'id': self.tenant_id}),
+            '{"op": "update", "id": ',
+            json.dumps({'op': 'update', 'id': self.tenant_id, 'name': 'Renamed'}),
+        ])
+        self.assertFalse(success)
+        self.assertEqual(msg, "Nothing saved: 2 of 3 operation(s) failed")
+        line_no, op, _, ok, error = results[0]
+        self.assertEqual((line_no, op, ok), (3, 'rename', False))
+        self.assertTrue(error.startswith("Unknown op 'rename'"))
+        line_no, op, _, ok, error = results[1]
+        self.assertEqual((line_no, op, ok), (4, '?', False))
+        self.assertTrue(error.startswith("Invalid JSON:"))
+        self.assertEqual(results[2][:4], (5, 'update', self.tenant_id, True))
+        self.assertEqual(self.tenants_file.read_bytes(), self.original_bytes)
+    
+    def test_no_operations(self):
+        self.assertEqual(self.apply(['', '# nothing']), (False, [], "No operations to apply"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+"""
+Config IO Tests
+Concurrent and atomic saves of tenants.json in a temp directory
+
+Usage:
+    python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+TOOL_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TOOL_DIR))
+
+import config_io
+from config_io import (load_tenants_versioned, merge_tenant_changes, save_tenant_changes,
+                       save_tenants, tenants_version)
+from file_lock import FileLock
+
+
+def make_tenant(tenant_id, name):
+    return {
+        'id': tenant_id,
+        'name': name,
+        'role': 'member',
+        'theme': {'primary': '#0066CC', 'primaryDark': '#0052A3', 'primaryLight': '#E6F2FF'},
+        'enabledFeatures': [],
+    }
+
+
+class MergeTenantChangesTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.base = {'a': make_tenant('a', 'A'), 'b': make_tenant('b', 'B')}
+    
+    def test_changes_to_different_tenants_are_merged(self):
+        ours = dict(self.base, a=make_tenant('a', 'Ours'))
+        theirs = dict(self.base, b=make_tenant('b', 'Theirs'), c=make_tenant('c', 'C'))
+        merged, conflicts = merge_tenant_changes({'a': self.base['a']}, ours, theirs)
+        self.assertEqual(conflicts, [])
+        self.assertEqual(merged['a']['name'], 'Ours')
+        self.assertEqual(merged['b']['name'], 'Theirs')
+        self.assertIn('c', merged)
+    
+    def test_created_and_deleted_tenants_are_merged(self):
+        ours = {'b': self.base['b'], 'new': make_tenant('new', 'New')}
+        theirs = dict(self.base, b=make_tenant('b', 'Theirs'))
+        merged, conflicts = merge_tenant_changes({'a': self.base['a'], 'new': None}, ours, theirs)
+        self.assertEqual(conflicts, [])
+        self.assertEqual(sorted(merged), ['b', 'new'])
+        self.assertEqual(merged['b']['name'], 'Theirs')
+    
+    def test_same_tenant_changed_by_both_is_a_conflict(self):
+        ours = dict(self.base, a=make_tenant('a', 'Ours'))
+        theirs = dict(self.base, a=make_tenant('a', 'Theirs'))
+        merged, conflicts = merge_tenant_changes({'a': self.base['a']}, ours, theirs)
+        self.assertEqual(conflicts, ['a'])
+        self.assertEqual(merged['a']['name'], 'Theirs')
+    
+    def test_same_change_by_both_is_not_a_conflict(self):
+        ours = dict(self.base, a=make_tenant('a', 'Same'))
+        merged, conflicts = merge_tenant_changes({'a': self.base['a']}, ours, dict(ours))
+        self.assertEqual(conflicts, [])
+        self.assertEqual(merged, ours)
+
+
+class SaveTenantChangesTest(unittest.TestCase):
+    """save_tenant_changes against a tenants.json another writer changes underneath it."""
+    
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix='app-manager-test-'))
+        self.path = str(self.work_dir / 'tenants.json')
+        self.base = {'a': make_tenant('a', 'A'), 'b': make_tenant('b', 'B')}
+        self.write(self.base)
+        self.tenants, self.version, error = load_tenants_versioned(self.path)
+        self.assertIsNone(error)
+    
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+    
+    def write(self, tenants):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(tenants, f, indent=2)
+    
+    def read(self):
+        with open(self.path, encoding='utf-8') as f:
+            return json.load(f)
+    
+    def test_unchanged_file_is_saved_as_is(self):
+        ours = dict(self.tenants, a=make_tenant('a', 'Ours'))
+        saved, version, error = save_tenant_changes({'a': self.base['a']}, ours, {}, self.version, self.path)
+        self.assertIsNone(error)
+        self.assertEqual(saved, ours)
+        self.assertEqual(self.read(), ours)
+        self.assertEqual(version, tenants_version(self.path))
+    
+    def test_other_writer_changing_another_tenant_is_kept(self):
+        self.write(dict(self.base, b=make_tenant('b', 'Theirs')))
+        ours = dict(self.tenants, a=make_tenant('a', 'Ours'))
+        saved, version, error = save_tenant_changes({'a': self.base['a']}, ours, {}, self.version, self.path)
+        self.assertIsNone(error)
+        on_disk = self.read()
+        self.assertEqual(on_disk, saved)
+        self.assertEqual(on_disk['a']['name'], 'Ours')
+        self.assertEqual(on_disk['b']['name'], 'Theirs')
+        self.assertEqual(version, tenants_version(self.path))
+    
+    def test_two_writers_changing_same_tenant_is_rejected(self):
+        theirs = dict(self.base, a=make_tenant('a', 'Theirs'))
+        self.write(theirs)
+        ours = dict(self.tenants, a=make_tenant('a', 'Ours'))
+        saved, version, error = save_tenant_changes({'a': self.base['a']}, ours, {}, self.version, self.path)
+        self.assertIsNone(saved)
+        self.assertIsNone(version)
+        self.assertIn("Tenant(s) a were changed by another writer", error)
+        self.assertEqual(self.read(), theirs)
+    
+    def test_write_between_check_and_replace_is_retried(self):
+        # Another writer saves after the version check, so expected_version is stale by the time we replace
+        real_save = config_io.save_tenants
+        calls = []
+        
+        def racing_save(*args, **kwargs):
+            if not calls:
+                self.write(dict(self.base, b=make_tenant('b', 'Theirs')))
+            calls.append(kwargs.get('expected_version'))
+            return real_save(*args, **kwargs)
+        
+        ours = dict(self.tenants, a=make_tenant('a', 'Ours'))
+        with mock.patch.object(config_io, 'save_tenants', side_effect=racing_save):
+            saved, version, error = save_tenant_changes({'a': self.base['a']}, ours, {}, self.version, self.path)
+        
+        self.assertIsNone(error)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[0], self.version)
+        self.assertNotEqual(calls[1], self.version)
+        on_disk = self.read()
+        self.assertEqual(on_disk['a']['name'], 'Ours')
+        self.assertEqual(on_disk['b']['name'], 'Theirs')
+        self.assertEqual(version, tenants_version(self.path))
+    
+    def test_lock_held_elsewhere_times_out(self):
+        ours = dict(self.tenants, a=make_tenant('a', 'Ours'))
+        with FileLock(self.path):
+            with mock.patch.object(config_io, 'FileLock', lambda path: FileLock(path, timeout=0.1)):
+                saved, version, error = save_tenant_changes({'a': self.base['a']}, ours, {},
+                                                            self.version, self.path)
+        self.assertIsNone(saved)
+        self.assertIn("Timed out", error)
+        self.assertEqual(self.read(), self.base)
+
+
+class SaveTenantsAtomicTest(unittest.TestCase):
+    """save_tenants writes a temp file and os.replace()s it over tenants.json."""
+    
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix='app-manager-test-'))
+        self.path = str(self.work_dir / 'tenants.json')
+        self.original = {'a': make_tenant('a', 'A')}
+        save_tenants(self.original, {}, self.path)
+        with open(self.path, 'rb') as f:
+            self.original_bytes = f.read()
+    
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+    
+    def test_failed_replace_leaves_file_untouched(self):
+        with mock.patch.object(config_io.os, 'replace', side_effect=OSError("disk full")):
+            success, error = save_tenants({'a': make_tenant('a', 'Changed')}, {}, self.path)
+        self.assertFalse(success)
+        self.assertIn("disk full", error)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), self.original_bytes)
+        self.assertEqual(os.listdir(self.work_dir), ['tenants.json'])
+    
+    def test_stale_expected_version_is_refused(self):
+        version = tenants_version(self.path)
+        save_tenants({'a': make_tenant('a', 'Theirs')}, {}, self.path)
+        success, error = save_tenants({'a': make_tenant('a', 'Ours')}, {}, self.path, expected_version=version)
+        self.assertFalse(success)
+        self.assertIn("was changed by another process", error)
+        self.assertEqual(load_tenants_versioned(self.path)[0]['a']['name'], 'Theirs')
+        self.assertEqual(os.listdir(self.work_dir), ['tenants.json'])
+    
+    def test_successful_save_leaves_no_temp_file(self):
+        success, error = save_tenants({'a': make_tenant('a', 'Changed')}, {}, self.path)
+        self.assertTrue(success, error)
+        self.assertEqual(load_tenants_versioned(self.path)[0]['a']['name'], 'Changed')
+        self.assertEqual(os.listdir(self.work_dir), ['tenants.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+History Tests
+Undo/redo through AppManager on a scratch copy of the registries
+
+Usage:
+    python -m unittest discover -s tests
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+TOOL_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TOOL_DIR))
+
+from repo_context import RepoContext, get_repo_context, set_repo_context
+from app_manager import AppManager
+from history import History
+
+
+class AppManagerHistoryTest(unittest.TestCase):
+    """Undo/redo of create/update/delete against a monorepo layout in a temp directory."""
+    
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix='app-manager-test-'))
+        tool_dir = self.work_dir / 'tools' / 'app-manager'
+        tool_dir.mkdir(parents=True)
+        (self.work_dir / 'apps').mkdir()
+        (self.work_dir / 'packages').mkdir()
+        for name in ('tenants.json', 'plugins.json'):
+            shutil.copy2(TOOL_DIR / name, tool_dir / name)
+        
+        self.previous_context = get_repo_context()
+        set_repo_context(RepoContext(tool_dir))
+        self.manager = AppManager()
+        self.tenant_id = next(iter(self.manager.tenants))
+        self.name = self.manager.tenants[self.tenant_id]['name']
+    
+    def tearDown(self):
+        set_repo_context(self.previous_context)
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+    
+    def test_undo_after_in_place_update_restores_original(self):
+        # The first step snapshots the whole registry; update_tenant then edits a tenant in place
+        success, msg = self.manager.create_tenant('history-test', 'History Test')
+        self.assertTrue(success, msg)
+        success, msg = self.manager.update_tenant(self.tenant_id, name='Changed Name')
+        self.assertTrue(success, msg)
+        
+        success, msg = self.manager.undo()
+        self.assertTrue(success, msg)
+        self.assertEqual(self.manager.tenants[self.tenant_id]['name'], self.name)
+        
+        success, msg = self.manager.undo()
+        self.assertTrue(success, msg)
+        self.assertNotIn('history-test', self.manager.tenants)
+        self.assertEqual(self.manager.tenants[self.tenant_id]['name'], self.name)
+        
+        # Reading from disk gives the same state
+        self.manager.invalidate()
+        self.assertNotIn('history-test', self.manager.tenants)
+        self.assertEqual(self.manager.tenants[self.tenant_id]['name'], self.name)
+    
+    def test_redo_after_undo(self):
+        success, msg = self.manager.update_tenant(self.tenant_id, name='Changed Name')
+        self.assertTrue(success, msg)
+        self.assertEqual(self.manager.undo(), (True, f"Undid: update {self.tenant_id} (name)"))
+        success, msg = self.manager.redo()
+        self.assertTrue(success, msg)
+        self.assertEqual(self.manager.tenants[self.tenant_id]['name'], 'Changed Name')
+        self.assertEqual(self.manager.redo(), (False, "Nothing to redo"))
+
+
+class HistoryTest(unittest.TestCase):
+    
+    def test_registry_callable_only_read_for_first_step(self):
+        calls = []
+        
+        def registry():
+            calls.append(1)
+            return {'a': {'name': 'A'}}
+        
+        history = History()
+        history.record("edit a", {'a': {'name': 'A'}}, {'a': {'name': 'B'}}, registry=registry)
+        history.record("edit a", {'a': {'name': 'B'}}, {'a': {'name': 'C'}}, registry=registry)
+        self.assertEqual(len(calls), 1)
+        
+        restored = {}
+        history.undo(lambda changes, expected: (restored.update(changes), (True, ''))[1])
+        self.assertEqual(restored, {'a': {'name': 'B'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
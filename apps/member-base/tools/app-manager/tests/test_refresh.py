@@ -0,0 +1,156 @@
+"""
+Refresh Tests
+Incremental packages/core and plugin refresh of a standalone repo in a temp directory
+
+Usage:
+    python -m unittest discover -s tests
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+TOOL_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TOOL_DIR))
+
+from repo_context import RepoContext, get_repo_context, set_repo_context
+from repo_generator import CORE_IGNORE, apply_tree_delta, refresh_repo, tree_delta
+
+
+def write_files(root, files):
+    for path, content in files.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(content, encoding='utf-8')
+
+
+def tree_contents(root):
+    return {
+        path.relative_to(root).as_posix(): path.read_text(encoding='utf-8')
+        for path in root.rglob('*') if path.is_file()
+    }
+
+
+class TreeDeltaTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix='app-manager-test-'))
+        self.source = self.work_dir / 'source'
+        self.target = self.work_dir / 'target'
+        write_files(self.source, {
+            'index.ts': 'export * from "./lib";\n',
+            'lib/a.ts': 'export const a = 2;\n',
+            'lib/b.ts': 'export const b = 1;\n',
+            'lib/new/c.ts': 'export const c = 1;\n',
+            'lib/a.test.ts': 'test("a");\n',
+        })
+        write_files(self.target, {
+            'index.ts': 'export * from "./lib";\n',
+            'lib/a.ts': 'export const a = 1;\n',
+            'lib/b.ts': 'export const b = 10;\n',
+            'old/gone.ts': 'export {};\n',
+            'node_modules/dep/index.js': 'module.exports = {};\n',
+        })
+    
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+    
+    def test_delta_lists_added_changed_and_removed(self):
+        added, changed, removed = tree_delta(self.source, self.target, CORE_IGNORE)
+        self.assertEqual(added, ['lib/new/c.ts'])
+        # a.ts differs only in content (same size), b.ts in size
+        self.assertEqual(changed, ['lib/a.ts', 'lib/b.ts'])
+        self.assertEqual(removed, ['old/gone.ts'])
+    
+    def test_missing_target_is_all_added(self):
+        added, changed, removed = tree_delta(self.source, self.work_dir / 'missing', CORE_IGNORE)
+        self.assertEqual(added, ['index.ts', 'lib/a.ts', 'lib/b.ts', 'lib/new/c.ts'])
+        self.assertEqual((changed, removed), ([], []))
+    
+    def test_apply_brings_target_in_line_and_second_delta_is_empty(self):
+        apply_tree_delta(self.source, self.target, *tree_delta(self.source, self.target, CORE_IGNORE))
+        
+        expected = tree_contents(self.source)
+        del expected['lib/a.test.ts']
+        expected['node_modules/dep/index.js'] = 'module.exports = {};\n'
+        self.assertEqual(tree_contents(self.target), expected)
+        # The directory emptied by the removal is gone as well
+        self.assertFalse((self.target / 'old').exists())
+        self.assertEqual(tree_delta(self.source, self.target, CORE_IGNORE), ([], [], []))
+
+
+class RefreshRepoTest(unittest.TestCase):
+    """refresh_repo from a temp monorepo into a temp standalone repo."""
+    
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix='app-manager-test-'))
+        mono = self.work_dir / 'mono'
+        tool_dir = mono / 'tools' / 'app-manager'
+        tool_dir.mkdir(parents=True)
+        (mono / 'apps').mkdir()
+        write_files(mono / 'packages', {
+            'core/index.ts': 'export const version = 2;\n',
+            'core/utils/format.ts': 'export const format = String;\n',
+            'plugins/payment/index.ts': 'export const payment = 2;\n',
+            'plugins/news/index.ts': 'export const news = 1;\n',
+        })
+        
+        self.repo = self.work_dir / 'standalone'
+        write_files(self.repo, {
+            'packages/core/index.ts': 'export const version = 1;\n',
+            'packages/core/legacy.ts': 'export {};\n',
+            'packages/plugins/payment/index.ts': 'export const payment = 1;\n',
+            'apps/acme/config/app.config.ts': 'export default {};\n',
+            'apps/acme/tools/app-manager/tenants.json': json.dumps({
+                'acme': {'id': 'acme', 'enabledFeatures': ['payment', 'loyalty']}
+            }),
+        })
+        
+        self.previous_context = get_repo_context()
+        set_repo_context(RepoContext(tool_dir))
+    
+    def tearDown(self):
+        set_repo_context(self.previous_context)
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+    
+    def test_dry_run_reports_delta_without_copying(self):
+        before = tree_contents(self.repo)
+        success, results, msg = refresh_repo(str(self.repo), dry_run=True)
+        self.assertTrue(success, msg)
+        self.assertEqual(results, [
+            ('packages/core', ['utils/format.ts'], ['index.ts'], ['legacy.ts']),
+            ('packages/plugins/payment', [], ['index.ts'], []),
+        ])
+        self.assertTrue(msg.startswith(f"Would refresh {self.repo}: 1 added, 2 changed, 1 removed"))
+        self.assertIn("left as they are: loyalty", msg)
+        self.assertEqual(tree_contents(self.repo), before)
+    
+    def test_refresh_updates_enabled_trees_then_is_up_to_date(self):
+        success, results, msg = refresh_repo(str(self.repo))
+        self.assertTrue(success, msg)
+        self.assertEqual(len(results), 2)
+        
+        contents = tree_contents(self.repo)
+        self.assertEqual(contents['packages/core/index.ts'], 'export const version = 2;\n')
+        self.assertIn('packages/core/utils/format.ts', contents)
+        self.assertNotIn('packages/core/legacy.ts', contents)
+        self.assertEqual(contents['packages/plugins/payment/index.ts'], 'export const payment = 2;\n')
+        # Plugins the repo does not enable and the app itself are left alone
+        self.assertFalse((self.repo / 'packages' / 'plugins' / 'news').exists())
+        self.assertEqual(contents['apps/acme/config/app.config.ts'], 'export default {};\n')
+        
+        success, results, msg = refresh_repo(str(self.repo))
+        self.assertTrue(success, msg)
+        self.assertEqual(results, [])
+        self.assertTrue(msg.startswith(f"{self.repo} is up to date (2 tree(s) checked)"))
+    
+    def test_refuses_repo_without_core(self):
+        success, results, msg = refresh_repo(str(self.work_dir / 'missing'))
+        self.assertFalse(success)
+        self.assertIn("is not a standalone repo", msg)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Repo Context Tests
+Layout detection and app listing on temp directory trees
+
+Usage:
+    python -m unittest discover -s tests
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+TOOL_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TOOL_DIR))
+
+from repo_context import RepoContext
+
+
+class RepoContextTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp(prefix='app-manager-test-'))
+        (self.work_dir / 'packages').mkdir()
+        for name in ('member-base', 'merchant-base', 'acme'):
+            (self.work_dir / 'apps' / name / 'config').mkdir(parents=True)
+    
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+    
+    def test_monorepo_tool_lists_apps_except_templates(self):
+        tool_dir = self.work_dir / 'tools' / 'app-manager'
+        tool_dir.mkdir(parents=True)
+        context = RepoContext(tool_dir)
+        self.assertFalse(context.standalone)
+        self.assertEqual(context.list_generated_apps(), ['acme', 'member-base'])
+    
+    def test_tool_inside_template_does_not_list_its_host_app(self):
+        tool_dir = self.work_dir / 'apps' / 'member-base' / 'tools' / 'app-manager'
+        tool_dir.mkdir(parents=True)
+        context = RepoContext(tool_dir)
+        self.assertEqual(context.host_app, 'member-base')
+        self.assertEqual(context.list_generated_apps(), ['acme'])
+    
+    def test_generated_copy_lists_its_own_app(self):
+        tool_dir = self.work_dir / 'apps' / 'acme' / 'tools' / 'app-manager'
+        tool_dir.mkdir(parents=True)
+        RepoContext(tool_dir).write_standalone_context(tool_dir, 'acme', 'acme')
+        context = RepoContext(tool_dir)
+        self.assertIsNone(context.host_app)
+        self.assertIn('acme', context.list_generated_apps())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+"""
+Source Scanner Tests
+Dependency and asset scanning on a small fixture tree in a temp directory
+
+Usage:
+    python -m unittest discover -s tests
+"""
+
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+TOOL_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TOOL_DIR))
+
+from source_scanner import (compute_required_dependencies, copy_referenced_assets, package_name,
+                            prune_package_json, scan_asset_references)
+
+
+def write_files(root, files):
+    for path, content in files.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(content, encoding='utf-8')
+
+
+class RequiredDependenciesTest(unittest.TestCase):
+    """compute_required_dependencies and prune_package_json on a fixture monorepo."""
+    
+    def setUp(self):
+        self.repo_root = Path(tempfile.mkdtemp(prefix='app-manager-test-'))
+        self.app_dir = self.repo_root / 'apps' / 'acme'
+        write_files(self.repo_root, {
+            'apps/acme/index.tsx': (
+                "import React from 'react';\n"
+                "import { View } from \"react-native\";\n"
+                "import Config from './config/app.config';\n"
+                "import '@scope/polyfill/auto';\n"
+            ),
+            'apps/acme/src/lazy.ts': (
+                "const chart = require('chart-lib');\n"
+                "const lazy = () => import('lazy-lib/dist/index');\n"
+                "export { format } from 'date-lib';\n"
+                "export * from '@ui/kit';\n"
+            ),
+            'packages/core/index.ts': "import axios from 'axios';\nimport x from '/absolute/path';\n",
+            'packages/core/__tests__/core.test.ts': "import jest from 'test-only-lib';\n",
+            'packages/core/node_modules/vendored/index.js': "require('vendored-dep');\n",
+            'packages/plugins/payment/index.ts': "import { pay } from 'pay-sdk/client';\n",
+            'packages/plugins/payment/package.json': json.dumps({
+                'dependencies': {'pay-native': '1.0.0'},
+                'peerDependencies': {'pay-peer': '*'},
+            }),
+            'packages/plugins/payment/plugin.manifest.json': json.dumps({
+                'dependencies': ['core-plugin'],
+                'npmDependencies': ['manifest-dep'],
+            }),
+            'packages/plugins/news/index.ts': "import feed from 'news-feed';\n",
+            'babel.config.js': "module.exports = { plugins: [require('babel-root-plugin')] };\n",
+        })
+        self.lock_data = {'packages': {
+            'node_modules/@ui/kit': {
+                'peerDependencies': {'react-native-svg': '*', 'optional-peer': '*'},
+                'peerDependenciesMeta': {'optional-peer': {'optional': True}},
+            },
+            'node_modules/react-native-svg': {'peerDependencies': {'svg-core': '*'}},
+            'node_modules/news-feed': {'peerDependencies': {'feed-peer': '*'}},
+        }}
+    
+    def tearDown(self):
+        shutil.rmtree(self.repo_root, ignore_errors=True)
+    
+    def test_package_name(self):
+        self.assertEqual(package_name('lodash/fp'), 'lodash')
+        self.assertEqual(package_name('@scope/pkg/sub/path'), '@scope/pkg')
+        self.assertIsNone(package_name('@scope'))
+        self.assertIsNone(package_name('./local'))
+        self.assertIsNone(package_name('/absolute'))
+    
+    def test_import_forms_scoped_packages_and_declarations(self):
+        required = compute_required_dependencies(self.repo_root, self.app_dir, ['payment'])
+        self.assertTrue({
+            'react', 'react-native',
+            '@scope/polyfill', 'chart-lib', 'lazy-lib', 'date-lib', '@ui/kit',
+            'axios', 'pay-sdk', 'pay-native', 'pay-peer', 'manifest-dep', 'babel-root-plugin',
+        } <= required)
+        # Tests, node_modules, plugin IDs and plugins that are not enabled are not scanned
+        for name in ('test-only-lib', 'vendored-dep', 'core-plugin', 'news-feed'):
+            self.assertNotIn(name, required)
+    
+    def test_lock_file_peer_dependencies_are_followed(self):
+        required = compute_required_dependencies(self.repo_root, self.app_dir, ['payment'], self.lock_data)
+        self.assertIn('react-native-svg', required)
+        # Peers of peers
+        self.assertIn('svg-core', required)
+        self.assertNotIn('optional-peer', required)
+        # Only peers of required packages
+        self.assertNotIn('feed-peer', required)
+    
+    def test_prune_keeps_required_and_dev_dependencies(self):
+        package_data = {
+            'name': 'monorepo',
+            'dependencies': {'react': '18', 'axios': '1', 'unused-lib': '2', '@scope/unused': '3'},
+            'devDependencies': {'typescript': '5'},
+        }
+        required = compute_required_dependencies(self.repo_root, self.app_dir, ['payment'])
+        pruned, removed = prune_package_json(package_data, required)
+        self.assertEqual(pruned['dependencies'], {'react': '18', 'axios': '1'})
+        self.assertEqual(pruned['devDependencies'], {'typescript': '5'})
+        self.assertEqual(pruned['name'], 'monorepo')
+        self.assertEqual(removed, ['@scope/unused', 'unused-lib'])
+        # The input is left as it was
+        self.assertIn('unused-lib', package_data['dependencies'])
+
+class AssetReferencesTest(unittest.TestCase):
+    """scan_asset_references and copy_referenced_assets on a fixture monorepo."""
+    
+    def setUp(self):
+        self.repo_root = Path(tempfile.mkdtemp(prefix='app-manager-test-'))
+        self.app_dir = self.repo_root / 'apps' / 'acme'
+        write_files(self.repo_root, {
+            'apps/acme/src/Logo.tsx': (
+                "const logo = require('../../../assets/images/logo.png');\n"
+                "import banner from 'assets/images/banner.jpg';\n"
+                "const missing = require('../../../assets/images/missing.png');\n"
+            ),
+            'packages/core/config/utils/fonts.ts': (
+                "export const FONTS = { regular: 'Inter-Regular', bold: \"Inter-Bold\" };\n"
+            ),
+            'packages/plugins/payment/Icon.tsx': "const icon = require('../../../assets/icons/pay.png');\n",
+            'packages/plugins/news/Icon.tsx': "const icon = require('../../../assets/icons/news.png');\n",
+            'ios/Acme/Info.plist': '<key>UIAppFonts</key>\n<array><string>Brand-Icons.ttf</string></array>\n',
+            'ios/Pods/Other/Info.plist': '<string>pods-only.png</string>\n',
+            'android/link-assets-manifest.json': json.dumps({'data': [{'path': 'assets/sounds/chime.mp3'}]}),
+            'react-native.config.js': "module.exports = { assets: ['./assets/linked/'] };\n",
+            'assets/images/logo.png': 'png',
+            'assets/images/banner.jpg': 'jpg',
+            'assets/images/unused.png': 'unused',
+            'assets/icons/pay.png': 'pay',
+            'assets/icons/news.png': 'news',
+            'assets/icons/pods-only.png': 'pods',
+            'assets/fonts/Inter-Regular.ttf': 'font',
+            'assets/fonts/Inter-Bold.otf': 'font',
+            'assets/fonts/Inter-Italic.ttf': 'font',
+            'assets/fonts/Brand-Icons.ttf': 'font',
+            'assets/sounds/chime.mp3': 'mp3',
+            'assets/linked/nested/splash.png': 'splash',
+        })
+    
+    def tearDown(self):
+        shutil.rmtree(self.repo_root, ignore_errors=True)
+    
+    def test_referenced_assets(self):
+        referenced = scan_asset_references(self.repo_root, self.app_dir, ['payment'])
+        self.assertEqual(sorted(path.as_posix() for path in referenced), [
+            # Native project names: fonts listed in Info.plist and link-assets-manifest.json entries
+            'fonts/Brand-Icons.ttf',
+            # Font names from fonts.ts, .ttf and .otf
+            'fonts/Inter-Bold.otf',
+            'fonts/Inter-Regular.ttf',
+            # Required by the enabled plugin only
+            'icons/pay.png',
+            # Relative and assets/ rooted imports
+            'images/banner.jpg',
+            'images/logo.png',
+            # Everything in a linked asset directory
+            'linked/nested/splash.png',
+            'sounds/chime.mp3',
+        ])
+    
+    def test_no_assets_dir(self):
+        shutil.rmtree(self.repo_root / 'assets')
+        self.assertEqual(scan_asset_references(self.repo_root, self.app_dir, ['payment']), set())
+    
+    def test_copy_referenced_assets(self):
+        referenced = scan_asset_references(self.repo_root, self.app_dir, ['payment'])
+        target = self.repo_root / 'out' / 'assets'
+        copied, dropped, dropped_bytes = copy_referenced_assets(self.repo_root / 'assets', target, referenced)
+        self.assertEqual((copied, dropped), (8, 4))
+        self.assertEqual(dropped_bytes, len('unused') + len('news') + len('pods') + len('font'))
+        self.assertEqual(sorted(path.relative_to(target) for path in target.rglob('*') if path.is_file()),
+                         sorted(referenced))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Tenant Edits Tests
+Per-field unsaved changes over a saved registry
+
+Usage:
+    python -m unittest discover -s tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+TOOL_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TOOL_DIR))
+
+from tenant_edits import REMOVED, TenantEdits
+
+
+class TenantEditsTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.saved = {
+            'acme': {'id': 'acme', 'name': 'Acme', 'role': 'member', 'homeVariant': 'member'},
+            'globex': {'id': 'globex', 'name': 'Globex', 'role': 'merchant'},
+        }
+        self.edits = TenantEdits()
+    
+    def test_only_changed_fields_are_kept(self):
+        self.edits.set_tenant(self.saved, 'acme', dict(self.saved['acme'], name='Acme Corp'))
+        self.assertEqual(self.edits.changes, {'acme': {'name': 'Acme Corp'}})
+        self.assertEqual(self.edits.get(self.saved, 'acme')['name'], 'Acme Corp')
+        self.assertEqual(self.edits.get(self.saved, 'globex'), self.saved['globex'])
+        # The saved registry is never modified
+        self.assertEqual(self.saved['acme']['name'], 'Acme')
+    
+    def test_editing_back_to_saved_state_is_clean(self):
+        self.edits.set_tenant(self.saved, 'acme', dict(self.saved['acme'], name='Acme Corp'))
+        self.assertIn('acme', self.edits)
+        self.edits.set_tenant(self.saved, 'acme', dict(self.saved['acme']))
+        self.assertNotIn('acme', self.edits)
+        self.assertFalse(self.edits)
+        self.assertEqual(self.edits.dirty_ids(), [])
+    
+    def test_removed_field_uses_sentinel(self):
+        tenant = dict(self.saved['acme'])
+        del tenant['homeVariant']
+        self.edits.set_tenant(self.saved, 'acme', tenant)
+        self.assertIs(self.edits.changes['acme']['homeVariant'], REMOVED)
+        self.assertNotIn('homeVariant', self.edits.get(self.saved, 'acme'))
+        self.assertEqual(self.edits.apply(self.saved)['acme'], tenant)
+        # Putting the field back makes the tenant clean again
+        self.edits.set_tenant(self.saved, 'acme', dict(self.saved['acme']))
+        self.assertNotIn('acme', self.edits)
+    
+    def test_new_unsaved_tenant_holds_all_fields(self):
+        tenant = {'id': 'initech', 'name': 'Initech', 'role': 'member'}
+        self.edits.set_tenant(self.saved, 'initech', tenant)
+        self.assertEqual(self.edits.changes['initech'], tenant)
+        self.assertTrue(self.edits.exists(self.saved, 'initech'))
+        self.assertEqual(self.edits.get(self.saved, 'initech'), tenant)
+        self.assertEqual(self.edits.base(self.saved), {'initech': None})
+        self.assertEqual(self.edits.apply(self.saved)['initech'], tenant)
+    
+    def test_deleted_tenant(self):
+        self.edits.set_tenant(self.saved, 'acme', dict(self.saved['acme'], name='Acme Corp'))
+        self.edits.delete(self.saved, 'acme')
+        self.assertIsNone(self.edits.changes['acme'])
+        self.assertIsNone(self.edits.get(self.saved, 'acme'))
+        self.assertFalse(self.edits.exists(self.saved, 'acme'))
+        self.assertEqual(self.edits.base(self.saved), {'acme': self.saved['acme']})
+        self.assertNotIn('acme', self.edits.apply(self.saved))
+    
+    def test_deleting_unsaved_tenant_drops_it(self):
+        self.edits.set_tenant(self.saved, 'initech', {'id': 'initech', 'name': 'Initech'})
+        self.edits.delete(self.saved, 'initech')
+        self.assertNotIn('initech', self.edits)
+        self.assertFalse(self.edits.exists(self.saved, 'initech'))
+        self.assertEqual(self.edits.apply(self.saved), self.saved)
+
+
+class RebaseTest(unittest.TestCase):
+    """rebase() of edits onto a registry another writer saved."""
+    
+    def setUp(self):
+        self.old = {'acme': {'id': 'acme', 'name': 'Acme', 'role': 'member', 'theme': 'blue'}}
+        self.edits = TenantEdits()
+        self.edits.set_tenant(self.old, 'acme', dict(self.old['acme'], name='Acme Corp'))
+    
+    def test_other_field_changed_is_merged(self):
+        new = {'acme': dict(self.old['acme'], theme='red')}
+        self.assertFalse(self.edits.rebase(self.old, new, 'acme'))
+        self.assertEqual(self.edits.get(new, 'acme'), dict(self.old['acme'], name='Acme Corp', theme='red'))
+    
+    def test_same_field_changed_differently_is_a_conflict(self):
+        new = {'acme': dict(self.old['acme'], name='Acme Inc')}
+        self.assertTrue(self.edits.rebase(self.old, new, 'acme'))
+        self.assertEqual(self.edits.get(new, 'acme')['name'], 'Acme Corp')
+    
+    def test_same_change_there_leaves_tenant_clean(self):
+        new = {'acme': dict(self.old['acme'], name='Acme Corp')}
+        self.assertFalse(self.edits.rebase(self.old, new, 'acme'))
+        self.assertNotIn('acme', self.edits)
+    
+    def test_deleted_there_is_a_conflict(self):
+        self.assertTrue(self.edits.rebase(self.old, {}, 'acme'))
+        self.assertEqual(self.edits.get({}, 'acme'), dict(self.old['acme'], name='Acme Corp'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Tenant Query Tests
+Tenant filters with and without a TenantIndex
+
+Usage:
+    python -m unittest discover -s tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+TOOL_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TOOL_DIR))
+
+from tenant_query import SortedTenantIds, TenantFilter, TenantIndex, iter_matching
+
+
+TENANTS = {
+    'zeta': {'name': 'Zeta Shop', 'role': 'merchant', 'homeVariant': 'merchant',
+             'enabledFeatures': ['payment', 'news']},
+    'acme': {'name': 'Acme', 'role': 'member', 'homeVariant': 'member', 'enabledFeatures': ['payment']},
+    'beta': {'name': 'Beta Mart', 'role': 'merchant', 'enabledFeatures': ['payment']},
+    'gamma': {'name': 'Gamma', 'role': 'member', 'enabledFeatures': []},
+}
+
+
+class TenantQueryTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.index = TenantIndex(TENANTS)
+    
+    def query(self, **kwargs):
+        """Matching IDs without and with the index (which must agree)."""
+        tenant_filter = TenantFilter(**kwargs)
+        plain = [tenant_id for tenant_id, _ in iter_matching(TENANTS, tenant_filter)]
+        indexed = [tenant_id for tenant_id, _ in iter_matching(TENANTS, tenant_filter, self.index)]
+        self.assertEqual(plain, indexed)
+        return plain
+    
+    def test_empty_filter_matches_all_sorted(self):
+        self.assertTrue(TenantFilter().is_empty())
+        self.assertEqual(self.query(), ['acme', 'beta', 'gamma', 'zeta'])
+    
+    def test_role(self):
+        self.assertEqual(self.query(role='merchant'), ['beta', 'zeta'])
+        self.assertEqual(self.query(role='admin'), [])
+    
+    def test_features_must_all_be_enabled(self):
+        self.assertEqual(self.query(features=['payment']), ['acme', 'beta', 'zeta'])
+        self.assertEqual(self.query(features=['payment', 'news']), ['zeta'])
+        self.assertEqual(self.query(features=['unknown']), [])
+    
+    def test_home_variant_defaults_to_dashboard(self):
+        self.assertEqual(self.query(home_variant='dashboard'), ['beta', 'gamma'])
+        self.assertEqual(self.query(home_variant='member'), ['acme'])
+    
+    def test_name_glob_matches_name_or_id_case_insensitively(self):
+        self.assertEqual(self.query(name='*MART'), ['beta'])
+        self.assertEqual(self.query(name='a*'), ['acme'])
+        self.assertEqual(self.query(name='*a*', role='member'), ['acme', 'gamma'])
+    
+    def test_combined_filters(self):
+        self.assertEqual(self.query(role='merchant', features=['payment'], name='*shop'), ['zeta'])
+        self.assertEqual(self.query(role='member', features=['news']), [])
+    
+    def test_candidates(self):
+        self.assertIsNone(self.index.candidates(TenantFilter(name='a*')))
+        self.assertEqual(self.index.candidates(TenantFilter(role='merchant', features=['news'])), {'zeta'})
+
+
+class SortedTenantIdsTest(unittest.TestCase):
+    
+    def test_add_remove_and_search(self):
+        ids = SortedTenantIds(TENANTS)
+        self.assertEqual(ids.ids, ['acme', 'beta', 'gamma', 'zeta'])
+        self.assertEqual(ids.add('delta', 'Delta Store'), 2)
+        self.assertEqual(ids.search('store'), ['delta'])
+        self.assertEqual(ids.search('MA'), ['beta', 'gamma'])
+        self.assertEqual(ids.search('a', within=['acme', 'zeta']), ['acme', 'zeta'])
+        self.assertEqual(ids.remove('beta'), 1)
+        self.assertEqual(ids.remove('beta'), -1)
+        self.assertEqual(ids.ids, ['acme', 'delta', 'gamma', 'zeta'])
+        self.assertEqual(ids.index_of('zeta'), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
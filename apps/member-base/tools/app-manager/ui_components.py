@@ -3,9 +3,24 @@ UI Components Module
 Reusable Tkinter UI component classes
 """
 
+import os
+import bisect
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import ttk
-from typing import Dict, Callable, Optional
+from typing import Dict, Callable, List, Optional, Set, Tuple
+
+from tenant_query import SortedTenantIds
+
+
+# Milliseconds to wait after the last keystroke before filtering
+FILTER_DELAY_MS = 150
+
+# Rows scrolled per mouse wheel step
+WHEEL_ROWS = 3
+
+# Category for plugins without a "category" in plugins.json
+DEFAULT_PLUGIN_CATEGORY = 'Other'
 
 
 class TenantDetailFrame(ttk.Frame):
@@ -216,77 +231,832 @@ class TenantDetailFrame(ttk.Frame):
 
 
 class PluginMatrixFrame(ttk.LabelFrame):
-    """Frame with checkboxes for each plugin."""
+    """
+    Plugin selection as a Treeview grouped by category, with a search box.
+    
+    Plugins are Treeview rows rather than one Checkbutton and Label widget
+    each, and the enabled state is a set: loading a tenant only re-renders
+    the rows whose state differs from the previous tenant.
+    """
     
     def __init__(self, parent, plugins: Dict, on_change: Optional[Callable] = None):
         super().__init__(parent, text="Plugins", padding="10")
-        self.plugins = plugins
+        self.plugins: Dict = {}
         self.on_change = on_change
-        self.checkboxes: Dict[str, tk.BooleanVar] = {}
+        self.enabled: Set[str] = set()
+        self.category_of: Dict[str, str] = {}
+        self.members: Dict[str, List[str]] = {}
+        self.categories: List[str] = []
+        self.grouped = False
+        self._enabled_count: Dict[str, int] = {}
+        self._search_text: Dict[str, str] = {}
+        self._query = ''
+        self._filter_job = None
         
         self._create_widgets()
+        self.set_plugins(plugins)
     
     def _create_widgets(self):
-        """Create checkboxes for each plugin."""
-        # Create a scrollable frame
-        canvas = tk.Canvas(self, height=150)
-        scrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        """Create the search box and the plugin tree."""
+        self.filter_var = tk.StringVar()
+        filter_entry = ttk.Entry(self, textvariable=self.filter_var)
+        filter_entry.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 5))
+        self.filter_var.trace('w', self._on_filter_change)
         
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Create checkboxes
-        row = 0
-        for plugin_id in sorted(self.plugins.keys()):
-            plugin_info = self.plugins[plugin_id]
-            label_text = plugin_info.get('label', plugin_id)
-            description = plugin_info.get('description', '')
-            
-            var = tk.BooleanVar()
-            self.checkboxes[plugin_id] = var
-            
-            checkbox = ttk.Checkbutton(
-                scrollable_frame,
-                text=f"{label_text} ({plugin_id})",
-                variable=var,
-                command=self._on_checkbox_change
-            )
-            checkbox.grid(row=row, column=0, sticky="w", pady=2)
-            
-            if description:
-                desc_label = ttk.Label(
-                    scrollable_frame,
-                    text=f"  └ {description}",
-                    foreground="gray",
-                    font=("TkDefaultFont", 8)
-                )
-                desc_label.grid(row=row, column=1, sticky="w", padx=(10, 0), pady=2)
-            
-            row += 1
-        
-        canvas.grid(row=0, column=0, sticky="nsew")
-        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.tree = ttk.Treeview(self, columns=('description',), show='tree', height=6, selectmode='browse')
+        self.tree.column('#0', width=240, stretch=False)
+        self.tree.column('description', width=200, stretch=True)
+        self.tree.tag_configure('category', font=("TkDefaultFont", 9, "bold"))
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        self.tree.bind('<ButtonRelease-1>', self._on_click)
+        self.tree.bind('<space>', self._on_space)
+        
+        self.tree.grid(row=1, column=0, sticky="nsew")
+        scrollbar.grid(row=1, column=1, sticky="ns")
         
         self.columnconfigure(0, weight=1)
-        self.rowconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+    
+    def set_plugins(self, plugins: Dict):
+        """Replace the plugin registry (initial load and reload), keeping enabled plugins that still exist."""
+        # Detached (filtered out) rows are not children of the root, so delete by ID
+        for iid in list(self.plugins) + [self._category_iid(category) for category in self.categories]:
+            if self.tree.exists(iid):
+                self.tree.delete(iid)
+        
+        self.plugins = plugins
+        self.enabled &= set(plugins)
+        
+        # Plugins per category, both sorted; a single category is shown without group rows
+        self.category_of = {}
+        self.members = {}
+        for plugin_id in sorted(plugins):
+            category = plugins[plugin_id].get('category') or DEFAULT_PLUGIN_CATEGORY
+            self.category_of[plugin_id] = category
+            self.members.setdefault(category, []).append(plugin_id)
+        self.categories = sorted(self.members)
+        self.grouped = len(self.categories) > 1
+        self._enabled_count = {
+            category: sum(1 for plugin_id in members if plugin_id in self.enabled)
+            for category, members in self.members.items()
+        }
+        self._search_text = {
+            plugin_id: f"{plugin_id}\n{info.get('label', '')}\n{info.get('description', '')}\n"
+                       f"{self.category_of[plugin_id]}".lower()
+            for plugin_id, info in plugins.items()
+        }
+        
+        # Rows are created once; filtering only detaches and reattaches them
+        for category in self.categories:
+            if self.grouped:
+                self.tree.insert('', tk.END, iid=self._category_iid(category), open=True, tags=('category',),
+                                 text=self._category_text(category))
+            parent = self._category_iid(category) if self.grouped else ''
+            for plugin_id in self.members[category]:
+                self.tree.insert(parent, tk.END, iid=plugin_id, text=self._plugin_text(plugin_id),
+                                 values=(plugins[plugin_id].get('description', ''),))
+        
+        # Re-apply the current search to the new rows
+        self._query = ''
+        self._apply_filter()
+    
+    @staticmethod
+    def _category_iid(category: str) -> str:
+        return f"category:{category}"
     
-    def _on_checkbox_change(self):
-        """Callback when checkbox is toggled."""
+    def _category_text(self, category: str) -> str:
+        return f"{category} ({self._enabled_count[category]}/{len(self.members[category])})"
+    
+    def _plugin_text(self, plugin_id: str) -> str:
+        mark = '☑' if plugin_id in self.enabled else '☐'
+        return f"{mark} {self.plugins[plugin_id].get('label', plugin_id)} ({plugin_id})"
+    
+    def _update_rows(self, changed: Set[str]):
+        """Re-render the rows (and category counts) of plugins whose state changed."""
+        for plugin_id in changed:
+            self.tree.item(plugin_id, text=self._plugin_text(plugin_id))
+            self._enabled_count[self.category_of[plugin_id]] += 1 if plugin_id in self.enabled else -1
+        if self.grouped:
+            for category in {self.category_of[plugin_id] for plugin_id in changed}:
+                self.tree.item(self._category_iid(category), text=self._category_text(category))
+    
+    def _toggle(self, plugin_id: str):
+        if plugin_id in self.enabled:
+            self.enabled.remove(plugin_id)
+        else:
+            self.enabled.add(plugin_id)
+        self._update_rows({plugin_id})
         if self.on_change:
             self.on_change()
     
+    def _on_click(self, event):
+        """Toggle a plugin when its row is clicked (category rows just open and close)."""
+        plugin_id = self.tree.identify_row(event.y)
+        if plugin_id in self.plugins:
+            self._toggle(plugin_id)
+    
+    def _on_space(self, event):
+        plugin_id = self.tree.focus()
+        if plugin_id in self.plugins:
+            self._toggle(plugin_id)
+        return "break"
+    
+    def _on_filter_change(self, *args):
+        if self._filter_job:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(FILTER_DELAY_MS, self._apply_filter)
+    
+    def _apply_filter(self):
+        """Show only plugins matching the search (by ID, label, description or category)."""
+        self._filter_job = None
+        query = self.filter_var.get().strip().lower()
+        if query == self._query:
+            return
+        self._query = query
+        
+        visible_categories = []
+        for category in self.categories:
+            visible = [plugin_id for plugin_id in self.members[category]
+                       if not query or query in self._search_text[plugin_id]]
+            if not self.grouped:
+                self.tree.set_children('', *visible)
+            elif visible:
+                self.tree.set_children(self._category_iid(category), *visible)
+                visible_categories.append(self._category_iid(category))
+        if self.grouped:
+            self.tree.set_children('', *visible_categories)
+    
     def set_enabled_features(self, enabled_features: list):
-        """Set checkboxes based on enabled features list."""
-        for plugin_id, var in self.checkboxes.items():
-            var.set(plugin_id in enabled_features)
+        """Set checkboxes based on enabled features list (only rows that change are touched)."""
+        enabled = {plugin_id for plugin_id in enabled_features if plugin_id in self.plugins}
+        changed = enabled ^ self.enabled
+        self.enabled = enabled
+        self._update_rows(changed)
     
     def get_enabled_features(self) -> list:
         """Get list of enabled plugin IDs."""
-        return [plugin_id for plugin_id, var in self.checkboxes.items() if var.get()]
+        return sorted(self.enabled)
+
+
+class VirtualTenantList(ttk.Frame):
+    """
+    Searchable tenant list that only puts the visible rows into the Listbox.
+    
+    IDs live in a SortedTenantIds index that is updated in place on add and
+    remove, and the Listbox holds one screenful of the filtered view, so
+    scrolling and filtering cost the same with ten tenants or ten thousand.
+    
+    Ctrl+click toggles a tenant in the multi-selection, Shift+click selects
+    a range of the filtered view and Ctrl+A all of it. The selected tenant
+    (the one on_select shows) is always part of the multi-selection.
+    """
+    
+    def __init__(self, parent, on_select: Optional[Callable[[str], None]] = None):
+        super().__init__(parent)
+        self.on_select = on_select
+        self.index = SortedTenantIds()
+        self.view: List[str] = []      # Filtered, sorted IDs
+        self.offset = 0                # Position in view of the first visible row
+        self.rows = 1                  # Rows that fit in the Listbox
+        self.selected_id: Optional[str] = None
+        self.selected_ids: Set[str] = set()   # Multi-selection (kept across filtering and scrolling)
+        self._anchor: Optional[str] = None    # Where Shift+click ranges start
+        self._query = ''
+        self._filter_job = None
+        
+        self._create_widgets()
+    
+    def _create_widgets(self):
+        """Create the filter box, the Listbox and its scrollbar."""
+        self.filter_var = tk.StringVar()
+        filter_entry = ttk.Entry(self, textvariable=self.filter_var)
+        filter_entry.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 5))
+        self.filter_var.trace('w', self._on_filter_change)
+        
+        self.listbox = tk.Listbox(self, selectmode=tk.SINGLE, exportselection=False)
+        self.listbox.grid(row=1, column=0, sticky="nsew")
+        self.listbox.bind('<<ListboxSelect>>', self._on_listbox_select)
+        self.listbox.bind('<Configure>', self._on_resize)
+        self.listbox.bind('<MouseWheel>', self._on_wheel)
+        self.listbox.bind('<Button-4>', self._on_wheel)
+        self.listbox.bind('<Button-5>', self._on_wheel)
+        self.listbox.bind('<Up>', lambda e: self._move_selection(-1))
+        self.listbox.bind('<Down>', lambda e: self._move_selection(1))
+        self.listbox.bind('<Prior>', lambda e: self._move_selection(-self.rows))
+        self.listbox.bind('<Next>', lambda e: self._move_selection(self.rows))
+        self.listbox.bind('<Control-Button-1>', self._on_control_click)
+        self.listbox.bind('<Shift-Button-1>', self._on_shift_click)
+        self.listbox.bind('<Control-a>', lambda e: self.select_all())
+        
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        
+        self.count_var = tk.StringVar(value="")
+        ttk.Label(self, textvariable=self.count_var, foreground="gray").grid(
+            row=2, column=0, columnspan=2, sticky="w", pady=(2, 0)
+        )
+        
+        font = tkfont.Font(font=self.listbox.cget('font'))
+        self._row_height = font.metrics('linespace') + 2 * int(self.listbox.cget('selectborderwidth'))
+        
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+    
+    def set_tenants(self, tenants: Dict):
+        """Replace all tenants (initial load and reload)."""
+        self.index = SortedTenantIds(tenants)
+        if self.selected_id not in self.index:
+            self.selected_id = None
+        self.selected_ids = {tenant_id for tenant_id in self.selected_ids if tenant_id in self.index}
+        self.view = self.index.search(self._query)
+        self._scroll_to(0)
+    
+    def add(self, tenant_id: str, name: str = ''):
+        """Insert one tenant at its sorted position."""
+        self.index.add(tenant_id, name)
+        if self.index.matches(tenant_id, self._query):
+            position = bisect.bisect_left(self.view, tenant_id)
+            if position == len(self.view) or self.view[position] != tenant_id:
+                self.view.insert(position, tenant_id)
+        self._render()
+    
+    def remove(self, tenant_id: str):
+        """Remove one tenant."""
+        self.index.remove(tenant_id)
+        position = bisect.bisect_left(self.view, tenant_id)
+        if position < len(self.view) and self.view[position] == tenant_id:
+            del self.view[position]
+        if self.selected_id == tenant_id:
+            self.selected_id = None
+        self.selected_ids.discard(tenant_id)
+        self._scroll_to(self.offset)
+    
+    def set_name(self, tenant_id: str, name: str):
+        """Update the name a tenant is found by in the filter."""
+        self.index.set_name(tenant_id, name)
+    
+    def select(self, tenant_id: Optional[str], notify: bool = True):
+        """
+        Select a tenant and scroll it into view.
+        
+        Args:
+            tenant_id: Tenant to select (None clears the selection)
+            notify: Call on_select like a click would
+        """
+        self.selected_id = tenant_id
+        self.selected_ids = {tenant_id} if tenant_id else set()
+        self._anchor = tenant_id
+        position = bisect.bisect_left(self.view, tenant_id) if tenant_id else -1
+        if 0 <= position < len(self.view) and self.view[position] == tenant_id:
+            if position < self.offset:
+                self.offset = position
+            elif position >= self.offset + self.rows:
+                self.offset = position - self.rows + 1
+        self._render()
+        if notify and tenant_id and self.on_select:
+            self.on_select(tenant_id)
+    
+    def first(self) -> Optional[str]:
+        """First tenant ID in the filtered view."""
+        return self.view[0] if self.view else None
+    
+    def get_selection(self) -> List[str]:
+        """Multi-selected tenant IDs, sorted."""
+        return sorted(self.selected_ids)
+    
+    def select_all(self):
+        """Add every tenant in the filtered view to the multi-selection."""
+        self.selected_ids.update(self.view)
+        self._render()
+        return "break"
+    
+    def _position_at(self, event) -> Optional[int]:
+        """Position in view of the row under the mouse."""
+        position = self.offset + self.listbox.nearest(event.y)
+        return position if 0 <= position < len(self.view) else None
+    
+    def _on_control_click(self, event):
+        """Toggle a tenant in the multi-selection (the shown tenant stays selected)."""
+        position = self._position_at(event)
+        if position is not None:
+            tenant_id = self.view[position]
+            if tenant_id in self.selected_ids and tenant_id != self.selected_id:
+                self.selected_ids.discard(tenant_id)
+            else:
+                self.selected_ids.add(tenant_id)
+            self._anchor = tenant_id
+            self._render()
+        return "break"
+    
+    def _on_shift_click(self, event):
+        """Multi-select the range of the filtered view between the last clicked tenant and this one."""
+        position = self._position_at(event)
+        if position is not None:
+            anchor = bisect.bisect_left(self.view, self._anchor) if self._anchor else position
+            if not (anchor < len(self.view) and self.view[anchor] == self._anchor):
+                anchor = position
+            first, last = sorted((anchor, position))
+            self.selected_ids = set(self.view[first:last + 1])
+            if self.selected_id:
+                self.selected_ids.add(self.selected_id)
+            self._render()
+        return "break"
+    
+    def _on_filter_change(self, *args):
+        if self._filter_job:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(FILTER_DELAY_MS, self._apply_filter)
+    
+    def _apply_filter(self):
+        """Filter the view, narrowing the previous result when the query only got longer."""
+        self._filter_job = None
+        query = self.filter_var.get().strip().lower()
+        if query == self._query:
+            return
+        within = self.view if self._query and self._query in query else None
+        self._query = query
+        self.view = self.index.search(query, within)
+        self._scroll_to(0)
+    
+    def _render(self):
+        """Put the visible slice of the view into the Listbox."""
+        total = len(self.view)
+        visible = self.view[self.offset:self.offset + self.rows]
+        self.listbox.delete(0, tk.END)
+        if visible:
+            self.listbox.insert(tk.END, *visible)
+        
+        for row, tenant_id in enumerate(visible):
+            if tenant_id in self.selected_ids or tenant_id == self.selected_id:
+                self.listbox.selection_set(row)
+        
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        
+        if total == len(self.index):
+            count = f"{total} tenant(s)"
+        else:
+            count = f"{total} of {len(self.index)} tenant(s)"
+        if len(self.selected_ids) > 1:
+            count += f", {len(self.selected_ids)} selected"
+        self.count_var.set(count)
+    
+    def _scroll_to(self, offset: int):
+        self.offset = max(0, min(offset, len(self.view) - self.rows))
+        self._render()
+    
+    def _on_resize(self, event):
+        border = 2 * (int(self.listbox.cget('borderwidth')) + int(self.listbox.cget('highlightthickness')))
+        rows = max(1, (event.height - border) // self._row_height)
+        if rows != self.rows:
+            self.rows = rows
+            self._scroll_to(self.offset)
+    
+    def _on_scrollbar(self, action, *args):
+        """Handle scrollbar drags ('moveto') and arrow/page clicks ('scroll')."""
+        if action == 'moveto':
+            self._scroll_to(int(float(args[0]) * len(self.view)))
+        elif action == 'scroll':
+            amount, unit = int(args[0]), args[1]
+            self._scroll_to(self.offset + amount * (self.rows if unit == 'pages' else 1))
+    
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._scroll_to(self.offset - WHEEL_ROWS)
+        else:
+            self._scroll_to(self.offset + WHEEL_ROWS)
+        return "break"
+    
+    def _on_listbox_select(self, event):
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+        position = self.offset + selection[0]
+        if position < len(self.view):
+            self.selected_id = self.view[position]
+            dropped_multi = len(self.selected_ids) > 1
+            self.selected_ids = {self.selected_id}
+            self._anchor = self.selected_id
+            if dropped_multi:
+                # Refresh the selected count (the Listbox already shows just this row)
+                self._render()
+            if self.on_select:
+                self.on_select(self.selected_id)
+    
+    def _move_selection(self, delta: int):
+        """Move the selection by delta rows, scrolling past the visible slice as needed."""
+        if not self.view:
+            return "break"
+        position = bisect.bisect_left(self.view, self.selected_id) if self.selected_id else -1
+        if 0 <= position < len(self.view) and self.view[position] == self.selected_id:
+            position = max(0, min(len(self.view) - 1, position + delta))
+        else:
+            # Nothing selected in the view yet: start at the first visible row
+            position = self.offset
+        self.select(self.view[position])
+        return "break"
+
+
+class GenerationProgressDialog(tk.Toplevel):
+    """
+    Non-modal window showing a running generation: progress bar, current
+    phase, files/bytes copied and throughput, with a Cancel button.
+    
+    It only displays what it is given through update_progress(); the owner
+    polls the worker and decides when to close it.
+    """
+    
+    def __init__(self, parent, title: str, on_cancel: Optional[Callable] = None):
+        super().__init__(parent)
+        self.title(title)
+        self.transient(parent)
+        self.resizable(False, False)
+        self.on_cancel = on_cancel
+        self.cancelling = False
+        
+        self._create_widgets()
+        
+        # Closing the window counts as cancelling
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+    
+    def _create_widgets(self):
+        """Create the phase label, progress bar, statistics label and Cancel button."""
+        frame = ttk.Frame(self, padding="10")
+        frame.grid(row=0, column=0, sticky="nsew")
+        
+        self.phase_var = tk.StringVar(value="Starting...")
+        ttk.Label(frame, textvariable=self.phase_var, width=50).grid(row=0, column=0, sticky="w")
+        
+        self.progress_bar = ttk.Progressbar(frame, mode='determinate', length=360, maximum=1)
+        self.progress_bar.grid(row=1, column=0, sticky="ew", pady=(5, 5))
+        
+        self.stats_var = tk.StringVar(value="")
+        ttk.Label(frame, textvariable=self.stats_var, foreground="gray").grid(row=2, column=0, sticky="w")
+        
+        self.cancel_button = ttk.Button(frame, text="Cancel", command=self.cancel)
+        self.cancel_button.grid(row=3, column=0, sticky="e", pady=(10, 0))
+    
+    def update_progress(self, snapshot: Dict):
+        """Show a GenerationProgress.snapshot()."""
+        from source_scanner import format_bytes
+        
+        if not self.cancelling:
+            self.phase_var.set(snapshot['phase'] or "Starting...")
+        total = snapshot['total_files']
+        self.progress_bar.configure(maximum=max(total, 1), value=snapshot['files'])
+        self.stats_var.set(
+            f"{snapshot['files']} / {total} files, {format_bytes(snapshot['bytes'])} "
+            f"in {snapshot['elapsed']:.1f}s ({format_bytes(int(snapshot['bytes_per_second']))}/s)"
+        )
+    
+    def cancel(self):
+        """Ask the owner to cancel; the window stays open until the worker has stopped."""
+        if self.cancelling:
+            return
+        self.cancelling = True
+        self.cancel_button.configure(state=tk.DISABLED)
+        self.phase_var.set("Cancelling...")
+        if self.on_cancel:
+            self.on_cancel()
+
+
+class ValidationPanel(ttk.LabelFrame):
+    """
+    Non-modal list of validation problems, one row per tenant.
+    
+    Double-clicking a row calls on_select with its tenant ID. The panel hides
+    itself while there is nothing to show or after Dismiss.
+    """
+    
+    def __init__(self, parent, on_select: Optional[Callable[[str], None]] = None):
+        super().__init__(parent, text="Validation Warnings", padding="5")
+        self.on_select = on_select
+        self.tenant_ids: List[str] = []
+        
+        self._create_widgets()
+    
+    def _create_widgets(self):
+        """Create the problem list and the Dismiss button."""
+        self.listbox = tk.Listbox(self, height=4, selectmode=tk.SINGLE, exportselection=False, foreground="#B00020")
+        self.listbox.grid(row=0, column=0, sticky="nsew")
+        self.listbox.bind('<Double-Button-1>', self._on_double_click)
+        
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.listbox.yview)
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.listbox.configure(yscrollcommand=scrollbar.set)
+        
+        ttk.Label(self, text="Double-click a row to open the tenant. You can still edit and save.",
+                  foreground="gray").grid(row=1, column=0, sticky="w", pady=(2, 0))
+        ttk.Button(self, text="Dismiss", command=self.grid_remove).grid(row=1, column=1, sticky="e", pady=(2, 0))
+        
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+    
+    def set_problems(self, problems: List[Tuple[str, str]]):
+        """
+        Show (tenant_id, message) problems, or hide the panel if there are none.
+        
+        The panel must have been placed with grid() before.
+        """
+        self.tenant_ids = [tenant_id for tenant_id, _ in problems]
+        self.listbox.delete(0, tk.END)
+        if problems:
+            self.listbox.insert(tk.END, *[message for _, message in problems])
+            self.configure(text=f"Validation Warnings ({len(problems)})")
+            self.grid()
+        else:
+            self.grid_remove()
+    
+    def _on_double_click(self, event):
+        selection = self.listbox.curselection()
+        if selection and self.on_select:
+            self.on_select(self.tenant_ids[selection[0]])
+
+
+class ConfigPreviewFrame(ttk.Frame):
+    """
+    Read-only view of a tenant's rendered app.config.ts, or of its diff
+    against the file in the generated app.
+    
+    It only displays what it is given through show(); the owner renders.
+    """
+    
+    def __init__(self, parent):
+        super().__init__(parent, padding="5")
+        self.rendered = ''
+        self.diff_lines: Optional[List[str]] = None
+        
+        self._create_widgets()
+    
+    def _create_widgets(self):
+        """Create the mode switch, the status line and the text view."""
+        self.mode_var = tk.StringVar(value='config')
+        ttk.Radiobutton(self, text="Config", value='config', variable=self.mode_var,
+                        command=self._redraw).grid(row=0, column=0, sticky="w")
+        ttk.Radiobutton(self, text="Diff vs disk", value='diff', variable=self.mode_var,
+                        command=self._redraw).grid(row=0, column=1, sticky="w", padx=(5, 0))
+        
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(self, textvariable=self.status_var, foreground="gray").grid(
+            row=1, column=0, columnspan=3, sticky="w", pady=(2, 2)
+        )
+        
+        self.text = tk.Text(self, height=15, wrap=tk.NONE, font=("TkFixedFont", 9), state=tk.DISABLED)
+        self.text.grid(row=2, column=0, columnspan=2, sticky="nsew")
+        self.text.tag_configure('added', foreground="#1B7F1B")
+        self.text.tag_configure('removed', foreground="#B00020")
+        self.text.tag_configure('hunk', foreground="gray")
+        
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.text.yview)
+        scrollbar.grid(row=2, column=2, sticky="ns")
+        self.text.configure(yscrollcommand=scrollbar.set)
+        
+        self.columnconfigure(1, weight=1)
+        self.rowconfigure(2, weight=1)
+    
+    def show(self, rendered: str, diff_lines: Optional[List[str]], status: str):
+        """
+        Show a rendered config and its diff against disk.
+        
+        Args:
+            rendered: app.config.ts content
+            diff_lines: Unified diff against the file on disk (None if there is no file)
+            status: Line shown above the text (what was re-rendered, how it compares to disk)
+        """
+        self.rendered = rendered
+        self.diff_lines = diff_lines
+        self.status_var.set(status)
+        self._redraw()
+    
+    def clear(self):
+        self.show('', None, "")
+    
+    def _redraw(self):
+        """Fill the text view for the current mode, keeping the scroll position."""
+        position = self.text.yview()[0]
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete('1.0', tk.END)
+        if self.mode_var.get() == 'config':
+            self.text.insert('1.0', self.rendered)
+        elif self.diff_lines is None:
+            self.text.insert('1.0', "No app.config.ts on disk to compare with (sync or generate the app first).")
+        elif not self.diff_lines:
+            self.text.insert('1.0', "No differences: the file on disk matches the preview.")
+        else:
+            for line in self.diff_lines:
+                if line.startswith('@@'):
+                    tag = 'hunk'
+                elif line.startswith('+') and not line.startswith('+++'):
+                    tag = 'added'
+                elif line.startswith('-') and not line.startswith('---'):
+                    tag = 'removed'
+                else:
+                    tag = ()
+                self.text.insert(tk.END, line if line.endswith('\n') else line + '\n', tag)
+        self.text.configure(state=tk.DISABLED)
+        self.text.yview_moveto(position)
 
+
+class BulkEditDialog(tk.Toplevel):
+    """
+    Modal dialog for changes applied to several tenants at once: plugins
+    to enable and disable, a role and theme colors. Empty fields leave
+    the tenants' values alone.
+    
+    After wait_window(), result holds the bulk edit for
+    tenant_edits.apply_bulk_edit (None if the dialog was cancelled).
+    """
+    
+    # Role choice that keeps each tenant's role
+    UNCHANGED = '(unchanged)'
+    
+    def __init__(self, parent, plugins: Dict, tenant_count: int):
+        super().__init__(parent)
+        self.title(f"Bulk Edit {tenant_count} Tenant(s)")
+        self.transient(parent)
+        self.plugin_ids = sorted(plugins)
+        self.plugins = plugins
+        self.result: Optional[Dict] = None
+        
+        self._create_widgets()
+        self.grab_set()
+    
+    def _create_widgets(self):
+        """Create the plugin lists, role and theme fields and the Apply/Cancel buttons."""
+        frame = ttk.Frame(self, padding="10")
+        frame.grid(row=0, column=0, sticky="nsew")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        
+        labels = [f"{plugin_id} - {self.plugins[plugin_id].get('label', plugin_id)}" for plugin_id in self.plugin_ids]
+        self.plugin_lists = {}
+        for column, (action, text) in enumerate([('enable', "Enable plugins:"), ('disable', "Disable plugins:")]):
+            ttk.Label(frame, text=text).grid(row=0, column=column, sticky="w")
+            listbox = tk.Listbox(frame, selectmode=tk.MULTIPLE, exportselection=False, height=10, width=32)
+            listbox.grid(row=1, column=column, sticky="nsew", padx=(0, 10) if column == 0 else 0)
+            if labels:
+                listbox.insert(tk.END, *labels)
+            self.plugin_lists[action] = listbox
+        
+        fields = ttk.Frame(frame)
+        fields.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(10, 0))
+        ttk.Label(fields, text="Role:").grid(row=0, column=0, sticky="w", pady=2)
+        self.role_var = tk.StringVar(value=self.UNCHANGED)
+        ttk.Combobox(fields, textvariable=self.role_var, values=[self.UNCHANGED, 'merchant', 'member', 'admin'],
+                     state='readonly', width=27).grid(row=0, column=1, sticky="w", padx=(10, 0), pady=2)
+        
+        self.theme_vars = {}
+        for row, (field, text) in enumerate([('primary', "Primary Color:"), ('primaryDark', "Primary Dark:"),
+                                             ('primaryLight', "Primary Light:")], start=1):
+            ttk.Label(fields, text=text).grid(row=row, column=0, sticky="w", pady=2)
+            self.theme_vars[field] = tk.StringVar()
+            ttk.Entry(fields, textvariable=self.theme_vars[field], width=30).grid(
+                row=row, column=1, sticky="w", padx=(10, 0), pady=2
+            )
+        ttk.Label(fields, text="Leave a field empty to keep each tenant's value.", foreground="gray").grid(
+            row=4, column=0, columnspan=2, sticky="w", pady=(2, 0)
+        )
+        
+        buttons = ttk.Frame(frame)
+        buttons.grid(row=3, column=0, columnspan=2, sticky="e", pady=(10, 0))
+        ttk.Button(buttons, text="Apply", command=self._apply).pack(side='left', padx=5)
+        ttk.Button(buttons, text="Cancel", command=self.destroy).pack(side='left')
+        
+        frame.columnconfigure(0, weight=1)
+        frame.columnconfigure(1, weight=1)
+        frame.rowconfigure(1, weight=1)
+    
+    def _apply(self):
+        from tkinter import messagebox
+        
+        selected = {
+            action: [self.plugin_ids[index] for index in listbox.curselection()]
+            for action, listbox in self.plugin_lists.items()
+        }
+        both = sorted(set(selected['enable']) & set(selected['disable']))
+        if both:
+            messagebox.showerror("Error", f"Plugins both enabled and disabled: {', '.join(both)}", parent=self)
+            return
+        
+        role = self.role_var.get()
+        theme = {field: var.get().strip() for field, var in self.theme_vars.items() if var.get().strip()}
+        result = {
+            'enable': selected['enable'],
+            'disable': selected['disable'],
+            'role': None if role == self.UNCHANGED else role,
+            'theme': theme,
+        }
+        if not (result['enable'] or result['disable'] or result['role'] or result['theme']):
+            messagebox.showerror("Error", "Nothing to change", parent=self)
+            return
+        self.result = result
+        self.destroy()
+
+
+class GenerationQueueWindow(tk.Toplevel):
+    """
+    Dashboard for a generation_queue.GenerationQueue: one row per job with
+    its state, elapsed time, files and bytes written, plus aggregate
+    throughput, a parallelism setting and Retry Failed / Cancel All.
+    
+    It only displays what it is given through update_jobs(); the owner
+    polls the queue. Closing the window only hides it.
+    """
+    
+    COLUMNS = (
+        ('tenant', "Tenant", 120),
+        ('folder', "Folder", 120),
+        ('state', "State", 80),
+        ('elapsed', "Elapsed", 70),
+        ('files', "Files", 60),
+        ('bytes', "Written", 80),
+        ('message', "Message", 260),
+    )
+    
+    def __init__(self, parent, workers: int, on_workers_change: Optional[Callable[[int], None]] = None,
+                 on_retry: Optional[Callable] = None, on_cancel: Optional[Callable] = None,
+                 on_clear: Optional[Callable] = None):
+        super().__init__(parent)
+        self.title("Generation Queue")
+        self.geometry("820x360")
+        self.transient(parent)
+        self.on_workers_change = on_workers_change
+        self._rows: Dict[int, Tuple] = {}   # job ID -> values shown
+        
+        self._create_widgets(workers, on_retry, on_cancel, on_clear)
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+    
+    def _create_widgets(self, workers: int, on_retry, on_cancel, on_clear):
+        """Create the job table, the totals line and the controls."""
+        frame = ttk.Frame(self, padding="10")
+        frame.grid(row=0, column=0, sticky="nsew")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        
+        controls = ttk.Frame(frame)
+        controls.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 5))
+        ttk.Label(controls, text="Parallel jobs:").pack(side='left')
+        self.workers_var = tk.IntVar(value=workers)
+        ttk.Spinbox(controls, from_=1, to=max(8, 2 * (os.cpu_count() or 1)), width=4,
+                    textvariable=self.workers_var, command=self._on_workers_change).pack(side='left', padx=(5, 15))
+        ttk.Button(controls, text="Retry Failed", command=on_retry).pack(side='left', padx=(0, 5))
+        ttk.Button(controls, text="Cancel All", command=on_cancel).pack(side='left', padx=(0, 5))
+        ttk.Button(controls, text="Clear Finished", command=on_clear).pack(side='left')
+        
+        self.tree = ttk.Treeview(frame, columns=[name for name, _, _ in self.COLUMNS], show='headings')
+        for name, text, width in self.COLUMNS:
+            self.tree.heading(name, text=text)
+            self.tree.column(name, width=width, stretch=(name == 'message'))
+        self.tree.grid(row=1, column=0, sticky="nsew")
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        scrollbar.grid(row=1, column=1, sticky="ns")
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        self.totals_var = tk.StringVar(value="")
+        ttk.Label(frame, textvariable=self.totals_var, foreground="gray").grid(
+            row=2, column=0, columnspan=2, sticky="w", pady=(5, 0)
+        )
+        
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(1, weight=1)
+    
+    def _on_workers_change(self):
+        try:
+            workers = int(self.workers_var.get())
+        except (tk.TclError, ValueError):
+            return
+        if workers >= 1 and self.on_workers_change:
+            self.on_workers_change(workers)
+    
+    def update_jobs(self, jobs: List, totals: Dict):
+        """Show GenerationJobs and GenerationQueue.totals(); only rows whose values changed are touched."""
+        from source_scanner import format_bytes
+        
+        shown = set()
+        for job in jobs:
+            shown.add(job.job_id)
+            values = (
+                job.tenant_id, job.folder_name, job.state, f"{job.elapsed:.1f}s",
+                job.files, format_bytes(job.bytes), job.message,
+            )
+            iid = str(job.job_id)
+            if job.job_id not in self._rows:
+                self.tree.insert('', tk.END, iid=iid, values=values)
+            elif self._rows[job.job_id] != values:
+                self.tree.item(iid, values=values)
+            self._rows[job.job_id] = values
+        for job_id in set(self._rows) - shown:
+            self.tree.delete(str(job_id))
+            del self._rows[job_id]
+        
+        counts = totals['counts']
+        self.totals_var.set(
+            f"{counts['running']} running, {counts['queued']} queued, {counts['done']} done, "
+            f"{counts['failed']} failed, {counts['cancelled']} cancelled - "
+            f"{format_bytes(totals['bytes'])} written, "
+            f"{format_bytes(int(totals['bytes_per_second']))}/s over {totals['elapsed']:.1f}s"
+        )
@@ -45,6 +45,7 @@ export {
   validateManifestOrThrow,
   initializePlugins,
   isPluginSystemInitialized,
+  registerGeneratedPlugins,
   loadPluginComponent,
   getPluginComponentLoader,
   getPluginComponentLoaders,
@@ -53,6 +54,7 @@ export {
   type PluginRoute,
   type PluginType,
   type PluginExports,
+  type GeneratedPluginRegistry,
   type UsePluginRegistryReturn,
   type UsePluginComponentOptions,
   type UsePluginComponentReturn,
@@ -13,13 +13,14 @@ export { PluginRegistry } from './PluginRegistry';
 export * from './manifestValidator';
 
 // Plugin Loader
-export { initializePlugins, isPluginSystemInitialized } from './pluginLoader';
+export { initializePlugins, isPluginSystemInitialized, registerGeneratedPlugins } from './pluginLoader';
 
 // Component Loader
 export {
   loadPluginComponent,
   getPluginComponentLoader,
   getPluginComponentLoaders,
+  registerComponentLoaders,
 } from './pluginComponentLoader';
 
 // Hooks
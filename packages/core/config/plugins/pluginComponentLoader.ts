@@ -24,6 +24,21 @@ const COMPONENT_LOADERS: Record<string, Record<string, () => Promise<any>>> = {
   // Add other plugins as needed
 };
 
+/**
+ * Register component loaders emitted by the app manager
+ * Merges into the static mapping so generated apps only carry their enabled plugins
+ */
+export function registerComponentLoaders(
+  loaders: Record<string, Record<string, () => Promise<any>>>
+): void {
+  Object.entries(loaders).forEach(([pluginId, pluginLoaders]) => {
+    COMPONENT_LOADERS[pluginId] = {
+      ...(COMPONENT_LOADERS[pluginId] || {}),
+      ...pluginLoaders,
+    };
+  });
+}
+
 /**
  * Generate component loader function from static mapping
  */
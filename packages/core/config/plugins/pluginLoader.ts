@@ -6,16 +6,18 @@
 
 import { PluginRegistry } from './PluginRegistry';
 import { validateManifestOrThrow } from './manifestValidator';
+import { registerComponentLoaders } from './pluginComponentLoader';
 import { configService } from '../services/configService';
 import type { PluginRegistryEntry } from './PluginRegistry';
+import type { GeneratedPluginRegistry } from './types';
 
 /**
  * Static manifest loaders - Metro requires static import paths
  * This maps plugin IDs to their manifest loaders
  * 
  * NOTE: Metro bundler requires static imports, so this must be maintained manually
- * or generated at build time. In the future, this could be auto-generated from
- * filesystem scan during build.
+ * or generated at build time. Generated apps pass their config/plugins.generated.ts
+ * (written by the app manager) to initializePlugins, see registerGeneratedPlugins.
  */
 export const MANIFEST_LOADERS: Record<string, () => Promise<any>> = {
   
@@ -31,6 +33,24 @@ export const PLUGIN_REGISTRY: PluginRegistryEntry[] = Object.keys(MANIFEST_LOADE
   manifestPath: `../../../plugins/${id}/plugin.manifest.json`,
 }));
 
+/**
+ * Register a generated plugin registry (config/plugins.generated.ts)
+ * Adds manifest and component loaders for the app's enabled plugins only
+ */
+export function registerGeneratedPlugins(generated: GeneratedPluginRegistry): void {
+  Object.entries(generated.manifests).forEach(([id, loader]) => {
+    if (!MANIFEST_LOADERS[id]) {
+      PLUGIN_REGISTRY.push({
+        id,
+        manifestPath: `../../../plugins/${id}/plugin.manifest.json`,
+      });
+    }
+    MANIFEST_LOADERS[id] = loader;
+  });
+
+  registerComponentLoaders(generated.components);
+}
+
 /**
  * Load plugin manifest from static loader map
  */
@@ -52,13 +72,18 @@ async function loadPluginManifest(pluginId: string): Promise<any> {
 /**
  * Initialize and register plugins dynamically based on configuration
  * Only loads plugins that are enabled in AppConfig
+ * @param generated - Optional generated plugin registry of the running app
  */
-export async function initializePlugins(): Promise<void> {
+export async function initializePlugins(generated?: GeneratedPluginRegistry): Promise<void> {
   if (PluginRegistry.isInitialized()) {
     console.log('PluginRegistry already initialized');
     return;
   }
 
+  if (generated) {
+    registerGeneratedPlugins(generated);
+  }
+
   console.log('Initializing PluginRegistry...');
 
   try {
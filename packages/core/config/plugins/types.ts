@@ -54,3 +54,13 @@ export interface SegmentConfiguration {
 export interface CompanyConfiguration extends SegmentConfiguration {
   companyId: string;
 }
+
+/**
+ * Generated plugin registry
+ * Emitted per app by the app manager as config/plugins.generated.ts
+ * Only references the tenant's enabled plugins, so Metro bundles nothing else
+ */
+export interface GeneratedPluginRegistry {
+  manifests: Record<string, () => Promise<any>>;
+  components: Record<string, Record<string, () => Promise<any>>>;
+}